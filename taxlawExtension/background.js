@@ -61,6 +61,65 @@ chrome.commands.onCommand.addListener(function(command) {
     }
 });
 
+// 검색 결과 페이지의 판례들을 일괄 조회해 storage에 저장 (팝업이 바로 사용)
+const PREFETCH_STORAGE_KEY = 'prefetchedCases';
+const MAX_PREFETCHED_CASES = 300;
+
+async function postJson(url, body) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(body)
+    });
+    if (!response.ok) {
+        throw new Error(`일괄 조회 실패: ${response.status}`);
+    }
+    return response.json();
+}
+
+async function prefetchCases(caseNumbers) {
+    // 메타데이터와 요약(캐시된 것만)을 동시에 요청
+    const [metadataBatch, summaryBatch] = await Promise.all([
+        postJson('http://localhost:3000/metadata:batch', { case_numbers: caseNumbers }),
+        postJson('http://localhost:3000/summaries:batch', { case_numbers: caseNumbers })
+    ]);
+
+    const cases = {};
+    for (const caseNumber of caseNumbers) {
+        const metadata = metadataBatch.results[caseNumber];
+        const summary = summaryBatch.results[caseNumber];
+        if (!metadata && !(summary && summary.summary)) continue;
+        cases[caseNumber] = {
+            metadata: metadata || null,
+            summary: summary && summary.summary ? summary.summary : null
+        };
+    }
+
+    const stored = await chrome.storage.local.get(PREFETCH_STORAGE_KEY);
+    const merged = { ...(stored[PREFETCH_STORAGE_KEY] || {}), ...cases };
+    // 오래된 항목부터 정리 (객체 키는 삽입 순서를 유지)
+    const keys = Object.keys(merged);
+    for (const key of keys.slice(0, Math.max(0, keys.length - MAX_PREFETCHED_CASES))) {
+        delete merged[key];
+    }
+    await chrome.storage.local.set({ [PREFETCH_STORAGE_KEY]: merged });
+    return cases;
+}
+
+chrome.runtime.onMessage.addListener(function(request, sender, sendResponse) {
+    if (request.action === 'prefetch-cases') {
+        prefetchCases(request.caseNumbers)
+            .then(cases => sendResponse({ success: true, cases: cases }))
+            .catch(error => {
+                console.error('판례 일괄 조회 오류:', error);
+                sendResponse({ success: false, message: error.message });
+            });
+        return true;
+    }
+});
+
 // 팝업 창이 닫힐 때 ID 초기화
 chrome.windows.onRemoved.addListener((windowId) => {
     if (windowId === popupWindowId) {
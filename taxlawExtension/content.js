@@ -26,6 +26,7 @@ document.addEventListener('mouseover', function(e) {
             if (caseNumberElement) {
                 lastCapturedText = caseNumberElement.textContent.trim();
                 console.log('발견된 판례번호:', lastCapturedText);
+                showPrefetchedPreview(listItem, lastCapturedText);
                 // 시각적 피드백 추가
                 hoveredElement.style.outline = '2px solid #4CAF50';
             }
@@ -234,11 +235,43 @@ function collectCaseNumbers() {
 
         // 사이드 패널 내용 업데이트
         updateSidePanel();
+
+        // 결과 페이지 전체의 메타데이터/요약을 한 번에 미리 받아두기
+        prefetchCases([...collectedCaseNumbers.question, ...collectedCaseNumbers.precedent]);
     }
     
     isProcessing = false;
 }
 
+// 미리 받아둔 판례별 메타데이터/요약 (판례번호 -> { metadata, summary })
+let prefetchedCases = {};
+
+// background에 결과 페이지의 판례번호 목록을 보내 일괄 조회 요청
+function prefetchCases(caseNumbers) {
+    const pending = caseNumbers.filter(number => !(number in prefetchedCases));
+    if (pending.length === 0) return;
+
+    chrome.runtime.sendMessage({ action: 'prefetch-cases', caseNumbers: pending }, (response) => {
+        if (chrome.runtime.lastError || !response || !response.success) {
+            console.log('일괄 조회 실패:', chrome.runtime.lastError || (response && response.message));
+            return;
+        }
+        Object.assign(prefetchedCases, response.cases);
+        console.log('미리 받은 판례 수:', Object.keys(response.cases).length);
+    });
+}
+
+// 호버한 항목에 미리 받은 메타데이터를 툴팁으로 표시
+function showPrefetchedPreview(listItem, caseNumber) {
+    const prefetched = prefetchedCases[caseNumber];
+    if (!prefetched || !prefetched.metadata) return;
+
+    const metadata = prefetched.metadata;
+    listItem.title = [metadata.문서명, metadata.세목, metadata.판결결과]
+        .filter(value => value)
+        .join(' · ');
+}
+
 // 사이드 패널 업데이트 함수
 function updateSidePanel() {
     if (collectedCaseNumbers.question.length > 0 || collectedCaseNumbers.precedent.length > 0) {
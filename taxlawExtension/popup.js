@@ -40,6 +40,59 @@ async function summarizeContent(content) {
     }
 }
 
+// 요약을 SSE 스트림으로 받아 조각이 도착할 때마다 onDelta 호출
+async function summarizeContentStream(content, onDelta) {
+    const response = await fetch('http://localhost:3000/summarize/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            content: content
+        })
+    });
+
+    if (!response.ok || !response.body) {
+        throw new Error('요약 스트림을 열 수 없습니다.');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // 이벤트는 빈 줄로 구분된다
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventType = 'message';
+            let data = '';
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith('event:')) eventType = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            }
+            if (!data) continue;
+
+            const payload = JSON.parse(data);
+            if (eventType === 'error') {
+                throw new Error(payload.error);
+            }
+            if (eventType === 'message' && payload.delta) {
+                summary += payload.delta;
+                onDelta(summary);
+            }
+        }
+    }
+    return summary;
+}
+
 // 마크다운 컨버터 초기화
 const converter = new showdown.Converter({
     headerLevelStart: 2,  // h1 대신 h2부터 시작
@@ -160,13 +213,16 @@ async function updateCapturedText() {
     const titleElement = document.getElementById('documentTitle');
     const urlElement = document.getElementById('documentUrl');
 
-    chrome.storage.local.get(['capturedText'], async function(result) {
+    chrome.storage.local.get(['capturedText', 'prefetchedCases'], async function(result) {
         if (result.capturedText) {
             const caseNumber = result.capturedText;
             textElement.textContent = caseNumber;
+
+            // 검색 결과 페이지에서 미리 받아둔 데이터가 있으면 바로 사용
+            const prefetched = (result.prefetchedCases || {})[caseNumber] || {};
             
             // 메타데이터 가져오기
-            const metadata = await fetchMetadata(caseNumber);
+            const metadata = prefetched.metadata || await fetchMetadata(caseNumber);
             if (metadata) {
                 titleElement.textContent = metadata.문서명;
                 document.getElementById('taxType').textContent = metadata.세목;
@@ -177,23 +233,47 @@ async function updateCapturedText() {
                 }
             }
             
+            if (prefetched.summary) {
+                summaryElement.innerHTML = `
+                    <h3>판례 요약</h3>
+                    <div class="markdown-content"></div>
+                `;
+                summaryElement.querySelector('.markdown-content').innerHTML = converter.makeHtml(prefetched.summary);
+                return;
+            }
+
             const caseFiles = await fetchCaseFiles(caseNumber);
             
             if (caseFiles && caseFiles.html) {
-                const summary = await summarizeContent(caseFiles.html);
-                if (summary) {
-                    // showdown을 사용하여 마크다운을 HTML로 변환
-                    const htmlContent = converter.makeHtml(summary);
-                    
-                    // 요약 컨테이너 초기화
-                    summaryElement.innerHTML = `
-                        <h3>판례 요약</h3>
-                        <div class="markdown-content"></div>
-                    `;
-                    
-                    // 스트리밍 효과로 내용 표시
-                    const contentElement = summaryElement.querySelector('.markdown-content');
-                    streamElements(contentElement, htmlContent, 30);
+                // 요약 컨테이너 초기화
+                summaryElement.innerHTML = `
+                    <h3>판례 요약</h3>
+                    <div class="markdown-content"></div>
+                `;
+                const contentElement = summaryElement.querySelector('.markdown-content');
+
+                // 토큰이 도착하는 대로 렌더링 (프레임당 한 번만 마크다운 변환)
+                let latestSummary = '';
+                let renderScheduled = false;
+                const renderSummary = (summary) => {
+                    latestSummary = summary;
+                    if (renderScheduled) return;
+                    renderScheduled = true;
+                    requestAnimationFrame(() => {
+                        renderScheduled = false;
+                        contentElement.innerHTML = converter.makeHtml(latestSummary);
+                    });
+                };
+
+                try {
+                    await summarizeContentStream(caseFiles.html, renderSummary);
+                } catch (error) {
+                    console.error('요약 스트림 오류, 일반 요청으로 재시도:', error);
+                    const summary = await summarizeContent(caseFiles.html);
+                    if (summary) {
+                        // 스트리밍 효과로 내용 표시
+                        streamElements(contentElement, converter.makeHtml(summary), 30);
+                    }
                 }
             } else {
                 textElement.textContent = '관련 파일을 찾을 수 없습니다.';
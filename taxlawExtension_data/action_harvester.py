@@ -0,0 +1,245 @@
+import argparse
+import json
+import weakref
+
+from page_metadata import INTERPRETATION_METADATA_SPEC, PRECEDENT_METADATA_SPEC, extract_page_metadata
+
+
+# 상세 문서 조회 응답에서 문서 데이터가 들어 있는 키
+ACTION_PAYLOAD_KEY = 'ASEISA001MR01'
+
+# 결과 dict 필드별로 action.do 응답에서 찾아볼 키 후보 (앞에서부터 우선)
+# 사이트 DVO 필드명만 둔다. 'title', 'result' 같은 일반적인 이름은 엉뚱한 필드와
+# 겹칠 수 있으므로 넣지 않는다. 사이트 응답 구조가 바뀌면 'python action_harvester.py'로
+# 응답을 다시 기록하고, 기록할 때 출력되는 derive_action_field_keys 결과로 이 목록을 고친다.
+ACTION_FIELD_KEYS = {
+    "doc_num": ['ntstDcmDscmCntn', 'dcmNo'],
+    "produce_date": ['ntstDcmPrdnDt', 'prdnDt'],
+    "related_date": ['ntstDcmRltnDt', 'rltnDt'],
+    "court_sim": ['crtTrslCntn'],
+    "progress": ['prgsStatCntn'],
+    "tax_type": ['ntstDcmTxitNm', 'txitNm'],
+    "doc_title": ['ntstDcmTtl', 'dcmTtl'],
+    "doc_type": ['ntstDcmClCdNm', 'dcmClNm'],
+    "doc_result": ['ntstDcmRsltCntn', 'dcmRsltNm'],
+    "summary": ['ntstDcmGistCntn', 'gistCntn'],
+}
+
+# 메타데이터가 이 필드를 갖추지 못하면 응답을 쓰지 않고 DOM 수집으로 전환한다
+ACTION_REQUIRED_FIELDS = ("doc_num", "doc_title")
+
+ACTION_LIST_KEYS = {
+    "related_keywords": ['dcmKwrdDVOList'],
+    "related_laws": ['dcmLawDVOList'],
+    "tag_cloud": ['tagCloudList'],
+}
+
+ACTION_SIMILAR_KEYS = ['smlrDcmDVOList']
+
+# 본문 HTML 후보 키 (리스트면 각 항목의 HTML을 이어 붙인다)
+ACTION_BODY_KEYS = ['dcmHwpEditorDVOList', 'dcmFleByte', 'ntstDcmCntn']
+ACTION_BODY_ITEM_KEYS = ['dcmFleByte', 'cntnHtml']
+
+# 목록 항목(dict)에서 표시 문자열로 쓸 키 후보
+ACTION_TEXT_ITEM_KEYS = ['kwrdNm', 'lawNm', 'tagNm']
+
+
+_captures = weakref.WeakKeyDictionary()
+
+
+def attach_action_capture(page):
+    """페이지의 action.do 응답을 기록하기 시작
+
+    이벤트 핸들러 안에서는 응답 객체만 모아 두고, 본문 파싱은
+    extract_action_payload에서 동기적으로 수행한다.
+    """
+    responses = []
+
+    def on_response(response):
+        if 'action.do' in response.url:
+            responses.append(response)
+
+    page.on('response', on_response)
+    _captures[page] = responses
+
+
+def clear_action_capture(page):
+    """다음 문서를 위해 기록된 응답 비우기"""
+    responses = _captures.get(page)
+    if responses is not None:
+        responses.clear()
+
+
+def _find_action_response(page):
+    """기록된 action.do 응답 중 상세 문서 데이터가 든 (응답 JSON 전체, 문서 데이터) 반환"""
+    for response in reversed(_captures.get(page, [])):
+        try:
+            data = response.json()
+        except Exception:
+            continue
+        payload = (data.get('data') or {}).get(ACTION_PAYLOAD_KEY) if isinstance(data, dict) else None
+        if payload:
+            return data, payload
+    return None, None
+
+
+def extract_action_payload(page):
+    """기록된 action.do 응답 중 상세 문서(ASEISA001MR01) 데이터 반환"""
+    return _find_action_response(page)[1]
+
+
+def _flatten(payload):
+    """한 단계 아래 dict(DVO)까지 펼쳐 키 조회 대상으로 만든다"""
+    flat = {}
+    for key, value in payload.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                flat.setdefault(sub_key, sub_value)
+    for key, value in payload.items():
+        flat[key] = value
+    return flat
+
+
+def _pick(flat, keys, default=""):
+    for key in keys:
+        value = flat.get(key)
+        if value not in (None, "", []):
+            return value
+    return default
+
+
+def _text_list(items):
+    result = []
+    for item in items or []:
+        if isinstance(item, dict):
+            item = _pick(item, ACTION_TEXT_ITEM_KEYS)
+        text = str(item).replace('#', '').strip() if item else ""
+        if text:
+            result.append(text)
+    return result
+
+
+def _body_html(flat):
+    body = _pick(flat, ACTION_BODY_KEYS)
+    if isinstance(body, list):
+        return ''.join(str(_pick(part, ACTION_BODY_ITEM_KEYS)) for part in body if isinstance(part, dict))
+    return str(body or "")
+
+
+def map_action_payload(payload, url, use_precedent):
+    """action.do 응답을 scrape_*_doc 결과와 같은 메타데이터 dict와 본문 HTML로 변환
+
+    ACTION_REQUIRED_FIELDS 중 하나라도 비어 있으면 키 목록이 응답과 맞지 않는
+    것으로 보고 (None, "")을 반환한다. 호출자는 이때 DOM 수집으로 전환한다.
+    """
+    flat = _flatten(payload)
+
+    metadata = {"url": url}
+    for field, keys in ACTION_FIELD_KEYS.items():
+        metadata[field] = str(_pick(flat, keys)).strip()
+    if not all(metadata[field] for field in ACTION_REQUIRED_FIELDS):
+        return None, ""
+    metadata["summary"] = {"content": metadata["summary"]}
+
+    for field, keys in ACTION_LIST_KEYS.items():
+        metadata[field] = _text_list(_pick(flat, keys, default=[]))
+
+    metadata["similar_docs"] = [
+        {
+            "title": str(_pick(doc, ACTION_FIELD_KEYS["doc_title"])),
+            "doc_num": str(_pick(doc, ACTION_FIELD_KEYS["doc_num"])),
+            "date": str(_pick(doc, ACTION_FIELD_KEYS["produce_date"])),
+        }
+        for doc in _pick(flat, ACTION_SIMILAR_KEYS, default=[])
+        if isinstance(doc, dict)
+    ]
+
+    if not use_precedent:
+        # 해석례 결과에는 법원심급/진행상태 필드가 없다
+        metadata.pop("court_sim", None)
+        metadata.pop("progress", None)
+
+    return metadata, _body_html(flat)
+
+
+def derive_action_field_keys(payload, dom_metadata):
+    """응답에서 DOM 메타데이터와 값이 같은 키를 필드별로 찾아 반환 ({필드: [키, ...]})
+
+    기록한 실제 응답으로 ACTION_FIELD_KEYS를 정하거나 검증하는 데 쓴다.
+    값이 비어 있는 필드는 어느 키와도 맞춰 보지 않는다.
+    """
+    def normalize(value):
+        return ' '.join(str(value).split())
+
+    flat = _flatten(payload)
+    derived = {}
+    for field in ACTION_FIELD_KEYS:
+        expected = dom_metadata.get(field)
+        if isinstance(expected, dict):
+            expected = expected.get("content")
+        if not expected:
+            continue
+        derived[field] = [
+            key for key, value in flat.items()
+            if isinstance(value, (str, int, float)) and normalize(value) == normalize(expected)
+        ]
+    return derived
+
+
+def record_action_fixture(page, url, use_precedent, path):
+    """상세 페이지의 action.do 응답과 DOM에서 읽은 메타데이터를 함께 테스트 픽스처로 저장
+
+    attach_action_capture를 건 page로 호출한다. 저장한 파일은 tests/test_action_harvester.py가
+    map_action_payload 결과와 DOM 메타데이터를 비교하고, 응답(response)을 로컬 서버로
+    재생해 harvest_action_doc을 실행하는 데 쓴다.
+    """
+    from crawl_profile import wait_for_detail_ready
+
+    clear_action_capture(page)
+    page.goto(url, wait_until='domcontentloaded')
+    wait_for_detail_ready(page)
+    response, payload = _find_action_response(page)
+    if payload is None:
+        raise ValueError(f"{url}에서 {ACTION_PAYLOAD_KEY} 응답을 찾지 못했습니다.")
+
+    spec = PRECEDENT_METADATA_SPEC if use_precedent else INTERPRETATION_METADATA_SPEC
+    dom_metadata = extract_page_metadata(page, spec)
+    fixture = {
+        "url": url,
+        "use_precedent": use_precedent,
+        "response": response,
+        "payload": payload,
+        "dom_metadata": dom_metadata,
+        "derived_field_keys": derive_action_field_keys(payload, dom_metadata),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f, ensure_ascii=False, indent=2)
+    return fixture
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상세 문서 action.do 응답을 테스트 픽스처로 기록")
+    parser.add_argument('url', help="상세 문서 페이지 URL")
+    parser.add_argument('output', help="저장할 픽스처 JSON 경로 (예: tests/fixtures/action/해석례.json)")
+    parser.add_argument('--precedent', action='store_true', help="판례/심판 문서인 경우")
+    args = parser.parse_args()
+
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        attach_action_capture(page)
+        try:
+            fixture = record_action_fixture(page, args.url, args.precedent, args.output)
+        finally:
+            browser.close()
+    print(f"{args.output} 저장 완료 (응답 키 {len(fixture['payload'])}개)")
+    # ACTION_FIELD_KEYS와 맞지 않는 필드는 이 결과를 보고 키 목록을 고친다
+    for field, keys in fixture["derived_field_keys"].items():
+        mark = "" if set(keys) & set(ACTION_FIELD_KEYS[field]) else "  <- ACTION_FIELD_KEYS와 다름"
+        print(f"  {field}: {', '.join(keys) or '(일치하는 키 없음)'}{mark}")
+
+
+if __name__ == "__main__":
+    main()
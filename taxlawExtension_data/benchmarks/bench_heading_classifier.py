@@ -0,0 +1,69 @@
+"""HeadingClassifier(정규식 하나) 대 레벨별 re.match 순차 시도 방식의 목차 분류 속도 비교
+
+    python benchmarks/bench_heading_classifier.py               # 20만 줄 합성 문서
+    python benchmarks/bench_heading_classifier.py --lines 50000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from print_json import INTERPRETATION_HEADINGS, PRECEDENT_HEADINGS, build_heading_markdown
+
+TOKENS = ['1.', '12.', '1999.', '가.', 'a)', '가)', '(1)', '1)', '주 문', '이 유', '주문', '이유',
+          '청 구 취 지', 'x.', 'ㄱ.', '본문', '내용이다.', '', '  ', '(12)', '3)']
+
+
+class SequentialClassifier:
+    """HeadingClassifier 도입 전 방식: 레벨별로 컴파일한 정규식을 앞에서부터 re.match"""
+
+    def __init__(self, classifier):
+        self.top_level_items = classifier.top_level_items
+        self._regexes = [re.compile(pattern) for pattern in classifier.level_patterns]
+
+    def classify(self, line):
+        for level, regex in enumerate(self._regexes):
+            match = regex.match(line)
+            if match:
+                return level, match.group()
+        return None, None
+
+
+def synthetic_content(lines, seed):
+    rng = random.Random(seed)
+    return '\n'.join(
+        ' '.join(rng.choice(TOKENS) for _ in range(rng.randint(1, 3))) for _ in range(lines)
+    )
+
+
+def timed(content, classifier, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = build_heading_markdown(content, classifier)
+        best = min(best, time.perf_counter() - started)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='목차 분류기 벤치마크')
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    content = synthetic_content(args.lines, args.seed)
+    for name, classifier in (('판례', PRECEDENT_HEADINGS), ('해석례', INTERPRETATION_HEADINGS)):
+        sequential = SequentialClassifier(classifier)
+        old_time, old_output = timed(content, sequential, args.repeat)
+        new_time, new_output = timed(content, classifier, args.repeat)
+        print(f"{name}: 순차 re.match {old_time:.3f}s -> HeadingClassifier {new_time:.3f}s "
+              f"({old_time / new_time:.2f}x), 결과 동일: {old_output == new_output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""html_to_markdown 파서 백엔드(bs4/lxml) 속도와 결과 일치 여부 비교
+
+    python benchmarks/bench_parser_backends.py            # 합성 문서 20건
+    python benchmarks/bench_parser_backends.py data       # 크롤러가 저장한 HTML 폴더
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from print_json import compare_parser_backends
+
+MARKERS = ['1.', '2.', '가.', '나.', '1)', '가)', '(1)', '(2)', 'a)']
+
+
+def synthetic_document(rng, paragraphs):
+    """판례 본문과 비슷한 구조(목차 기호 문단, 표 제목, 표)의 HTML 생성"""
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><style>p{}</style></head>',
+             '<body><div id="cntnWrap_html"><p>주 문</p><p>1. 원고의 청구를 기각한다.</p><p>이 유</p>']
+    for idx in range(paragraphs):
+        if idx % 25 == 24:
+            parts.append(f'<p>(표{idx}) 연도별 세액</p><table border=1>'
+                         '<tr><th>연도</th><th> 금액 </th></tr>'
+                         f'<tr><td><p>20{idx % 100:02d}</p></td><td>1,000<br>원</td></tr>'
+                         '<tr><td>합계</td><td><span>2</span>,000</td></tr></table>')
+        else:
+            ending = '.' if rng.random() < 0.5 else ''
+            parts.append(f'<p><span>{rng.choice(MARKERS)}</span> 본문 {idx} 내용이 <b>계속</b>된다{ending}</p>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='html_to_markdown 파서 백엔드 벤치마크')
+    parser.add_argument('path', nargs='?', help='HTML 파일 폴더 (생략하면 합성 문서 사용)')
+    parser.add_argument('--documents', type=int, default=20, help='합성 문서 수')
+    parser.add_argument('--doc-type', default='판례')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    if args.path:
+        report = compare_parser_backends(sorted(Path(args.path).glob('*.html')), args.doc_type)
+    else:
+        rng = random.Random(args.seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for idx in range(args.documents):
+                path = Path(tmp) / f'd{idx}.html'
+                path.write_text(synthetic_document(rng, rng.randint(50, 2000)), encoding='utf-8')
+                paths.append(path)
+            report = compare_parser_backends(paths, args.doc_type)
+            report['mismatches'] = [Path(path).name for path in report['mismatches']]
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
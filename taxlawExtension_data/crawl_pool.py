@@ -0,0 +1,200 @@
+import dataclasses
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from playwright.sync_api import sync_playwright
+
+from crawl_profile import wait_for_detail_ready
+from retry_policy import HttpStatusError, RetryPolicy
+from telemetry import telemetry
+from throttle import AdaptiveDelay
+
+# 워커 큐 우선순위 (작을수록 먼저 처리)
+PRIORITY_NEW = 0    # 한 번도 수집하지 않은 문서
+PRIORITY_RETRY = 1  # 실패 후 다시 시도하는 문서
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CrawlItem:
+    """목록 페이지에서 발견한 상세 문서 작업 단위"""
+    doc_number: str
+    url: str
+    use_precedent: bool = False
+    attempts: int = 0  # 이번 실행에서 재시도한 횟수
+
+
+class CrawlWorkerPool:
+    """상세 페이지를 N개의 워커로 병렬 크롤링하는 풀
+
+    Playwright sync API는 스레드 간 공유가 불가능하므로 워커마다
+    별도의 playwright 인스턴스/브라우저/컨텍스트를 띄우고, 목록 페이지가
+    넣어 주는 CrawlItem을 큐에서 꺼내 처리한다. 큐는 우선순위 큐이며
+    우선순위가 같으면 넣은 순서대로 처리한다. 실패한 문서는 retry_policy가
+    정한 대기 시간 뒤 다시 큐에 넣고, 재시도하지 않기로 한 실패만
+    on_failure(item, error, error_class)로 넘긴다.
+    """
+
+    def __init__(self, scrape_fn, on_success, on_failure, num_workers=4,
+                 per_host_limit=4, launch_options=None, context_options=None,
+                 context_setup=None, page_setup=None, politeness=None, retry_policy=None):
+        self.scrape_fn = scrape_fn
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.num_workers = max(1, num_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+        self.context_setup = context_setup
+        self.page_setup = page_setup
+        self.politeness = politeness or AdaptiveDelay()
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads = []
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+        self._scheduled_retries = 0
+        self._retry_lock = threading.Lock()
+        self._worker_errors = []
+
+    def start(self):
+        """워커 스레드 시작"""
+        for worker_id in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._run_worker,
+                args=(worker_id,),
+                name=f"crawl-worker-{worker_id}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("크롤링 워커 %d개 시작 (호스트당 동시 요청 제한: %d)", self.num_workers, self.per_host_limit)
+
+    def submit(self, item, priority=0):
+        """상세 문서 작업 추가 (priority가 작을수록 먼저 처리)"""
+        self._queue.put((priority, next(self._sequence), item))
+
+    def _schedule_retry(self, item, delay):
+        """delay초 뒤에 재시도 횟수를 늘린 작업을 다시 큐에 넣음"""
+        retry_item = dataclasses.replace(item, attempts=item.attempts + 1)
+
+        def resubmit():
+            with self._retry_lock:
+                self.submit(retry_item, priority=PRIORITY_RETRY)
+                self._scheduled_retries -= 1
+
+        with self._retry_lock:
+            self._scheduled_retries += 1
+        timer = threading.Timer(delay, resubmit)
+        timer.daemon = True
+        timer.start()
+
+    def _drained(self):
+        with self._retry_lock:
+            return self._scheduled_retries == 0 and self._queue.unfinished_tasks == 0
+
+    def join(self):
+        """큐에 남은 작업과 예약된 재시도를 모두 처리한 뒤 워커 종료
+
+        작업이 남았는데 살아 있는 워커가 없으면(브라우저 실행 실패 등) 기다리지 않고
+        워커를 멈추게 한 예외를 다시 발생시킨다.
+        """
+        while not self._drained():
+            if not any(thread.is_alive() for thread in self._threads):
+                self._threads = []
+                if self._worker_errors:
+                    raise self._worker_errors[0]
+                raise RuntimeError("모든 크롤링 워커가 종료되어 남은 작업을 처리할 수 없습니다.")
+            time.sleep(0.2)
+        for _ in self._threads:
+            # 종료 신호는 어떤 작업보다도 뒤에 꺼내지도록 한다
+            self._queue.put((float('inf'), next(self._sequence), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _host_slot(self, url):
+        """호스트별 동시 요청 수를 제한하는 세마포어 반환"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _run_worker(self, worker_id):
+        try:
+            self._work(worker_id)
+        except Exception as e:
+            logger.error("[워커 %d] 워커가 예외로 종료되었습니다: %s", worker_id, str(e))
+            self._worker_errors.append(e)
+
+    def _work(self, worker_id):
+        with sync_playwright() as p:
+            browser = p.chromium.launch(**self.launch_options)
+            context = browser.new_context(**self.context_options)
+            if self.context_setup:
+                self.context_setup(context)
+            page = context.new_page()
+            if self.page_setup:
+                self.page_setup(page)
+
+            try:
+                while True:
+                    _, _, item = self._queue.get()
+                    if item is None:
+                        break
+                    try:
+                        with telemetry.document(item.doc_number):
+                            self._process(page, item, worker_id)
+                    finally:
+                        self._queue.task_done()
+            finally:
+                browser.close()
+
+    def _process(self, page, item, worker_id):
+        ok = False
+        started = time.monotonic()
+        latency = None
+        # 사이트 오류가 몰려 서킷 브레이커가 열려 있으면 닫힐 때까지 대기
+        token = self.retry_policy.before_request()
+        try:
+            with self._host_slot(item.url):
+                logger.debug("[워커 %d] 문서 크롤링 시작: %s", worker_id, item.doc_number)
+                with telemetry.span("page_open"):
+                    response = page.goto(item.url, wait_until='domcontentloaded')
+                    if response is not None and response.status >= 400:
+                        raise HttpStatusError(response.status, item.url)
+                    wait_for_detail_ready(page)
+                latency = time.monotonic() - started
+                doc_info = self.scrape_fn(page, item)
+
+            if not doc_info:
+                raise Exception("문서 정보 수집 실패")
+            self.on_success(item, doc_info)
+            self.retry_policy.record_success(token)
+            telemetry.increment("documents_scraped")
+            ok = True
+
+        except Exception as e:
+            error_class, delay = self.retry_policy.record_failure(e, item.attempts, token)
+            if delay is not None:
+                logger.warning("[워커 %d] 문서 처리 실패 (%s), %.1f초 후 재시도 %d회째: %s - %s",
+                               worker_id, error_class, delay, item.attempts + 1, item.doc_number, str(e))
+                telemetry.increment("documents_retried")
+                self._schedule_retry(item, delay)
+            else:
+                logger.error("[워커 %d] 문서 처리 실패 (%s): %s - %s", worker_id, error_class, item.doc_number, str(e))
+                telemetry.increment("documents_failed")
+                self.on_failure(item, e, error_class)
+
+        # 서버 상태에 따라 필요한 만큼만 대기
+        self.politeness.record(latency if latency is not None else time.monotonic() - started, ok=ok)
+        self.politeness.wait()
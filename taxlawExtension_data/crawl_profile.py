@@ -0,0 +1,61 @@
+import re
+
+from page_metadata import INTERPRETATION_METADATA_SPEC, PRECEDENT_METADATA_SPEC
+
+
+# 상세 페이지 수집에 필요 없는 리소스 유형
+# (stylesheet는 요소 표시 여부 판단에 쓰이므로 차단하지 않는다)
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'texttrack', 'manifest'}
+
+# 수집과 무관한 로깅/분석 요청 (content.js에서 무력화하는 nlog 비콘 포함)
+BLOCKED_URL_PATTERN = re.compile(
+    r'nlog/log/event|google-analytics\.com|googletagmanager\.com|doubleclick\.net'
+)
+
+# 경량 프로필 브라우저 실행 옵션
+LIGHT_LAUNCH_OPTIONS = {
+    'headless': True,
+    'args': [
+        '--disable-gpu',
+        '--disable-dev-shm-usage',
+        '--disable-extensions',
+        '--disable-background-networking',
+        '--blink-settings=imagesEnabled=false'
+    ]
+}
+
+# 상세 페이지 준비 완료 판단 기준 (networkidle 대신 사용)
+DETAIL_READY_SELECTORS = ('#dcmDetailBox', '#cntnWrap_html')
+
+# 메타데이터는 action.do 응답으로 채워지므로 문서번호 요소에 글자가 들어와야 준비된 것으로 본다
+DOC_NUMBER_XPATHS = list(dict.fromkeys(
+    INTERPRETATION_METADATA_SPEC["fields"]["doc_num"]["paths"]
+    + PRECEDENT_METADATA_SPEC["fields"]["doc_num"]["paths"]
+))
+
+DOC_NUMBER_READY_JS = """
+(xpaths) => xpaths.some((xpath) => {
+    const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) && el.innerText.trim() !== '';
+})
+"""
+
+
+def _route_request(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def apply_light_profile(context):
+    """브라우저 컨텍스트에 불필요한 리소스/추적 요청 차단 라우팅 적용"""
+    context.route('**/*', _route_request)
+
+
+def wait_for_detail_ready(page, timeout=30000):
+    """상세 페이지의 메타데이터 영역과 본문 영역이 붙고, 문서번호가 화면에 채워질 때까지 대기"""
+    for selector in DETAIL_READY_SELECTORS:
+        page.wait_for_selector(selector, state='attached', timeout=timeout)
+    page.wait_for_function(DOC_NUMBER_READY_JS, arg=DOC_NUMBER_XPATHS, timeout=timeout)
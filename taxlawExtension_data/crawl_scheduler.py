@@ -0,0 +1,168 @@
+import logging
+import threading
+from dataclasses import dataclass
+
+from crawl_pool import PRIORITY_NEW, PRIORITY_RETRY, CrawlItem
+
+logger = logging.getLogger(__name__)
+
+# 검색할 수 있는 문서 컬렉션: 사이트맵 메뉴 XPath
+COLLECTIONS = {
+    "question": {"name": "해석례", "menu_xpath": '//*[@id="siteMapArea"]/li[2]/ul/li[1]/ul/li[1]'},
+    "precedent": {"name": "판례", "menu_xpath": '//*[@id="siteMapArea"]/li[3]/ul/li[1]/ul/li[1]'},
+}
+
+
+@dataclass(frozen=True)
+class CrawlQuery:
+    """검색어 하나와 컬렉션 하나의 목록 수집 단위"""
+    keyword: str
+    collection: str = "question"
+
+    @property
+    def key(self):
+        """문서 저장소의 대기열/체크포인트 키"""
+        return f"{self.collection}:{self.keyword}"
+
+    @property
+    def label(self):
+        return f"{COLLECTIONS[self.collection]['name']} '{self.keyword}'"
+
+
+def build_queries(keywords, collections=("question",)):
+    """검색어 × 컬렉션 조합 목록 (중복 제거, 입력 순서 유지)"""
+    for collection in collections:
+        if collection not in COLLECTIONS:
+            raise ValueError(f"알 수 없는 컬렉션: {collection} (사용 가능: {', '.join(COLLECTIONS)})")
+    keywords = [keyword.strip() for keyword in keywords if keyword and keyword.strip()]
+    return list(dict.fromkeys(
+        CrawlQuery(keyword, collection) for keyword in keywords for collection in collections
+    ))
+
+
+def load_keywords(path):
+    """검색어 파일 읽기 (한 줄에 하나, 빈 줄과 #으로 시작하는 줄은 무시)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+class CrawlScheduler:
+    """여러 검색어/컬렉션 목록에서 찾은 상세 문서를 하나의 워커 풀로 배분
+
+    문서번호는 모든 쿼리가 공유하는 집합으로 중복을 제거하므로, 여러 주제에
+    함께 걸리는 문서도 상세 페이지는 한 번만 연다. 이미 수집한 문서는 넘기지
+    않고, 처음 보는 문서를 이전에 실패한 문서보다 먼저 처리하도록 워커 큐에
+    우선순위를 준다. 여러 실행에 걸쳐 max_failed_attempts번 실패했거나 다시
+    시도해도 소용없는 오류(없는 문서 등)로 실패한 문서는 더 넘기지 않는다.
+    쿼리별로 목록 행 수/새 문서 수/중복 수를 집계한다.
+    """
+
+    def __init__(self, pool, doc_store, scraped_docs, failed_docs, retry_only_failed=False,
+                 max_failed_attempts=5):
+        self.pool = pool
+        self.doc_store = doc_store
+        self.scraped_docs = scraped_docs
+        self.failed_docs = failed_docs
+        self.retry_only_failed = retry_only_failed
+        self.max_failed_attempts = max_failed_attempts
+
+        self._claimed = set()
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _query_stats(self, query):
+        return self.stats.setdefault(query.key, {"label": query.label, "rows": 0, "new": 0, "duplicate": 0})
+
+    def is_known(self, doc_number):
+        """이미 수집했거나 이번 실행에서 워커에 넘긴 문서인지"""
+        return doc_number in self._claimed or doc_number in self.scraped_docs
+
+    def claim(self, query, doc_number):
+        """목록에서 만난 문서를 수집할지 결정하고, 수집한다면 다른 쿼리보다 먼저 차지
+
+        True를 받은 호출자는 URL을 확인해 dispatch하거나, 실패하면 release한다.
+        """
+        with self._lock:
+            stats = self._query_stats(query)
+            stats["rows"] += 1
+            if self.is_known(doc_number):
+                stats["duplicate"] += 1
+                return False
+            # 실패 문서만 재시도하는 경우, 실패 목록에 없는 문서는 건너뛰기
+            if self.retry_only_failed and doc_number not in self.failed_docs:
+                return False
+            if doc_number in self.failed_docs and not self._should_retry(self.failed_docs[doc_number]):
+                return False
+            self._claimed.add(doc_number)
+            stats["new"] += 1
+            return True
+
+    def release(self, doc_number):
+        with self._lock:
+            self._claimed.discard(doc_number)
+
+    def dispatch(self, query, items, listing_offset=None):
+        """목록 한 페이지에서 찾은 문서를 대기열에 기록한 뒤 워커 풀에 넘김
+
+        중간에 멈춰도 다음 실행에서 대기 문서와 체크포인트부터 이어서 수집할 수
+        있도록 저장소 기록을 먼저 한다.
+        """
+        self.doc_store.record_listing_page(
+            query.key,
+            [(item.doc_number, item.url, item.use_precedent) for item in items],
+            listing_offset
+        )
+        for item in items:
+            self.pool.submit(item, priority=self._priority(item.doc_number))
+
+    def _should_retry(self, record):
+        """이전 실행의 실패 기록을 보고 다시 시도할지 결정"""
+        if record.get('attempts', 1) >= self.max_failed_attempts:
+            return False
+        return self.pool.retry_policy.is_retryable(record.get('error_class', 'parse'))
+
+    def _priority(self, doc_number):
+        return PRIORITY_RETRY if doc_number in self.failed_docs else PRIORITY_NEW
+
+    def resume_pending(self):
+        """이전 실행에서 목록에서 발견만 하고 수집하지 못한 문서를 먼저 워커에 넘김"""
+        if self.retry_only_failed:
+            return 0
+        resumed = 0
+        for doc_number, doc_url, use_precedent in self.doc_store.pending_frontier():
+            with self._lock:
+                if self.is_known(doc_number):
+                    continue
+                self._claimed.add(doc_number)
+            self.pool.submit(CrawlItem(doc_number, doc_url, use_precedent), priority=self._priority(doc_number))
+            resumed += 1
+        return resumed
+
+    def resume_failed(self):
+        """이전 실행에서 실패한 문서 중 다시 시도할 문서를 목록 탐색 없이 바로 워커에 넘김
+
+        URL이 기록되지 않은 예전 실패 기록은 목록에서 다시 만났을 때 claim으로 처리된다.
+        """
+        resumed = 0
+        for record in list(self.failed_docs.values()):
+            doc_number = record.get('doc_number')
+            doc_url = record.get('url')
+            if not doc_number or not doc_url or not self._should_retry(record):
+                continue
+            with self._lock:
+                if self.is_known(doc_number):
+                    continue
+                self._claimed.add(doc_number)
+            self.pool.submit(CrawlItem(doc_number, doc_url, bool(record.get('use_precedent'))), priority=PRIORITY_RETRY)
+            resumed += 1
+        return resumed
+
+    def print_report(self):
+        """쿼리별 목록 행 수와 실제로 넘긴 고유 문서 수 출력"""
+        total_rows = sum(stats["rows"] for stats in self.stats.values())
+        total_new = sum(stats["new"] for stats in self.stats.values())
+        for stats in self.stats.values():
+            logger.info("  %s: 목록 %d건, 새 문서 %d건, 중복 %d건",
+                        stats['label'], stats['rows'], stats['new'], stats['duplicate'])
+        logger.info("쿼리 %d개의 목록 %d건 중 고유 문서 %d건을 수집 대상으로 넘겼습니다.",
+                    len(self.stats), total_rows, total_new)
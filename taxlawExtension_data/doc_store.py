@@ -0,0 +1,570 @@
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from jsonl_store import read_jsonl_records
+
+logger = logging.getLogger(__name__)
+
+
+# 마크다운 기본정보 항목 -> 메타데이터 필드
+BASIC_INFO_FIELDS = {
+    "문서번호": "doc_num",
+    "세목": "tax_type",
+    "문서명": "doc_title",
+    "문서유형": "doc_type",
+    "생산일자": "produce_date",
+    "귀속연도": "related_date",
+    "법원유형": "court_sim",
+    "진행상황": "progress",
+    "판결결과": "doc_result",
+    "URL": "url",
+}
+
+# 마크다운 목록 섹션 -> 메타데이터 필드
+LIST_SECTIONS = {
+    "관련 주제어": "related_keywords",
+    "관련 법령": "related_laws",
+    "유사문서": "similar_docs",
+    "태그 클라우드": "tag_cloud",
+}
+
+# 크롤러 결과 중 메타데이터로 다루는 필드 (본문 등 큰 값은 제외)
+INDEX_FIELDS = list(BASIC_INFO_FIELDS.values()) + list(LIST_SECTIONS.values()) + ["summary"]
+
+CONTENT_HEADING = re.compile(r'^# [Cc]ontent\s*$', re.MULTILINE)
+SIMILAR_DOC_LINE = re.compile(r'^\[(?P<title>.*)\] (?P<doc_num>.*?)(?: \((?P<date>[^()]*)\))?$')
+
+
+def normalize_metadata(data):
+    """크롤러 결과(dict)에서 메타데이터 필드만 추림"""
+    entry = {}
+    for field in INDEX_FIELDS:
+        value = data.get(field)
+        if field == "summary" and isinstance(value, dict):
+            value = value.get("content", "")
+        if value is None:
+            value = [] if field in LIST_SECTIONS.values() else ""
+        entry[field] = value
+    return entry
+
+
+def parse_markdown_metadata(text):
+    """문서 마크다운의 '# Metadata' 섹션을 메타데이터 dict로 파싱"""
+    data = {}
+    section = None
+    in_metadata = False
+    summary_lines = []
+
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if line == '# Metadata':
+            in_metadata = True
+            continue
+        if not in_metadata:
+            continue
+        if line.startswith('# '):
+            break
+        if line.startswith('## '):
+            section = line[3:].strip()
+            continue
+
+        if section == '요지':
+            summary_lines.append(raw_line)
+        elif section == '기본정보' and line.startswith('- ') and ':' in line:
+            key, value = line[2:].split(':', 1)
+            field = BASIC_INFO_FIELDS.get(key.strip())
+            if field:
+                data[field] = value.strip()
+        elif section in LIST_SECTIONS and line.startswith('- '):
+            field = LIST_SECTIONS[section]
+            value = line[2:].strip()
+            if field == "similar_docs":
+                match = SIMILAR_DOC_LINE.match(value)
+                value = match.groupdict(default='') if match else {"title": value, "doc_num": "", "date": ""}
+            data.setdefault(field, []).append(value)
+
+    summary = '\n'.join(summary_lines).strip()
+    data["summary"] = "" if summary == '(없음)' else summary
+    return normalize_metadata(data)
+
+
+def split_markdown_document(text):
+    """문서 마크다운을 (메타데이터, 본문)으로 분리"""
+    match = CONTENT_HEADING.search(text)
+    body = text[match.end():].strip() if match else ''
+    return parse_markdown_metadata(text), body
+
+
+DOCUMENT_COLUMNS = (
+    "doc_num", "doc_title", "doc_type", "tax_type", "produce_date", "related_date",
+    "court_sim", "progress", "doc_result", "url", "summary",
+    "html_path", "markdown_path", "body", "updated_at", "md_mtime"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_num TEXT PRIMARY KEY,
+    doc_title TEXT, doc_type TEXT, tax_type TEXT, produce_date TEXT, related_date TEXT,
+    court_sim TEXT, progress TEXT, doc_result TEXT, url TEXT, summary TEXT,
+    html_path TEXT, markdown_path TEXT, body TEXT, updated_at TEXT, md_mtime INTEGER
+);
+CREATE TABLE IF NOT EXISTS keywords (doc_num TEXT NOT NULL, keyword TEXT NOT NULL, position INTEGER);
+CREATE INDEX IF NOT EXISTS idx_keywords_doc ON keywords (doc_num);
+CREATE INDEX IF NOT EXISTS idx_keywords_keyword ON keywords (keyword);
+CREATE TABLE IF NOT EXISTS laws (doc_num TEXT NOT NULL, law TEXT NOT NULL, position INTEGER);
+CREATE INDEX IF NOT EXISTS idx_laws_doc ON laws (doc_num);
+CREATE INDEX IF NOT EXISTS idx_laws_law ON laws (law);
+CREATE TABLE IF NOT EXISTS tags (doc_num TEXT NOT NULL, tag TEXT NOT NULL, position INTEGER);
+CREATE INDEX IF NOT EXISTS idx_tags_doc ON tags (doc_num);
+CREATE TABLE IF NOT EXISTS similar_docs (
+    doc_num TEXT NOT NULL, similar_doc_num TEXT, title TEXT, date TEXT, position INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_similar_doc ON similar_docs (doc_num);
+CREATE INDEX IF NOT EXISTS idx_similar_target ON similar_docs (similar_doc_num);
+CREATE TABLE IF NOT EXISTS crawl_status (
+    doc_number TEXT PRIMARY KEY,
+    url TEXT,
+    status TEXT NOT NULL,
+    error_message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    use_precedent INTEGER NOT NULL DEFAULT 0,
+    query TEXT,
+    discovered_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_status_status ON crawl_status (status);
+CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+    query TEXT PRIMARY KEY,
+    listing_offset INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+"""
+
+# 이전 버전 저장소에 없던 컬럼 (열 때 추가): (테이블, 컬럼, 정의)
+COLUMN_MIGRATIONS = (
+    ("crawl_status", "use_precedent", "INTEGER NOT NULL DEFAULT 0"),
+    ("crawl_status", "query", "TEXT"),
+    ("crawl_status", "discovered_at", "TEXT"),
+    ("documents", "md_mtime", "INTEGER"),
+)
+
+# 문서 하위 목록 테이블: (테이블, 값 컬럼, 메타데이터 필드)
+LIST_TABLES = (
+    ("keywords", "keyword", "related_keywords"),
+    ("laws", "law", "related_laws"),
+    ("tags", "tag", "tag_cloud"),
+)
+
+
+class DocStore:
+    """크롤러와 API 서버가 함께 쓰는 SQLite(WAL) 문서 저장소
+
+    크롤러는 put_document/set_crawl_status로 넘기기만 하고, 쓰기는 모아서
+    batch_size건 또는 flush_interval초마다 트랜잭션 하나로 반영한다.
+    API 서버는 문서번호 기본키/보조 인덱스로 조회하므로 파일을 읽지 않는다.
+    """
+
+    def __init__(self, path="documents.db", batch_size=20, flush_interval=2.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+        self._pending_docs = []
+        self._pending_status = []
+        self._last_flush = time.monotonic()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="doc-store-flush", daemon=True)
+        self._flusher.start()
+
+    def _migrate(self):
+        with self._conn:
+            for table, column, definition in COLUMN_MIGRATIONS:
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    # ------------------------------------------------------------------
+    # 쓰기 (일괄 트랜잭션)
+    # ------------------------------------------------------------------
+    def put_document(self, doc_info, body=None):
+        """크롤러 결과(dict) 한 건 저장 예약"""
+        record = self._document_record(doc_info, body)
+        with self._lock:
+            self._pending_docs.append(record)
+            self._maybe_flush()
+
+    @staticmethod
+    def _document_record(doc_info, body=None):
+        metadata = normalize_metadata(doc_info)
+        if body is None:
+            body = (doc_info.get("details") or {}).get("content", "")
+        return {
+            **metadata,
+            "html_path": doc_info.get("html_path") or "",
+            "markdown_path": doc_info.get("markdown_path") or "",
+            "body": body,
+            "updated_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            # 크롤러가 새로 쓴 문서는 다음 refresh_from_directory에서 마크다운과 한 번 맞춘다
+            "md_mtime": None,
+        }
+
+    @staticmethod
+    def _markdown_record(path, doc_num, md_mtime=None):
+        """문서 마크다운 파일 하나를 저장소 레코드로 변환"""
+        with open(path, 'r', encoding='utf-8') as f:
+            metadata, body = split_markdown_document(f.read())
+        # 파일명(문서번호)으로 조회하므로 파일명을 키로 쓴다
+        metadata["doc_num"] = doc_num
+        html_path = path[:-3] + '.html'
+        return {
+            **metadata,
+            "html_path": html_path if os.path.exists(html_path) else "",
+            "markdown_path": path,
+            "body": body,
+            "updated_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "md_mtime": md_mtime,
+        }
+
+    def set_crawl_status(self, doc_number, status, url=None, error_message=None):
+        """수집 상태 기록 예약 ('done', 'failed' 등, 실패는 시도 횟수 누적)"""
+        with self._lock:
+            self._pending_status.append(
+                (doc_number, url, status, error_message, time.strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        if (len(self._pending_docs) + len(self._pending_status) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # 예약된 쓰기는 남아 있으므로 다음 flush에서 다시 반영된다
+                logger.warning("문서 저장소 반영 실패, 다음에 다시 시도합니다: %s", str(e))
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error("문서 저장소 반영 중 오류 발생: %s", str(e))
+
+    def flush(self):
+        """예약된 쓰기를 트랜잭션 하나로 반영
+
+        트랜잭션이 실패하면(다른 프로세스의 잠금 등) 롤백하고 예약된 쓰기를 그대로
+        남겨 두어 다음 flush에서 다시 시도한다.
+        """
+        with self._lock:
+            docs, statuses = self._pending_docs, self._pending_status
+            self._last_flush = time.monotonic()
+            if not docs and not statuses:
+                return
+            with self._conn:
+                for record in docs:
+                    self._write_document(record)
+                self._conn.executemany("""
+                    INSERT INTO crawl_status (doc_number, url, status, error_message, attempts, updated_at)
+                    VALUES (?, ?, ?, ?, 1, ?)
+                    ON CONFLICT (doc_number) DO UPDATE SET
+                        url = COALESCE(excluded.url, crawl_status.url),
+                        status = excluded.status,
+                        error_message = excluded.error_message,
+                        attempts = crawl_status.attempts + 1,
+                        updated_at = excluded.updated_at
+                """, statuses)
+            # 커밋된 뒤에만 비운다 (잠금을 잡고 있으므로 그 사이에 추가된 쓰기는 없다)
+            self._pending_docs = []
+            self._pending_status = []
+
+    def _write_document(self, record, replace=True):
+        doc_num = record["doc_num"]
+        if not doc_num:
+            return
+        if not replace:
+            exists = self._conn.execute("SELECT 1 FROM documents WHERE doc_num = ?", (doc_num,)).fetchone()
+            if exists:
+                return
+
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO documents ({', '.join(DOCUMENT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(DOCUMENT_COLUMNS))})",
+            [record.get(column, "") for column in DOCUMENT_COLUMNS]
+        )
+        for table, column, field in LIST_TABLES:
+            self._conn.execute(f"DELETE FROM {table} WHERE doc_num = ?", (doc_num,))
+            self._conn.executemany(
+                f"INSERT INTO {table} (doc_num, {column}, position) VALUES (?, ?, ?)",
+                [(doc_num, value, position) for position, value in enumerate(record[field])]
+            )
+        self._conn.execute("DELETE FROM similar_docs WHERE doc_num = ?", (doc_num,))
+        self._conn.executemany(
+            "INSERT INTO similar_docs (doc_num, similar_doc_num, title, date, position) VALUES (?, ?, ?, ?, ?)",
+            [
+                (doc_num, doc.get("doc_num", ""), doc.get("title", ""), doc.get("date", ""), position)
+                for position, doc in enumerate(record["similar_docs"])
+            ]
+        )
+
+    # ------------------------------------------------------------------
+    # 수집 대기열(frontier)과 목록 체크포인트
+    # ------------------------------------------------------------------
+    def record_listing_page(self, query, items, listing_offset=None):
+        """검색 목록에서 발견한 문서와 목록 위치를 트랜잭션 하나로 즉시 저장
+
+        items는 (문서번호, URL, 판례 여부) 목록이다. 새 문서는 'pending'으로
+        추가하고, 이미 있는 문서는 상태를 바꾸지 않고 빠진 URL만 채운다.
+        listing_offset이 None이면 체크포인트는 건드리지 않는다 (증분 수집).
+        """
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO crawl_status (doc_number, url, status, attempts, updated_at, use_precedent, query, discovered_at)
+                VALUES (?, ?, 'pending', 0, ?, ?, ?, ?)
+                ON CONFLICT (doc_number) DO UPDATE SET
+                    url = COALESCE(crawl_status.url, excluded.url),
+                    use_precedent = excluded.use_precedent,
+                    query = COALESCE(crawl_status.query, excluded.query),
+                    discovered_at = COALESCE(crawl_status.discovered_at, excluded.discovered_at)
+            """, [(doc_number, url, now, int(bool(use_precedent)), query, now)
+                  for doc_number, url, use_precedent in items])
+            if listing_offset is not None:
+                self._conn.execute("""
+                    INSERT INTO crawl_checkpoints (query, listing_offset, completed, updated_at)
+                    VALUES (?, ?, 0, ?)
+                    ON CONFLICT (query) DO UPDATE SET
+                        listing_offset = MAX(crawl_checkpoints.listing_offset, excluded.listing_offset),
+                        updated_at = excluded.updated_at
+                """, (query, listing_offset, now))
+
+    def complete_listing(self, query):
+        """검색 목록을 끝까지 훑었음을 기록"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO crawl_checkpoints (query, listing_offset, completed, updated_at)
+                VALUES (?, 0, 1, ?)
+                ON CONFLICT (query) DO UPDATE SET completed = 1, updated_at = excluded.updated_at
+            """, (query, time.strftime('%Y-%m-%d %H:%M:%S')))
+
+    def get_checkpoint(self, query):
+        """(마지막으로 처리한 목록 위치, 목록 완료 여부), 기록이 없으면 (0, False)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT listing_offset, completed FROM crawl_checkpoints WHERE query = ?", (query,)
+            ).fetchone()
+        return (row[0], bool(row[1])) if row else (0, False)
+
+    def pending_frontier(self, query=None):
+        """발견했지만 아직 수집하지 못한 문서의 (문서번호, URL, 판례 여부) 목록 (발견 순)"""
+        self.flush()
+        sql = "SELECT doc_number, url, use_precedent FROM crawl_status WHERE status = 'pending' AND url IS NOT NULL"
+        params = ()
+        if query is not None:
+            sql += " AND query = ?"
+            params = (query,)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY discovered_at, rowid", params).fetchall()
+        return [(doc_number, url, bool(use_precedent)) for doc_number, url, use_precedent in rows]
+
+    def close(self):
+        self._closed.set()
+        self._flusher.join()
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get_metadata(self, doc_num):
+        return self.get_metadata_many([doc_num]).get(doc_num)
+
+    def get_metadata_many(self, doc_nums):
+        """문서번호 목록의 메타데이터를 {문서번호: dict}로 반환 (없는 문서는 빠짐)"""
+        doc_nums = list(dict.fromkeys(doc_nums))
+        if not doc_nums:
+            return {}
+        placeholders = ', '.join('?' * len(doc_nums))
+        fields = [field for field in INDEX_FIELDS if field in DOCUMENT_COLUMNS]
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(fields)} FROM documents WHERE doc_num IN ({placeholders})", doc_nums
+            ).fetchall()
+            results = {}
+            for row in rows:
+                metadata = dict(zip(fields, row))
+                for _, _, field in LIST_TABLES:
+                    metadata[field] = []
+                metadata["similar_docs"] = []
+                results[metadata["doc_num"]] = metadata
+            if not results:
+                return {}
+
+            found = list(results)
+            placeholders = ', '.join('?' * len(found))
+            for table, column, field in LIST_TABLES:
+                for doc_num, value in self._conn.execute(
+                    f"SELECT doc_num, {column} FROM {table} WHERE doc_num IN ({placeholders}) ORDER BY doc_num, position",
+                    found
+                ):
+                    results[doc_num][field].append(value)
+            for doc_num, similar_doc_num, title, date in self._conn.execute(
+                f"SELECT doc_num, similar_doc_num, title, date FROM similar_docs "
+                f"WHERE doc_num IN ({placeholders}) ORDER BY doc_num, position",
+                found
+            ):
+                results[doc_num]["similar_docs"].append({"title": title, "doc_num": similar_doc_num, "date": date})
+        return results
+
+    def documents_citing(self, doc_num):
+        """similar_docs 목록에 doc_num을 포함한 문서번호 목록 (역방향 유사문서 엣지)"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT doc_num FROM similar_docs WHERE similar_doc_num = ?", (doc_num,)
+            )]
+
+    def crawl_status(self, doc_number):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, attempts, error_message FROM crawl_status WHERE doc_number = ?", (doc_number,)
+            ).fetchone()
+        return {"status": row[0], "attempts": row[1], "error_message": row[2]} if row else None
+
+    def __contains__(self, doc_num):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents WHERE doc_num = ?", (doc_num,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # 기존 출력 가져오기
+    # ------------------------------------------------------------------
+    def import_documents(self, path, replace=True):
+        """scraped_documents.jsonl(JsonlStore) 또는 기존 scraped_documents.json 가져오기
+
+        replace=False면 저장소에 이미 있는 문서는 건드리지 않고 없는 문서만 추가한다.
+        JSONL은 읽기 전용으로 읽으므로 크롤러가 쓰고 있는 파일이어도 건드리지 않는다.
+        """
+        if path.endswith('.jsonl'):
+            documents = list(read_jsonl_records(path).values())
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            documents = list(data.values() if isinstance(data, dict) else data)
+
+        if replace:
+            for doc_info in documents:
+                self.put_document(doc_info)
+            self.flush()
+            return
+        with self._lock, self._conn:
+            for doc_info in documents:
+                self._write_document(self._document_record(doc_info), replace=False)
+
+    def import_failed(self, path):
+        """failed_documents.jsonl/.json의 실패 기록을 crawl_status로 가져오기"""
+        if path.endswith('.jsonl'):
+            records = list(read_jsonl_records(path).values())
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            records = list(data.values() if isinstance(data, dict) else data)
+        for record in records:
+            self.set_crawl_status(record["doc_number"], "failed", record.get("url"), record.get("error_message"))
+        self.flush()
+
+    def import_markdown_dir(self, data_dir):
+        """data_dir/*.md 중 저장소에 없는 문서만 가져오기 (크롤러 결과가 더 자세하므로 덮어쓰지 않음)"""
+        with self._lock:
+            existing = {row[0] for row in self._conn.execute("SELECT doc_num FROM documents")}
+        count = 0
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+                # 이미 있는 문서는 파일을 읽지 않는다
+                if entry.name[:-3] in existing:
+                    continue
+                record = self._markdown_record(entry.path, entry.name[:-3], entry.stat().st_mtime_ns)
+                with self._lock, self._conn:
+                    self._write_document(record, replace=False)
+                count += 1
+        return count
+
+    def refresh_from_directory(self, data_dir):
+        """data_dir의 .md 중 새로 생기거나 mtime이 바뀐 파일만 다시 파싱해 반영, 반영 건수 반환
+
+        API 서버가 주기적으로 호출해 마크다운을 고치거나 추가하면 메타데이터 조회에도
+        반영되게 한다. 파일이 지워져도 크롤러가 저장한 문서는 지우지 않는다.
+        """
+        if not os.path.isdir(data_dir):
+            return 0
+
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT doc_num, md_mtime FROM documents").fetchall())
+
+        changed = []
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+                doc_num = entry.name[:-3]
+                mtime = entry.stat().st_mtime_ns
+                if doc_num not in stored or stored[doc_num] != mtime:
+                    changed.append((doc_num, entry.path, mtime))
+
+        count = 0
+        for doc_num, path, mtime in changed:
+            try:
+                record = self._markdown_record(path, doc_num, mtime)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning("마크다운 메타데이터 갱신 실패 (%s): %s", path, str(e))
+                continue
+            with self._lock, self._conn:
+                self._write_document(record)
+            count += 1
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기존 크롤링 결과(JSON/JSONL/MD)를 SQLite 문서 저장소로 가져오기")
+    parser.add_argument('--db', default="documents.db", help="문서 저장소 경로 (기본값: documents.db)")
+    parser.add_argument('--docs', default="scraped_documents.jsonl",
+                        help="크롤러 결과 파일 (.jsonl 또는 .json, 기본값: scraped_documents.jsonl)")
+    parser.add_argument('--failed', default="failed_documents.jsonl",
+                        help="실패 문서 파일 (.jsonl 또는 .json, 기본값: failed_documents.jsonl)")
+    parser.add_argument('--data', default="data", help="문서 .md/.html 디렉토리 (기본값: data)")
+    args = parser.parse_args()
+
+    store = DocStore(args.db)
+    try:
+        for path, importer in ((args.docs, store.import_documents), (args.failed, store.import_failed)):
+            if os.path.exists(path):
+                importer(path)
+                print(f"{path} 가져오기 완료")
+        if os.path.isdir(args.data):
+            print(f"{args.data}에서 새 마크다운 {store.import_markdown_dir(args.data)}개 가져오기 완료")
+        print(f"문서 저장소: {args.db} ({len(store)}개 문서)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import asyncio
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 제공
+    brotli = None
+
+
+class CachedFile:
+    """파일 한 개의 원본/압축본과 검증용 헤더 값"""
+
+    def __init__(self, data, mtime_ns, size):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.variants = {"identity": data, "gzip": gzip.compress(data, compresslevel=6)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(data, quality=5)
+        self.etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        self.last_modified = formatdate(mtime_ns / 1e9, usegmt=True)
+
+    @property
+    def data(self):
+        return self.variants["identity"]
+
+    @property
+    def nbytes(self):
+        return sum(len(v) for v in self.variants.values())
+
+    def choose_encoding(self, accept_encoding):
+        """Accept-Encoding에 맞는 가장 작은 인코딩 선택"""
+        accepted = set()
+        for token in (accept_encoding or '').split(','):
+            name, *params = [part.strip() for part in token.split(';')]
+            quality = 1.0
+            for param in params:
+                if param.startswith('q='):
+                    try:
+                        quality = float(param[2:])
+                    except ValueError:
+                        pass
+            if name and quality > 0:
+                accepted.add(name.lower())
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def not_modified(self, if_none_match=None, if_modified_since=None):
+        """조건부 요청(If-None-Match / If-Modified-Since)에 304로 답할 수 있는지"""
+        if if_none_match:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return '*' in tags or self.etag in tags
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.mtime_ns / 1e9) <= since
+        return False
+
+
+class FileCache:
+    """자주 조회되는 문서 파일의 LRU 캐시 (전체 크기 max_bytes 이하)
+
+    파일 읽기와 압축은 스레드에서 처리해 이벤트 루프를 막지 않는다.
+    조회 때마다 stat으로 mtime/크기를 확인하므로 크롤러가 파일을 갱신하면
+    다음 요청에서 새 내용으로 교체된다.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total = 0
+        self._loading = {}
+
+    async def get(self, path):
+        """파일 내용을 CachedFile로 반환 (없으면 FileNotFoundError)"""
+        stat = await asyncio.to_thread(os.stat, path)
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self._entries.move_to_end(path)
+            return entry
+
+        # 같은 파일을 동시에 요청하면 한 번만 읽는다
+        loading = self._loading.get(path)
+        if loading is None:
+            loading = asyncio.ensure_future(asyncio.to_thread(self._load, path, stat))
+            self._loading[path] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(path, None))
+        entry = await asyncio.shield(loading)
+        self._store(path, entry)
+        return entry
+
+    @staticmethod
+    def _load(path, stat):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return CachedFile(data, stat.st_mtime_ns, len(data))
+
+    def _store(self, path, entry):
+        previous = self._entries.pop(path, None)
+        if previous is not None:
+            self._total -= previous.nbytes
+        if entry.nbytes > self.max_bytes:
+            return
+        self._entries[path] = entry
+        self._total += entry.nbytes
+        while self._total > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total -= evicted.nbytes
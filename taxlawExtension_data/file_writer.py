@@ -0,0 +1,91 @@
+import logging
+import os
+import queue
+import threading
+
+from telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class BatchFileWriter:
+    """문서 파일 쓰기를 백그라운드 스레드에서 모아서 처리
+
+    크롤링 경로에서는 submit으로 (경로, 내용)만 넘기고 바로 다음 단계로
+    진행한다. 쓰기는 임시 파일에 기록한 뒤 os.replace로 교체하므로
+    읽는 쪽(API 서버)이 반쯤 쓰인 파일을 보는 일이 없다. 같은 프로세스에서
+    새 내용을 읽어야 하는 쪽(요약 단계)은 is_pending으로 교체가 끝났는지 확인한다.
+    """
+
+    _STOP = object()
+
+    def __init__(self, batch_size=32, flush_interval=1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, text):
+        """파일 쓰기 예약"""
+        with self._pending_lock:
+            self._pending[path] = self._pending.get(path, 0) + 1
+        self._queue.put((path, text))
+
+    def is_pending(self, path):
+        """path에 예약한 쓰기가 아직 반영되지 않았는지"""
+        with self._pending_lock:
+            return path in self._pending
+
+    def _written(self, path):
+        with self._pending_lock:
+            if self._pending[path] > 1:
+                self._pending[path] -= 1
+            else:
+                del self._pending[path]
+
+    def close(self):
+        """남은 쓰기를 모두 처리한 뒤 종료"""
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            item = first
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            # 백그라운드 쓰기 시간은 문서별 persist와 따로 file_write 단계로 집계
+            for path, text in batch:
+                with telemetry.span("file_write"):
+                    self._write(path, text)
+                self._written(path)
+
+    @staticmethod
+    def _write(path, text):
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error("파일 저장 중 오류 발생 (%s): %s", path, str(e))
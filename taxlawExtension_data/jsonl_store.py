@@ -0,0 +1,288 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def read_jsonl_records(path):
+    """JsonlStore 파일을 읽기 전용으로 한 번 훑어 {키: 최신 값} 반환
+
+    다른 프로세스가 쓰는 중인 파일도 읽을 수 있도록 파일을 열기만 하고 잘린 꼬리를
+    자르지 않으며(마지막 미완성 줄은 무시), 한 번 연 파일만 끝까지 읽으므로 도중에
+    압축(compact)으로 파일이 교체되어도 교체 전 내용을 일관되게 읽는다.
+    """
+    records = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            record = JsonlStore._decode(line)
+            if record is None or record.get('key') is None:
+                continue
+            if record.get('deleted'):
+                records.pop(record['key'], None)
+            else:
+                records[record['key']] = record['data']
+    return records
+
+
+class JsonlStore:
+    """키(doc_num 등) 기준 append-only JSONL 저장소
+
+    레코드 하나를 한 줄로 이어 쓰기만 하므로 저장 비용이 문서 수와 무관하고,
+    프로세스가 쓰기 도중 종료되어도 마지막 줄만 잘린다. 메모리에는 키별
+    최신 레코드의 파일 오프셋만 들고 있고, 값은 필요할 때 파일에서 읽는다.
+    같은 키가 여러 번 기록되어 죽은 줄이 쌓이면 주기적으로 압축(compaction)한다.
+
+    shared=True면 여러 프로세스(크롤러와 API 서버 등)가 같은 파일에 함께
+    쓴다. 한 줄을 write 한 번으로 이어 쓰고, 오프셋은 파일을 다시 읽어서만
+    정하며(refresh), 다른 프로세스가 쓰던 파일을 교체하지 않도록 압축은 하지 않는다.
+    """
+
+    def __init__(self, path, fsync_every=50, fsync_interval=5.0,
+                 compact_min_lines=1000, compact_ratio=2.0, shared=False):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_min_lines = compact_min_lines
+        self.compact_ratio = compact_ratio
+        self.shared = shared
+
+        self._index = {}
+        self._line_count = 0
+        self._scanned_end = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.RLock()
+
+        self._load_index()
+        self._file = open(self.path, 'ab', buffering=0 if shared else -1)
+
+    # ------------------------------------------------------------------
+    # 인덱스 로드
+    # ------------------------------------------------------------------
+    def _load_index(self):
+        """파일을 한 줄씩 읽어 키 -> 오프셋 인덱스 재구성"""
+        if not os.path.exists(self.path):
+            return
+
+        valid_end = self._scan_from(0)
+
+        # 잘린 꼬리는 다음 append와 섞이지 않도록 잘라낸다
+        # (공유 모드에서는 다른 프로세스가 쓰는 중인 줄일 수 있으므로 그대로 둔다)
+        if not self.shared and valid_end < os.path.getsize(self.path):
+            logger.warning("%s: 불완전한 마지막 레코드 제거", self.path)
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+
+    def _scan_from(self, start):
+        """start부터 완전한 줄만 읽어 인덱스에 반영하고, 읽은 끝 위치 반환"""
+        valid_end = start
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                if not line.endswith(b'\n'):
+                    # 쓰기 도중 중단된(또는 아직 쓰는 중인) 마지막 줄
+                    break
+                valid_end = offset
+                record = self._decode(line)
+                if record is None:
+                    continue
+                self._line_count += 1
+                self._apply(record, line_offset)
+        self._scanned_end = valid_end
+        return valid_end
+
+    def refresh(self):
+        """다른 프로세스가 이어 쓴 레코드를 인덱스에 반영"""
+        with self._lock:
+            self._file.flush()
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                return
+            if size < self._scanned_end:
+                # 파일이 교체되었으면 처음부터 다시 읽는다
+                self._index = {}
+                self._line_count = 0
+                self._scan_from(0)
+            elif size > self._scanned_end:
+                self._scan_from(self._scanned_end)
+
+    def _apply(self, record, line_offset):
+        key = record.get('key')
+        if key is None:
+            return
+        if record.get('deleted'):
+            self._index.pop(key, None)
+        else:
+            self._index[key] = line_offset
+
+    @staticmethod
+    def _decode(line):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        with self._lock:
+            return list(self._index.keys())
+
+    def get(self, key, default=None):
+        with self._lock:
+            offset = self._index.get(key)
+            if offset is None:
+                return default
+            self._file.flush()
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            record = json.loads(f.readline())
+        if self.shared and record.get('key') != key:
+            # 다른 프로세스가 파일을 교체한 경우 인덱스를 다시 읽고 재시도
+            with self._lock:
+                self._index = {}
+                self._line_count = 0
+                self._scan_from(0)
+            return self.get(key, default) if key in self._index else default
+        return record['data']
+
+    def __getitem__(self, key):
+        if key not in self._index:
+            raise KeyError(key)
+        return self.get(key)
+
+    def items(self):
+        """(키, 값)을 파일 순서대로 스트리밍 (키별 최신 레코드만)"""
+        with self._lock:
+            self._file.flush()
+            live = dict(self._index)
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                record = self._decode(line)
+                if record is None:
+                    continue
+                key = record.get('key')
+                if live.get(key) == line_offset:
+                    yield key, record['data']
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def put(self, key, value):
+        self._append({'key': key, 'data': value})
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def delete(self, key):
+        if key in self._index:
+            self._append({'key': key, 'deleted': True})
+
+    def __delitem__(self, key):
+        if key not in self._index:
+            raise KeyError(key)
+        self.delete(key)
+
+    def _append(self, record):
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            if self.shared:
+                # O_APPEND로 한 번에 써서 다른 프로세스의 줄과 섞이지 않게 하고,
+                # 실제 위치는 파일을 다시 읽어 반영한다
+                self._file.write(line)
+                self.refresh()
+            else:
+                line_offset = self._file.tell()
+                self._file.write(line)
+                self._line_count += 1
+                self._apply(record, line_offset)
+                self._scanned_end = line_offset + len(line)
+            self._pending += 1
+
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self.flush()
+            if self._needs_compaction():
+                self.compact()
+
+    def flush(self):
+        """버퍼에 쌓인 레코드를 디스크에 반영 (fsync 일괄 처리)"""
+        with self._lock:
+            self._file.flush()
+            if self._pending:
+                os.fsync(self._file.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def _needs_compaction(self):
+        return (not self.shared
+                and self._line_count >= self.compact_min_lines
+                and self._line_count > len(self._index) * self.compact_ratio)
+
+    def compact(self):
+        """키별 최신 레코드만 남기도록 파일 재작성"""
+        with self._lock:
+            self.flush()
+            tmp_path = self.path + '.compact'
+            new_index = {}
+            with open(tmp_path, 'wb') as out:
+                for key, value in self.items():
+                    new_index[key] = out.tell()
+                    line = json.dumps({'key': key, 'data': value}, ensure_ascii=False) + '\n'
+                    out.write(line.encode('utf-8'))
+                out.flush()
+                os.fsync(out.fileno())
+                self._scanned_end = out.tell()
+
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'ab')
+            self._index = new_index
+            self._line_count = len(new_index)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._file.close()
+
+    # ------------------------------------------------------------------
+    # 기존 JSON 파일 가져오기
+    # ------------------------------------------------------------------
+    def import_json(self, json_path, key_field='doc_num'):
+        """기존 dict/list 형태의 JSON 파일 내용을 저장소로 옮김"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if isinstance(data, list):
+            data = {item[key_field]: item for item in data if key_field in item}
+
+        for key, value in data.items():
+            self.put(key, value)
+        self.flush()
+        logger.info("%s에서 %d개 문서를 %s로 가져왔습니다.", json_path, len(data), self.path)
@@ -1,21 +1,57 @@
 from playwright.sync_api import sync_playwright
 from playwright.sync_api import expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 import json
-from urllib.parse import urlencode
+import logging
+from urllib.parse import urlencode, urljoin
+import re
+import threading
 import time
 import os
 import pandas as pd
 from print_json import html_to_markdown  # print_json.py의 변환 함수 import
-
-
-
-def split_text(text):
-    parts = text.split(',')
-    if len(parts) == 2:
-        return parts[0].replace("(","").strip(), parts[1].replace(")","").strip()
-    
-    return text, ''
-def scrape_precedent_doc(new_page, download_dir):
+from crawl_pool import CrawlItem, CrawlWorkerPool
+from crawl_scheduler import COLLECTIONS, CrawlScheduler, build_queries, load_keywords
+from jsonl_store import JsonlStore
+from file_writer import BatchFileWriter
+from doc_store import DocStore
+from search_index import SearchIndex
+from page_metadata import (
+    INTERPRETATION_METADATA_SPEC, PRECEDENT_METADATA_SPEC, extract_listing_rows, extract_page_metadata, split_text
+)
+from crawl_profile import LIGHT_LAUNCH_OPTIONS, apply_light_profile
+from retry_policy import RetryPolicy
+from telemetry import configure_logging, telemetry
+from action_harvester import (
+    attach_action_capture, clear_action_capture, extract_action_payload, map_action_payload
+)
+
+# 상세 페이지 병렬 크롤링 설정
+CRAWL_WORKERS = 4      # 동시에 실행할 상세 페이지 워커 수
+PER_HOST_LIMIT = 4     # 호스트당 최대 동시 요청 수
+USE_ACTION_API = False # True면 DOM 대신 action.do JSON 응답에서 문서 수집
+LIGHT_PROFILE = True   # True면 headless + 불필요 리소스 차단 프로필로 상세 페이지 수집
+ASYNC_WRITES = True    # True면 HTML/마크다운 파일을 백그라운드 스레드에서 일괄 저장
+DOC_STORE_PATH = "documents.db"        # API 서버와 함께 쓰는 SQLite 문서 저장소
+SEARCH_INDEX_PATH = "search_index.db"  # API 서버의 /search와 같은 SQLite 파일
+PRECOMPUTE_SUMMARIES = False  # True면 수집한 문서의 요약을 백그라운드에서 미리 생성 (OPENAI_API_KEY 필요)
+SEARCH_KEYWORDS = ["부당행위계산부인 인건비"]  # 목록을 수집할 검색어 (KEYWORDS_FILE이 있으면 파일 내용 사용)
+KEYWORDS_FILE = "keywords.txt"                # 한 줄에 검색어 하나
+CRAWL_COLLECTIONS = ("question",)             # 검색할 컬렉션: "question"(해석례), "precedent"(판례)
+INCREMENTAL_CRAWL = False  # True면 목록 처음부터 새 문서만 확인하고, 이미 수집한 문서가 연속으로 나오면 중단
+KNOWN_RUN_LIMIT = 30       # 증분 수집 중단 기준: 연속으로 만난 이미 수집한 문서 수
+RETRY_ONLY_FAILED = False  # True면 이전에 실패한 문서만 다시 수집
+MAX_FAILED_ATTEMPTS = 5    # 여러 실행에 걸쳐 이만큼 실패한 문서는 자동 재시도하지 않음
+LIST_XPATH = '//*[@id="collectionDiv"]/div[4]/ul/li'
+LOG_LEVEL = "INFO"         # 문서별 진행 로그까지 보려면 "DEBUG"
+LOG_FILE = None            # 예: "crawl.log"
+TELEMETRY_REPORT = "crawl_report.json"  # 단계별 소요 시간 보고서 (None이면 저장하지 않음)
+PROMETHEUS_FILE = None     # 예: "crawl_metrics.prom" (Prometheus 텍스트 형식)
+
+logger = logging.getLogger(__name__)
+
+
+def scrape_precedent_doc(new_page, download_dir, writer=None):
     """판례 문서 크롤링"""
     # 프린트 버튼 클릭
     #new_page.wait_for_selector('//*[@id="bizCommonBtnStorPrintBtn"]', state='visible')
@@ -26,13 +62,15 @@ def scrape_precedent_doc(new_page, download_dir):
     metadata = collect_precedent_metadata(new_page)
 
     #컨텐츠에는 상세내용 하위의 내용만 html로 저장 후 md파일로 변환
-    content = collect_precedent_content(new_page, download_dir)
+    content = collect_precedent_content(new_page, download_dir, metadata['doc_num'], writer)
     
     # 판례용 마크다운 생성
-    markdown_content = generate_markdown(metadata, content, "판례")
+    with telemetry.span("markdown"):
+        markdown_content = generate_markdown(metadata, content, "판례")
     
     # 마크다운 파일 저장
-    save_markdown(markdown_content, metadata['doc_num'], download_dir)
+    with telemetry.span("persist"):
+        save_markdown(markdown_content, metadata['doc_num'], download_dir, writer)
     
     # PDF 다운로드
     #pdf_path = download_pdf(new_page, download_dir)
@@ -46,24 +84,18 @@ def scrape_precedent_doc(new_page, download_dir):
     
     return result
 
-def scrape_interpretation_doc(new_page, download_dir):
+def scrape_interpretation_doc(new_page, download_dir, writer=None):
     """해석례 문서 크롤링"""
     try:
-        print("메타데이터 수집 시작...")
         metadata = collect_interpretation_metadata(new_page)
-        print("메타데이터 수집 완료")
-        
-        print("컨텐츠 수집 시작...")
-        content = collect_interpretation_content(new_page, download_dir)
-        print("컨텐츠 수집 완료")
-        
-        print("마크다운 생성 시작...")
-        markdown_content = generate_markdown(metadata, content, "해석례")
-        print("마크다운 생성 완료")
-        
-        print("마크다운 파일 저장 시작...")
-        save_markdown(markdown_content, metadata['doc_num'], download_dir)
-        print("마크다운 파일 저장 완료")
+        content = collect_interpretation_content(new_page, download_dir, metadata['doc_num'], writer)
+
+        with telemetry.span("markdown"):
+            markdown_content = generate_markdown(metadata, content, "해석례")
+
+        with telemetry.span("persist"):
+            save_markdown(markdown_content, metadata['doc_num'], download_dir, writer)
+        logger.debug("해석례 문서 처리 완료: %s", metadata['doc_num'])
         
         result = {
             **metadata,
@@ -74,16 +106,8 @@ def scrape_interpretation_doc(new_page, download_dir):
         return result
         
     except Exception as e:
-        print("\n=== 해석례 크롤링 상세 오류 ===")
-        print(f"오류 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
-        print(f"오류 발생 라인: {e.__traceback__.tb_lineno}")
-        print(f"오류 메시지: {str(e)}")
-        
-        # 오류 발생 시점의 콜스택 출력
-        import traceback
-        print("\n=== 오류 발생 콜스택 ===")
-        traceback.print_exc()
-        
+        # 오류 발생 시점의 콜스택은 DEBUG에서만 출력 (실패 기록은 워커 풀이 남긴다)
+        logger.debug("해석례 크롤링 상세 오류: %s", str(e), exc_info=True)
         raise e
 
 def collect_precedent_metadata(new_page):
@@ -108,204 +132,22 @@ def collect_precedent_metadata(new_page):
         "tag_cloud": []  # 태그 클라우드 항목 추가
     }
     
-    # 각 메타데이터 항목 개별 수집
-    try:
-        metadata["doc_num"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[1]/strong').inner_text()
-    except Exception as e:
-        print(f"문서번호 수집 실패: {str(e)}")
-
-    try:
-        metadata["produce_date"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[4]/span').inner_text()
-    except Exception as e:
-        print(f"생산일자 수집 실패: {str(e)}")
-
-    try:
-        metadata["related_date"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[2]/span').inner_text()
-    except Exception as e:
-        print(f"관련일자 수집 실패: {str(e)}")
-
-    try:
-        metadata["court_sim"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[3]/span').inner_text()
-    except Exception as e:
-        print(f"법원심급 수집 실패: {str(e)}")
-
-    try:
-        metadata["progress"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[5]/span').inner_text()
-    except Exception as e:
-        print(f"진행상태 수집 실패: {str(e)}")
-
-    try:
-        metadata["tax_type"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/div/ul/li').get_attribute('title')
-    except Exception as e:
-        print(f"세목 수집 실패: {str(e)}")
-
-    try:
-        metadata["doc_title"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/div/strong').inner_text()
-    except Exception as e:
-        print(f"문서제목 수집 실패: {str(e)}")
-
-    try:
-        metadata["doc_type"] = new_page.locator('//*[@id="scrnNm"]').inner_text()
-    except Exception as e:
-        print(f"문서유형 수집 실패: {str(e)}")
-
+    # 모든 항목을 한 번의 evaluate로 수집
     try:
-        metadata["doc_result"] = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/div/em').inner_text()
+        with telemetry.span("metadata"):
+            metadata.update(extract_page_metadata(new_page, PRECEDENT_METADATA_SPEC))
     except Exception as e:
-        print(f"판결결과 수집 실패: {str(e)}")
+        logger.warning("판례 메타데이터 수집 실패: %s", str(e))
 
-    # 관련 주제어와 관련 법령 수집
-    
-    try:
-        base_xpath = '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[2]'
-        rel_groups = new_page.locator(f'{base_xpath}/div[contains(@class, "rel_group")]').all()
-        print(f"발견된 rel_group 개수: {len(rel_groups)}")
-        
-        if len(rel_groups) > 0:
-            for group in rel_groups:
-                try:
-                    group_type = group.locator('span').inner_text().strip()
-                    print(f"처리 중인 그룹 타입: {group_type}")
-                    
-                    links = group.locator('div > a').all()
-                    content_list = [link.inner_text().strip() for link in links if link.inner_text().strip()]
-                    
-                    if '관련 주제어' in group_type:
-                        print(f"관련 주제어 목록: {content_list}")
-                        metadata["related_keywords"] = content_list
-                    elif '관련 법령' in group_type:
-                        print(f"관련 법령 목록: {content_list}")
-                        metadata["related_laws"] = content_list
-                        
-                except Exception as e:
-                    print(f"그룹 처리 중 오류 발생: {str(e)}")
-                    continue
-        else:
-            # 대체 경로 시도
-            try:
-                alt_base_xpath = '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[2]'
-                alt_rel_groups = new_page.locator(f'{alt_base_xpath}/div[contains(@class, "rel_group")]').all()
-                print(f"대체 경로에서 발견된 rel_group 개수: {len(alt_rel_groups)}")
-                
-                for group in alt_rel_groups:
-                    try:
-                        group_type = group.locator('span').inner_text().strip()
-                        print(f"처리 중인 그룹 타입: {group_type}")
-                        
-                        links = group.locator('div > a').all()
-                        content_list = [link.inner_text().strip() for link in links if link.inner_text().strip()]
-                        
-                        if '관련 주제어' in group_type:
-                            print(f"관련 주제어 목록: {content_list}")
-                            metadata["related_keywords"] = content_list
-                        elif '관련 법령' in group_type:
-                            print(f"관련 법령 목록: {content_list}")
-                            metadata["related_laws"] = content_list
-                            
-                    except Exception as e:
-                        print(f"대체 그룹 처리 중 오류 발생: {str(e)}")
-                        continue
-                        
-            except Exception as e:
-                print(f"대체 경로 처리 중 오류 발생: {str(e)}")
-                
-    except Exception as e:
-        print(f"관련 주제어/법령 수집 중 오류: {str(e)}")
-    
-    ###############################################################
-
-    # 유사문서 수집
-    try:
-        similar_docs = []
-        ul_element = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[3]/div[1]/div/ul')
-        li_elements = ul_element.locator('li').all()
-        
-        for li in li_elements:
-            try:
-                similar_docs.append({
-                    "title": li.locator('xpath=.//a/div[1]/p[1]').inner_text(),
-                    "doc_num": split_text(li.locator('xpath=.//a/div[1]/p[2]').inner_text())[0],
-                    "date": split_text(li.locator('xpath=.//a/div[1]/p[2]').inner_text())[1]
-                })
-            except Exception as e:
-                print(f"유사문서 추출 중 오류: {str(e)}")
-        
-        metadata["similar_docs"] = similar_docs
-        
-    except Exception as e:
-        print(f"유사문서 수집 중 오류: {str(e)}")
-    
-    ###############################################################
-
-
-    # summary수집 추가
-    summary_content_paths = [
-        '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[3]/div/div[2]/div[1]/p',
-        '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[3]/div/div[2]/div[1]/p',
-        '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[2]/div/div[2]/div[1]/p'
-    ]
-    
-
-    # 여러 경로 시도하여 데이터 수집
-    def try_multiple_paths(paths):
-        for path in paths:
-            try:
-                element = new_page.locator(path)
-                if element.is_visible():
-                    return element.inner_text()
-            except Exception as e:
-                continue
-        return ""
-
-    # summary와 result_content 데이터 수집
-    metadata["summary"]["content"] = try_multiple_paths(summary_content_paths)
-    
-    # 태그 클라우드 수집 추가
-    try:
-        # 태그 클라우드 가능한 경로들
-        tag_cloud_paths = [
-            '//*[@id="dcmDetailBox"]/div/div/div[2]/div[2]/div[2]/span',
-            '//*[@id="dcmDetailBox"]/div/div/div[3]/div[2]/div[2]/span',
-            
-        ]
-        
-        
-        tag_cloud_elements = []
-        for path in tag_cloud_paths:
-            try:
-                elements = new_page.locator(path).all()
-                if elements:
-                    tag_cloud_elements = elements
-                    print(f"태그 클라우드 발견된 경로: {path}")
-                    break
-            except Exception as e:
-                print(f"태그 클라우드 찾기 실패경로: {path}")
-                print(f"오류 메시지: {str(e)}")
-                continue
-        
-        if tag_cloud_elements:
-            metadata["tag_cloud"] = [tag.inner_text().replace('#', '').strip() 
-                                   for tag in tag_cloud_elements 
-                                   if tag.inner_text().strip()]
-            print(f"수집된 태그 클라우드: {metadata['tag_cloud']}")
-        else:
-            print("태그 클라우드를 찾을 수 없습니다.")
-            metadata["tag_cloud"] = []
-            
-    except Exception as e:
-        print(f"태그 클라우드 수집 중 오류: {str(e)}")
-        metadata["tag_cloud"] = []
+    # 문서번호가 없으면 파일명/저장소 키를 만들 수 없으므로 파싱 실패로 올려 재시도하게 한다
+    if not metadata["doc_num"]:
+        raise Exception(f"문서번호 수집 실패: {new_page.url}")
 
     return metadata
 
-def save_html_content(element, doc_number, download_dir):
-    """HTML 내용 저장"""
-    try:
-        html_content = element.evaluate('el => el.outerHTML')
-        html_path = os.path.join(download_dir, f"{doc_number}.html")
-        
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write("""<!DOCTYPE html>
+def wrap_html_document(html_content, doc_number):
+    """본문 HTML을 저장용 HTML 문서로 감싸기"""
+    return """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -317,28 +159,39 @@ def save_html_content(element, doc_number, download_dir):
 <body>
 {}
 </body>
-</html>""".format(doc_number, html_content))
+</html>""".format(doc_number, html_content)
+
+def write_html_document(html_content, doc_number, download_dir, writer=None):
+    """본문 HTML 문자열을 문서 파일로 저장 (writer가 있으면 백그라운드에서 일괄 저장)"""
+    try:
+        html_path = os.path.join(download_dir, f"{doc_number}.html")
+        document = wrap_html_document(html_content, doc_number)
+
+        with telemetry.span("persist"):
+            if writer:
+                writer.submit(html_path, document)
+            else:
+                with open(html_path, 'w', encoding='utf-8') as f:
+                    f.write(document)
         
         return html_path
         
     except Exception as e:
-        print(f"HTML 저장 중 오류 발생: {str(e)}")
+        logger.error("HTML 저장 중 오류 발생 (%s): %s", doc_number, str(e))
         return None
 
-def collect_precedent_content(new_page, download_dir):
+def collect_precedent_content(new_page, download_dir, doc_number=None, writer=None):
     """판례 본문 내용 수집"""
-    # HTML 내용 저장
-    content_element = new_page.locator('//*[@id="cntnWrap_html"]')
-    doc_number = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[1]/strong').inner_text()
-    html_path = save_html_content(content_element, doc_number, download_dir)
-
-    # HTML을 마크다운으로 변환
-    if html_path:
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+    with telemetry.span("content"):
+        content_element = new_page.locator('//*[@id="cntnWrap_html"]')
+        html_content = content_element.evaluate('el => el.outerHTML')
+        if not doc_number:
+            doc_number = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[1]/strong').inner_text()
+
+    # HTML 저장은 writer에 맡기고 메모리의 HTML로 바로 마크다운 변환
+    html_path = write_html_document(html_content, doc_number, download_dir, writer)
+    with telemetry.span("markdown"):
         content_markdown = html_to_markdown(html_content, doc_type='판례')
-    else:
-        content_markdown = ""
 
     return {
         "details": {
@@ -367,154 +220,38 @@ def collect_interpretation_metadata(new_page):
             "tag_cloud": []
         }
         
-        print("\n=== 메타데이터 수집 시작 ===")
+        # 모든 항목(대체 경로 포함)을 한 번의 evaluate로 수집
+        with telemetry.span("metadata"):
+            metadata.update(extract_page_metadata(new_page, INTERPRETATION_METADATA_SPEC))
 
-        # 여러 경로 시도하여 데이터 수집
-        def try_multiple_paths(paths, get_attribute=None):
-            for path in paths:
-                try:
-                    element = new_page.locator(path)
-                    if element.is_visible():
-                        if get_attribute:
-                            return element.get_attribute(get_attribute)
-                        return element.inner_text()
-                except Exception as e:
-                    print(f"경로 시도 실패: {path}")
-                    print(f"오류 메시지: {str(e)}")
-                    continue
-            return ""
+        missing = [field for field in ("doc_num", "doc_title", "doc_type") if not metadata[field]]
+        if missing:
+            logger.warning("해석례 메타데이터 누락 항목 (%s): %s", new_page.url, ', '.join(missing))
+        if not metadata["doc_num"]:
+            raise Exception(f"문서번호 수집 실패: {new_page.url}")
 
-        # 관련 주제어와 법령 수집을 위한 함수
-        def collect_related_items(base_paths):
-            for base_path in base_paths:
-                try:
-                    rel_groups = new_page.locator(f'{base_path}/div[contains(@class, "rel_group")]').all()
-                    print(f"발견된 rel_group 개수 ({base_path}): {len(rel_groups)}")
-                    
-                    if len(rel_groups) > 0:
-                        for group in rel_groups:
-                            try:
-                                group_type = group.locator('span').inner_text().strip()
-                                print(f"처리 중인 그룹 타입: {group_type}")
-                                
-                                links = group.locator('div > a').all()
-                                content_list = [link.inner_text().strip() for link in links if link.inner_text().strip()]
-                                
-                                if '관련 주제어' in group_type:
-                                    print(f"관련 주제어 목록: {content_list}")
-                                    metadata["related_keywords"] = content_list
-                                    return True
-                                elif '관련 법령' in group_type:
-                                    print(f"관련 법령 목록: {content_list}")
-                                    metadata["related_laws"] = content_list
-                                    return True
-                            except Exception as e:
-                                print(f"그룹 처리 중 오류 발생: {str(e)}")
-                                continue
-                except Exception as e:
-                    print(f"base_path 처리 중 오류: {str(e)}")
-                    continue
-            return False
-
-        # 각 필드별 xpath 목록 정의
-        paths = {
-            "doc_num": [
-                '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/ul/li[1]/strong',
-                '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[1]/strong'
-            ],
-            "produce_date": [
-                '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/ul/li[3]/span',
-                '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[3]/span'
-            ],
-            "related_date": [
-                '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/ul/li[2]/span',
-                '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/ul/li[2]/span'
-            ],
-            "tax_type": [
-                '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/div/ul/li',
-                '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/div/ul/li'
-            ],
-            "doc_title": [
-                '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/div/strong',
-                '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/div/strong'
-            ],
-            "doc_result": [
-                '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/div/em',
-                '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[1]/div/em'
-            ]
-        }
-
-        # 기본 메타데이터 수집
-        for field, field_paths in paths.items():
-            try:
-                if field == "tax_type":
-                    value = try_multiple_paths(field_paths, get_attribute='title')
-                else:
-                    value = try_multiple_paths(field_paths)
-                
-                if value:
-                    metadata[field] = value
-                    print(f"{field} 수집 성공: {value}")
-                else:
-                    print(f"{field} 수집 실패")
-            except Exception as e:
-                print(f"{field} 수집 중 오류: {str(e)}")
-
-        # 문서 유형은 단일 경로
-        try:
-            metadata["doc_type"] = new_page.locator('//*[@id="scrnNm"]').inner_text()
-            print("문서유형 수집 성공")
-        except Exception as e:
-            print(f"문서유형 수집 실패: {str(e)}")
-
-        # 관련 주제어와 법령 수집 (여러 base_path 시도)
-        related_base_paths = [
-            '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[2]',
-            '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[2]'
-        ]
-        collect_related_items(related_base_paths)
-
-        # 요지(summary) 수집
-        summary_paths = [
-            '//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[3]/div/div[2]/div[1]/p',
-            '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[3]/div/div[2]/div[1]/p',
-            '//*[@id="dcmDetailBox"]/div/div/div[2]/div/div/div[2]/div/div[2]/div[1]/p'
-        ]
-        metadata["summary"]["content"] = try_multiple_paths(summary_paths)
-
-        print("=== 메타데이터 수집 완료 ===\n")
         return metadata
         
     except Exception as e:
-        print("\n=== 메타데이터 수집 상세 오류 ===")
-        print(f"오류 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
-        print(f"오류 발생 라인: {e.__traceback__.tb_lineno}")
-        print(f"오류 메시지: {str(e)}")
+        logger.debug("해석례 메타데이터 수집 상세 오류: %s", str(e), exc_info=True)
         raise e
 
-def collect_interpretation_content(new_page, download_dir):
+def collect_interpretation_content(new_page, download_dir, doc_number=None, writer=None):
     """해석례 본문 내용 수집"""
     try:
-        print("\n=== 컨텐츠 수집 시작 ===")
-        
-        # HTML 내용 저장
-        print("HTML 내용 저장 시작...")
-        content_element = new_page.locator('//*[@id="cntnWrap_html"]')
-        doc_number = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/ul/li[1]/strong').inner_text()
-        html_path = save_html_content(content_element, doc_number, download_dir)
-        print("HTML 내용 저장 완료")
-        
-        # HTML을 마크다운으로 변환
-        if html_path:
-            print("마크다운 변환 시작...")
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            content_markdown = html_to_markdown(html_content, doc_type='해석례')
-            print("마크다운 변환 완료")
-        else:
+        with telemetry.span("content"):
+            content_element = new_page.locator('//*[@id="cntnWrap_html"]')
+            html_content = content_element.evaluate('el => el.outerHTML')
+            if not doc_number:
+                doc_number = new_page.locator('//*[@id="dcmDetailBox"]/div/div/div[1]/div/div/div[1]/ul/li[1]/strong').inner_text()
+        
+        # HTML 저장은 writer에 맡기고 메모리의 HTML로 바로 마크다운 변환
+        html_path = write_html_document(html_content, doc_number, download_dir, writer)
+        if not html_path:
             raise Exception("HTML 저장 실패")
-            
-        print("=== 컨텐츠 수집 완료 ===\n")
+
+        with telemetry.span("markdown"):
+            content_markdown = html_to_markdown(html_content, doc_type='해석례')
         
         return {
             "details": {
@@ -525,10 +262,7 @@ def collect_interpretation_content(new_page, download_dir):
         }
         
     except Exception as e:
-        print("\n=== 컨텐츠 수집 상세 오류 ===")
-        print(f"오류 발생 위치: {e.__traceback__.tb_frame.f_code.co_name}")
-        print(f"오류 발생 라인: {e.__traceback__.tb_lineno}")
-        print(f"오류 메시지: {str(e)}")
+        logger.debug("해석례 컨텐츠 수집 상세 오류: %s", str(e), exc_info=True)
         raise e
 
 def generate_markdown(metadata, content, doc_type):
@@ -613,9 +347,12 @@ def generate_interpretation_markdown(metadata, content):
 """
     return md
 
-def save_markdown(content, filename, directory):
-    """마크다운 파일 저장"""
+def save_markdown(content, filename, directory, writer=None):
+    """마크다운 파일 저장 (writer가 있으면 백그라운드에서 일괄 저장)"""
     filepath = os.path.join(directory, f"{filename}.md")
+    if writer:
+        writer.submit(filepath, content)
+        return filepath
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     return filepath
@@ -642,13 +379,13 @@ def get_doc_numbers(li_elements):
             
             if doc_number_element:
                 doc_number = doc_number_element.inner_text().strip()
-                print(f"추출된 문서 번호: {doc_number}")
+                logger.debug("추출된 문서 번호: %s", doc_number)
                 doc_numbers.append(doc_number)
             else:
-                print("문서 번호 요소를 찾을 수 없습니다.")
-                print(f"현재 li의 HTML 구조: {li.inner_html()}")
+                logger.warning("문서 번호 요소를 찾을 수 없습니다.")
+                logger.debug("현재 li의 HTML 구조: %s", li.inner_html())
         except Exception as e:
-            print(f"문서 번호 추출 중 오류: {str(e)}")
+            logger.warning("문서 번호 추출 중 오류: %s", str(e))
     return doc_numbers
 
 def search_keyword(page, keyword):
@@ -664,34 +401,264 @@ def search_keyword(page, keyword):
         # 검색 버튼 클릭 (Enter 키 입력으로 대체 가능)
         search_input.press('Enter')
         
-        # 검색 결과 로딩 대기
-        page.wait_for_load_state('networkidle')
-        
-        time.sleep(2)  # 추가 대기 시간
+        # 검색 결과 탭이 나타날 때까지 대기
+        interpretation_button = page.locator('//*[@id="pointerDiv"]/a[3]')
+        interpretation_button.wait_for(state="visible")
         
         # 해석례/판례 버튼 클릭
-        interpretation_button = page.locator('//*[@id="pointerDiv"]/a[3]')
         interpretation_button.click()
         
+        # 결과 목록 항목이 렌더링될 때까지 대기
+        page.wait_for_selector('//*[@id="collectionDiv"]/div[4]/ul/li', state="visible")
         
-        # 결과 로딩 대기
-        page.wait_for_selector('//*[@id="collectionDiv"]/div[4]/ul', state="visible")
-        time.sleep(2)  # 추가 대기 시간
-        
-        print(f"'{keyword}' 검색 완료")
+        logger.info("'%s' 검색 완료", keyword)
         return True
         
     except Exception as e:
-        print(f"검색 중 오류 발생: {str(e)}")
+        logger.error("'%s' 검색 중 오류 발생: %s", keyword, str(e))
         return False
 
+def wait_for_list_growth(page, list_xpath, previous_count, timeout=15000):
+    """목록 항목 수가 previous_count보다 늘어날 때까지 대기 후 현재 항목 수 반환"""
+    try:
+        page.wait_for_function(
+            """([xpath, count]) => document.evaluate(
+                `count(${xpath})`, document, null, XPathResult.NUMBER_TYPE, null
+            ).numberValue > count""",
+            arg=[list_xpath, previous_count],
+            timeout=timeout
+        )
+    except PlaywrightTimeoutError:
+        return previous_count
+    return page.locator(list_xpath).count()
+
 def save_failed_docs_to_excel(failed_docs, filename="failed_documents.xlsx"):
     """수집 실패한 문서 정보를 엑셀 파일로 저장"""
     df = pd.DataFrame(failed_docs, columns=['doc_number', 'error_message', 'timestamp'])
     df.to_excel(filename, index=False)
-    print(f"수집 실패 문서 목록이 {filename}에 저장되었습니다.")
+    logger.info("수집 실패 문서 목록이 %s에 저장되었습니다.", filename)
+
+def resolve_doc_url(page, context, row):
+    """검색 결과 목록 행의 문서 상세 페이지 URL 추출
+
+    주소는 보통 extract_listing_rows가 링크의 href/onclick에서 이미 읽어 두었고,
+    그러지 못한 행만 링크를 눌러 열린 창에서 주소를 확인한다.
+    """
+    if row.get('url'):
+        return row['url']
+
+    title_xpath = f'//*[@id="collectionDiv"]/div[4]/ul/li[{row["index"]}]/div[1]/div[1]/a'
+    title_link = page.locator(title_xpath)
+
+    href = title_link.get_attribute('href')
+    if href and not href.startswith(('#', 'javascript')):
+        return urljoin(page.url, href)
+
+    # 스크립트로 새 창을 여는 링크는 주소만 확인하고 바로 닫는다
+    logger.debug("목록 %d번째 행의 상세 주소를 링크에서 읽지 못해 새 창으로 확인합니다.", row['index'])
+    with context.expect_page() as new_page_info:
+        title_link.click()
+    new_page = new_page_info.value
+    new_page.wait_for_url(re.compile(r'^https?://'), wait_until='commit')
+    doc_url = new_page.url
+    new_page.close()
+    return doc_url
+
+def open_search_results(page, query):
+    """메인 페이지에서 쿼리의 컬렉션 메뉴로 이동한 뒤 검색어 검색"""
+    collection = COLLECTIONS[query.collection]
+
+    # 초기 페이지 접속 및 메뉴 선택
+    page.goto("https://taxlaw.nts.go.kr/index.do")
+    
+    # 지정된 메뉴 클릭
+    page.click("//*[@id='header']/nav/div/ul/li[4]/div")
+    page.wait_for_selector("//*[@id='siteMap1']", state="visible")
+    
+    # 서브메뉴 클릭
+    page.click("//*[@id='siteMap1']")
+
+    # 해석례/판례 선택
+    page.wait_for_selector(collection["menu_xpath"], state="visible")
+    page.click(collection["menu_xpath"])
+    logger.info("선택된 문서 유형: %s", collection['name'])
+
+    # 키워드 검색 수행
+    return search_keyword(page, query.keyword)
+
+def crawl_listing(page, context, query, scheduler, doc_store, track_checkpoint=True,
+                  incremental=False, known_run_limit=KNOWN_RUN_LIMIT):
+    """검색 결과 목록을 더보기로 넘기며 새 문서를 스케줄러를 통해 워커 풀에 넘김
+
+    track_checkpoint면 이전 실행에서 처리한 목록 위치까지는 행을 읽지 않고
+    더보기만 누르고, 페이지마다 위치를 기록한다. incremental이면 이미 아는
+    문서가 known_run_limit개 연속으로 나올 때 목록 탐색을 멈춘다.
+    """
+    checkpoint_offset, listing_completed = doc_store.get_checkpoint(query.key) if track_checkpoint else (0, False)
+    if listing_completed:
+        logger.info("%s 목록은 이미 끝까지 수집했습니다. 새 문서는 증분 수집(incremental=True)으로 확인하세요.", query.label)
+        return
+    if checkpoint_offset:
+        logger.info("%s 목록 %d번째 문서까지 처리한 체크포인트에서 이어서 수집합니다.", query.label, checkpoint_offset)
+
+    processed = 0   # 현재 목록에서 처리한 행 수
+    known_run = 0   # 증분 수집: 연속으로 만난 이미 수집한 문서 수
+    # 오류로 넘기지 못한 첫 행 앞까지만 체크포인트를 올려 다음 실행에서 다시 확인한다
+    checkpoint_limit = None
+    
+    # 문서 목록 처리: 상세 문서는 워커 큐로 넘긴다
+    while True:
+        try:
+            # 문서 목록이 로드될 때까지 대기
+            page.wait_for_selector(LIST_XPATH, state='visible', timeout=5000)
+            list_count = page.locator(LIST_XPATH).count()
+            logger.debug("현재 페이지의 문서 개수: %d", list_count)
+
+            # 새로 나타난 행만 evaluate 한 번으로 읽는다
+            start = max(processed, checkpoint_offset)
+            rows = extract_listing_rows(page, LIST_XPATH, start) if list_count > start else []
+            processed = max(processed, start + len(rows))
+            discovered = []
+            reached_known_run = False
+            
+            for row in rows:
+                try:
+                    doc_number = row['doc_number']
+                    if not doc_number:
+                        logger.warning("목록 %d번째 행에서 문서 번호를 찾을 수 없습니다.", row['index'])
+                        continue
+
+                    # 증분 수집: 이미 아는 문서가 연속으로 나오면 이후 목록은 수집된 것으로 본다
+                    if incremental:
+                        known_run = known_run + 1 if scheduler.is_known(doc_number) else 0
+                        if known_run >= known_run_limit:
+                            reached_known_run = True
+                            break
+                    
+                    # 이미 수집했거나 다른 쿼리에서 워커에 넘긴 문서는 건너뛰기
+                    if not scheduler.claim(query, doc_number):
+                        continue
+                        
+                    # 문서 유형 확인
+                    current_doc_type = row['doc_type']
+                    if current_doc_type is not None:
+                        logger.debug("문서 유형 (%s): %s", doc_number, current_doc_type)
+                        
+                        # 판례나 심판인 경우에만 판례 크롤링 사용
+                        use_precedent = any(type_str in current_doc_type for type_str in ['판례', '심판'])
+                    else:
+                        use_precedent = False
+                        logger.debug("문서 유형을 찾을 수 없습니다: %s", doc_number)
+                    
+                    try:
+                        doc_url = resolve_doc_url(page, context, row)
+                    except Exception:
+                        scheduler.release(doc_number)
+                        raise
+                    discovered.append(CrawlItem(
+                        doc_number=doc_number,
+                        url=doc_url,
+                        use_precedent=use_precedent
+                    ))
+                    
+                except Exception as e:
+                    logger.warning("목록 행 처리 중 오류 발생: %s", str(e))
+                    if checkpoint_limit is None:
+                        checkpoint_limit = row['index'] - 1
+                    continue
+
+            # 발견한 문서와 목록 위치를 기록한 뒤 워커에 넘긴다
+            listing_offset = processed if checkpoint_limit is None else min(processed, checkpoint_limit)
+            scheduler.dispatch(query, discovered, listing_offset if track_checkpoint else None)
+
+            if reached_known_run:
+                logger.info("이미 수집한 문서가 %d개 연속으로 나와 목록 탐색을 멈춥니다.", known_run_limit)
+                break
+            
+            # 더보기 버튼 처리
+            try:
+                # 더보기 버튼의 xpath 수정
+                more_button = page.locator('//*[@id="moreSrchBtn"]/button')
+                if not more_button.is_visible():
+                    logger.info("%s 목록 끝: 더 이상 더보기 버튼이 없습니다.", query.label)
+                    if track_checkpoint and checkpoint_limit is None:
+                        doc_store.complete_listing(query.key)
+                    break
+
+                if list_count < checkpoint_offset:
+                    logger.debug("체크포인트까지 목록 이동 중... (%d/%d)", list_count, checkpoint_offset)
+                else:
+                    logger.debug("더보기 버튼 클릭...")
+                more_button.click()
+                
+                # 목록 항목 수가 늘어날 때까지 대기
+                new_count = wait_for_list_growth(page, LIST_XPATH, list_count)
+                if new_count <= list_count:
+                    logger.warning("새로운 문서가 로드되지 않았습니다.")
+                    break
+                
+                logger.debug("새로운 문서 %d개 로드됨", new_count - list_count)
+                    
+            except Exception as e:
+                logger.error("더보기 버튼 처리 중 오류 발생: %s", str(e))
+                break
+                
+        except Exception as e:
+            logger.error("목록 처리 중 오류 발생: %s", str(e))
+            break
+
+def scrape_document(new_page, item, download_dir, writer=None):
+    """문서 유형에 따라 판례/해석례 크롤링 함수 선택"""
+    if item.use_precedent:
+        logger.debug("판례/심판 문서 크롤링 시작: %s", item.doc_number)
+        return scrape_precedent_doc(new_page, download_dir, writer)
+
+    logger.debug("해석례 문서 크롤링 시작: %s", item.doc_number)
+    return scrape_interpretation_doc(new_page, download_dir, writer)
+
+def harvest_action_doc(new_page, item, download_dir, writer=None):
+    """action.do JSON 응답으로 문서 수집 (XPath 단위 DOM 조회 없이 응답 1건으로 처리)"""
+    try:
+        with telemetry.span("metadata"):
+            payload = extract_action_payload(new_page)
+    finally:
+        clear_action_capture(new_page)
+
+    with telemetry.span("content"):
+        metadata, body_html = map_action_payload(payload, new_page.url, item.use_precedent) if payload else ({}, "")
+    if metadata is None or not body_html:
+        logger.info("action.do 응답에서 문서번호/제목/본문을 찾지 못해 DOM 수집으로 전환: %s", item.doc_number)
+        return scrape_document(new_page, item, download_dir, writer)
+
+    doc_type = "판례" if item.use_precedent else "해석례"
+
+    html_path = write_html_document(body_html, metadata["doc_num"], download_dir, writer)
+    with telemetry.span("markdown"):
+        content = {
+            "details": {
+                "title": "상세내용",
+                "content": html_to_markdown(body_html, doc_type=doc_type)
+            },
+            "html_path": html_path
+        }
+        markdown_content = generate_markdown(metadata, content, doc_type)
+
+    with telemetry.span("persist"):
+        save_markdown(markdown_content, metadata["doc_num"], download_dir, writer)
 
-def crawl_with_playwright():
+    return {
+        **metadata,
+        **content,
+        "markdown_path": f"{download_dir}/{metadata['doc_num']}.md",
+    }
+
+def crawl_with_playwright(num_workers=CRAWL_WORKERS, per_host_limit=PER_HOST_LIMIT,
+                          use_action_api=USE_ACTION_API, light_profile=LIGHT_PROFILE,
+                          async_writes=ASYNC_WRITES, precompute_summaries=PRECOMPUTE_SUMMARIES,
+                          keywords=SEARCH_KEYWORDS, collections=CRAWL_COLLECTIONS, incremental=INCREMENTAL_CRAWL,
+                          known_run_limit=KNOWN_RUN_LIMIT, retry_only_failed=RETRY_ONLY_FAILED,
+                          max_failed_attempts=MAX_FAILED_ATTEMPTS, telemetry_report=TELEMETRY_REPORT,
+                          prometheus_file=PROMETHEUS_FILE):
     json_filename = "scraped_documents.json"
     failed_docs_filename = "failed_documents.json"
     
@@ -699,221 +666,198 @@ def crawl_with_playwright():
     scraped_docs = load_from_json(json_filename)
     
     # 실패한 문서 목록 로드
-    failed_docs = {}
-    if os.path.exists(failed_docs_filename):
-        print(f"실패 문서 목록 파일 발견: {failed_docs_filename}")
-        failed_docs = load_from_json(failed_docs_filename)
-        print(f"재시도할 실패 문서 수: {len(failed_docs)}")
-        
-        # 실패 문서만 재시도할지 확인
-        retry_only_failed = input("실패한 문서만 재시도하시겠습니까? (y/n): ").lower() == 'y'
+    failed_docs = load_from_json(failed_docs_filename, key_field='doc_number')
+    if len(failed_docs) > 0:
+        logger.info("실패 문서 목록 발견: %s", failed_docs.path)
+        logger.info("이전에 실패한 문서 수: %d (재시도 정책에 따라 자동으로 다시 시도)", len(failed_docs))
         if retry_only_failed:
-            print("실패한 문서만 재시도합니다.")
+            logger.info("실패한 문서만 재시도합니다.")
     else:
-        print("실패 문서 목록 파일이 없습니다. 전체 문서를 크롤링합니다.")
+        logger.info("실패 문서 목록 파일이 없습니다. 전체 문서를 크롤링합니다.")
         retry_only_failed = False
 
-    processed_doc_numbers = set()
+    # 수집한 문서와 수집 상태는 문서 저장소에 일괄 트랜잭션으로 기록
+    doc_store = DocStore(DOC_STORE_PATH)
+
+    # 수집한 문서는 바로 로컬 검색 인덱스에 추가
+    search_index = SearchIndex(SEARCH_INDEX_PATH)
+
+    # 문서 파일 저장은 크롤링 경로 밖에서 일괄 처리
+    file_writer = BatchFileWriter() if async_writes else None
+
+    # 요약 사전 생성 단계 (openai 패키지가 필요하므로 사용할 때만 import)
+    # 다시 수집한 문서는 writer가 새 HTML로 교체한 뒤에 요약한다
+    summary_stage = None
+    if precompute_summaries:
+        from summary_stage import SummaryStage
+        summary_stage = SummaryStage(writer=file_writer)
+
+    queries = build_queries(keywords, collections)
+    logger.info("수집할 쿼리 %d개: 검색어 %d개 × 컬렉션 %s", len(queries), len(keywords), ', '.join(collections))
+
+    results_lock = threading.Lock()
+
+    def on_success(item, doc_info):
+        with telemetry.span("persist"), results_lock:
+            scraped_docs[item.doc_number] = doc_info
+            doc_store.put_document(doc_info)
+            doc_store.set_crawl_status(item.doc_number, 'done', item.url)
+            try:
+                search_index.add_document(
+                    doc_info.get('doc_num') or item.doc_number,
+                    doc_info,
+                    doc_info.get('details', {}).get('content', '')
+                )
+            except Exception as e:
+                logger.warning("검색 인덱스 추가 실패 (%s): %s", item.doc_number, str(e))
+            
+            # 성공한 경우 실패 목록에서 제거
+            if item.doc_number in failed_docs:
+                del failed_docs[item.doc_number]
+
+        if summary_stage:
+            summary_stage.submit(
+                doc_info.get('doc_num') or item.doc_number,
+                doc_info.get('html_path'),
+                "판례" if item.use_precedent else "해석례"
+            )
+
+    def on_failure(item, error, error_class):
+        with results_lock:
+            previous = failed_docs[item.doc_number] if item.doc_number in failed_docs else {}
+            failed_docs[item.doc_number] = {
+                'doc_number': item.doc_number,
+                'url': item.url,
+                'use_precedent': item.use_precedent,
+                'error_message': str(error),
+                'error_class': error_class,
+                # 여러 실행에 걸친 누적 시도 횟수
+                'attempts': previous.get('attempts', 0) + item.attempts + 1,
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            doc_store.set_crawl_status(item.doc_number, 'failed', item.url, str(error))
+            logger.debug("문서 처리 실패 정보 저장: %s", item.doc_number)
+
+    browser_launch_options = {
+        'headless': False,
+        'channel': 'chrome'
+    }
+    browser_context_options = {
+        'accept_downloads': True,
+        'viewport': {'width': 1920, 'height': 1080},
+        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+    }
+
+    # 상세 페이지 워커용 경량 프로필
+    worker_launch_options = browser_launch_options
+    worker_context_options = browser_context_options
+    if light_profile:
+        worker_launch_options = {**LIGHT_LAUNCH_OPTIONS, 'channel': 'chrome'}
+        worker_context_options = {**browser_context_options, 'accept_downloads': False}
 
     with sync_playwright() as p:
         download_dir = os.path.join(os.getcwd(), "D:\\PythonProject\\llm\\crawling\\data")
         os.makedirs(download_dir, exist_ok=True)
 
-        # Chrome(Chromium) 브라우저 실행 설정
-        browser = p.chromium.launch(
-            headless=False,
-            channel='chrome'
-        )
-        context = browser.new_context(
-            accept_downloads=True,
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-        )
+        # 목록 페이지용 Chrome(Chromium) 브라우저 실행
+        browser = p.chromium.launch(**browser_launch_options)
+        context = browser.new_context(**browser_context_options)
         page = context.new_page()
-        
-        # 초기 페이지 접속 및 메뉴 선택
-        page.goto("https://taxlaw.nts.go.kr/index.do")
-        
-        # 지정된 메뉴 클릭
-        page.click("//*[@id='header']/nav/div/ul/li[4]/div")
-        page.wait_for_selector("//*[@id='siteMap1']", state="visible")
-        
-        # 서브메뉴 클릭
-        page.click("//*[@id='siteMap1']")
+
+        # 실패한 문서는 오류 종류별 백오프로 재시도하고, 사이트 오류가 몰리면 전체 수집을 늦춘다
+        retry_policy = RetryPolicy()
+
+        # 상세 페이지는 워커 풀에서 병렬로 처리
+        scrape_fn = harvest_action_doc if use_action_api else scrape_document
+        pool = CrawlWorkerPool(
+            scrape_fn=lambda new_page, item: scrape_fn(new_page, item, download_dir, file_writer),
+            on_success=on_success,
+            on_failure=on_failure,
+            num_workers=num_workers,
+            per_host_limit=per_host_limit,
+            launch_options=worker_launch_options,
+            context_options=worker_context_options,
+            context_setup=apply_light_profile if light_profile else None,
+            page_setup=attach_action_capture if use_action_api else None,
+            retry_policy=retry_policy
+        )
+        pool.start()
+
+        # 모든 쿼리가 워커 풀 하나와 문서번호 중복 제거 집합을 공유한다
+        scheduler = CrawlScheduler(pool, doc_store, scraped_docs, failed_docs, retry_only_failed,
+                                   max_failed_attempts)
+
+        # 이전 실행에서 실패한 문서는 저장된 URL로 바로 다시 시도한다 (새 문서보다 낮은 우선순위)
+        retried = scheduler.resume_failed()
+        if retried:
+            logger.info("이전 실행에서 실패한 문서 %d개를 다시 시도합니다.", retried)
+
+        # 이전 실행에서 목록에서 발견만 하고 수집하지 못한 문서부터 워커에 넘긴다
+        resumed = scheduler.resume_pending()
+        if resumed:
+            logger.info("이전 실행에서 남은 대기 문서 %d개를 이어서 수집합니다.", resumed)
+
+        # 증분 수집과 실패 문서 재시도는 목록을 처음부터 확인하고 체크포인트를 갱신하지 않는다
+        track_checkpoint = not incremental and not retry_only_failed
         
         try:
-            # 해석례/판례 선택
-            interpretation_xpath = '//*[@id="siteMapArea"]/li[2]/ul/li[1]/ul/li[1]'
-            # 판례 메뉴의 XPath
-            precedent_xpath = '//*[@id="siteMapArea"]/li[3]/ul/li[1]/ul/li[1]'
-            
-            selected_xpath = interpretation_xpath
-            doc_type = "판례"
-            
-            page.wait_for_selector(selected_xpath, state="visible")
-            menu_text = page.locator(selected_xpath).inner_text()
-            
-            if "판례" in menu_text:
-                doc_type = "판례"
-            
-            page.click(selected_xpath)
-            print(f"선택된 문서 유형: {doc_type}")
-            
-            # 키워드 검색 수행
-            use_search = True  # 검색 사용 여부
-            if use_search:
-                search_keyword(page, "부당행위계산부인 인건비")
-                # 검색 결과 목록 선택자
-                list_selector = '//*[@id="collectionDiv"]/div[4]/ul/li'
-                more_button_selector = '//*[@id="collectionDiv"]/div[4]/div/button'
-            else:
-                # 일반 목록 선택자
-                list_selector = '#bdltCtl > li'
-                more_button_selector = '#boardMain > div'
-            
-            # 문서 목록 처리
-            while True:
+            for query in queries:
                 try:
-                    # 문서 목록이 로드될 때까지 대기
-                    page.wait_for_selector('//*[@id="collectionDiv"]/div[4]/ul/li', state='visible', timeout=5000)
-                    list_elements = page.query_selector_all('//*[@id="collectionDiv"]/div[4]/ul/li')
-                    print(f"현재 페이지의 문서 개수: {len(list_elements)}")
-                    
-                    for idx, element in enumerate(list_elements, 1):
-                        try:
-                            # 문서 번호와 URL 추출
-                            doc_number_xpath = f'//*[@id="collectionDiv"]/div[4]/ul/li[{idx}]/div[1]/div[1]/ul/li[1]/strong'
-                            doc_number = page.locator(doc_number_xpath).inner_text()
-                            
-                            # 실패 문서만 재시도하는 경우, 실패 목록에 없는 문서는 건너뛰기
-                            if retry_only_failed and doc_number not in failed_docs:
-                                continue
-                                
-                            # 이미 성공한 문서는 건너뛰기
-                            if doc_number in scraped_docs:
-                                continue
-                                
-                            try:
-                                # 문서 유형 확인 (xpath 사용)
-                                doc_type_xpath = f'//*[@id="collectionDiv"]/div[4]/ul/li[{idx}]/div[1]/div[1]/a/ul/li[1]'
-                                doc_type_element = page.locator(doc_type_xpath)
-                                
-                                if doc_type_element.is_visible():
-                                    current_doc_type = doc_type_element.inner_text()
-                                    print(f"문서 유형: {current_doc_type}")
-                                    
-                                    # 판례나 심판인 경우에만 판례 크롤링 사용
-                                    use_precedent = any(type_str in current_doc_type for type_str in ['판례', '심판'])
-                                else:
-                                    use_precedent = False
-                                    print("문서 유형을 찾을 수 없습니다.")
-                                
-                                # 문서 새 페이지 열기
-                                with context.expect_page() as new_page_info:
-                                    # 제목 클릭을 위한 xpath
-                                    title_xpath = f'//*[@id="collectionDiv"]/div[4]/ul/li[{idx}]/div[1]/div[1]/a'
-                                    page.locator(title_xpath).click()
-                                
-                                new_page = new_page_info.value
-                                new_page.wait_for_load_state('networkidle')
-                                
-                                # 문서 크롤링 시도
-                                try:
-                                    if use_precedent:
-                                        print(f"판례/심판 문서 크롤링 시작: {doc_number}")
-                                        doc_info = scrape_precedent_doc(new_page, download_dir)
-                                    else:
-                                        print(f"해석례 문서 크롤링 시작: {doc_number}")
-                                        try:
-                                            doc_info = scrape_interpretation_doc(new_page, download_dir)
-                                        except Exception as e:
-                                            print(f"해석례 크롤링 중 오류 발생:")
-                                            print(f"- 문서번호: {doc_number}")
-                                            print(f"- 오류 위치: {e.__traceback__.tb_frame.f_code.co_name}")
-                                            print(f"- 오류 라인: {e.__traceback__.tb_lineno}")
-                                            print(f"- 오류 메시지: {str(e)}")
-                                            raise e
-                                        
-                                    if doc_info:
-                                        scraped_docs[doc_number] = doc_info
-                                        processed_doc_numbers.add(doc_number)
-                                        save_to_json(scraped_docs, json_filename)
-                                        
-                                        # 성공한 경우 실패 목록에서 제거
-                                        if doc_number in failed_docs:
-                                            del failed_docs[doc_number]
-                                            save_to_json(failed_docs, failed_docs_filename)
-                                    else:
-                                        raise Exception("문서 정보 수집 실패")
-                                    
-                                except Exception as e:
-                                    failed_docs[doc_number] = {
-                                        'doc_number': doc_number,
-                                        'url': doc_url,
-                                        'error_message': str(e),
-                                        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-                                    }
-                                    save_to_json(failed_docs, failed_docs_filename)
-                                    print(f"문서 처리 실패 정보 저장: {doc_number}")
-                                    continue
-                                
-                            except Exception as e:
-                                print(f"문서 처리 중 오류 발생: {str(e)}")
-                                continue
-                            
-                            new_page.close()
-                            time.sleep(1)
-                            
-                        except Exception as e:
-                            print(f"문서 처리 중 오류 발생: {str(e)}")
-                            continue
-                    
-                    # 더보기 버튼 처리
-                    try:
-                        # 더보기 버튼의 xpath 수정
-                        more_button = page.locator('//*[@id="moreSrchBtn"]/button')
-                        if not more_button.is_visible():
-                            print("더 이상 더보기 버튼이 없습니다.")
-                            break
-                            
-                        print("더보기 버튼 클릭...")
-                        more_button.click()
-                        
-                        # 새로운 문서 로딩 대기
-                        page.wait_for_load_state('networkidle')
-                        time.sleep(2)  # 추가 대기 시간
-                        
-                        # 새로운 문서 목록 확인
-                        new_elements = page.query_selector_all('//*[@id="collectionDiv"]/div[4]/ul/li')
-                        if len(new_elements) <= len(list_elements):
-                            print("새로운 문서가 로드되지 않았습니다.")
-                            break
-                        
-                        print(f"새로운 문서 {len(new_elements) - len(list_elements)}개 로드됨")
-                            
-                    except Exception as e:
-                        print(f"더보기 버튼 처리 중 오류 발생: {str(e)}")
-                        break
-                        
+                    if not open_search_results(page, query):
+                        continue
+                    crawl_listing(page, context, query, scheduler, doc_store,
+                                  track_checkpoint, incremental, known_run_limit)
                 except Exception as e:
-                    print(f"더록 처리 중 오류 발생: {str(e)}")
-                    break
+                    logger.error("%s 목록 처리 중 오류 발생: %s", query.label, str(e))
+
+            scheduler.print_report()
                     
         except Exception as e:
-            print(f"처리 중 오류 발생: {str(e)}")
+            logger.exception("처리 중 오류 발생: %s", str(e))
             
         finally:
-            # 크롤링 종료 시 실패 문서 목록 저장
-            if failed_docs:
-                save_to_json(failed_docs, failed_docs_filename)
-                print(f"실패한 문서 목록이 {failed_docs_filename}에 저장되었습니다.")
+            # 목록 수집이 끝나면 남은 상세 문서 처리와 파일 저장을 기다린다.
+            # 워커 오류로 join이 실패해도 아래 정리를 모두 마친 뒤 다시 발생시킨다
+            pool_error = None
+            try:
+                pool.join()
+            except Exception as e:
+                logger.error("크롤링 워커 오류로 남은 상세 문서를 처리하지 못했습니다: %s", str(e))
+                pool_error = e
+            logger.info("재시도 통계: %s", retry_policy.summary())
+            if file_writer:
+                file_writer.close()
+            if summary_stage:
+                summary_stage.close()
+
+            # 크롤링 종료 시 저장소 디스크 반영 및 압축
+            scraped_docs.compact()
+            failed_docs.compact()
+
+            if len(failed_docs) > 0:
+                logger.info("실패한 문서 목록이 %s에 저장되었습니다.", failed_docs.path)
                 
                 # Excel 파일로도 저장
-                failed_docs_df = pd.DataFrame.from_dict(failed_docs, orient='index')
+                failed_docs_df = pd.DataFrame(list(failed_docs.values()))
                 failed_docs_df.to_excel("failed_documents.xlsx", index=False)
-                print("실패한 문서 목록이 failed_documents.xlsx에 저장되었습니다.")
-            
-        browser.close()
+                logger.info("실패한 문서 목록이 failed_documents.xlsx에 저장되었습니다.")
+
+            scraped_docs.close()
+            failed_docs.close()
+            search_index.close()
+            doc_store.close()
+
+            # 단계별 소요 시간 보고서
+            report = telemetry.write_report(telemetry_report) if telemetry_report else telemetry.report()
+            telemetry.log_report(report)
+            if telemetry_report:
+                logger.info("소요 시간 보고서가 %s에 저장되었습니다.", telemetry_report)
+            if prometheus_file:
+                telemetry.write_prometheus(prometheus_file)
+
+            browser.close()
+            if pool_error is not None:
+                raise pool_error
         
     return scraped_docs
 
@@ -922,19 +866,25 @@ def save_to_json(data, filename):
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
-def load_from_json(filename):
-    """JSON 파일에서 데이터 로드"""
-    if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return {item['doc_num']: item for item in data if 'doc_num' in item}
-            return data
-    return {}
+def load_from_json(filename, key_field='doc_num'):
+    """JSONL 저장소를 열어 문서 인덱스를 재구성
+
+    filename과 같은 이름의 .jsonl 파일을 한 줄씩 읽어 키 -> 오프셋 인덱스만
+    메모리에 올린다. 저장소가 비어 있고 기존 .json 파일이 있으면 최초 1회 가져온다.
+    """
+    store = JsonlStore(os.path.splitext(filename)[0] + '.jsonl')
+    if len(store) == 0 and os.path.exists(filename):
+        store.import_json(filename, key_field=key_field)
+    return store
 
 def main():
-    scraped_docs_results = crawl_with_playwright()
-    print(f"총 {len(scraped_docs_results)}개의 문서가 크롤링되었습니다.")
+    configure_logging(LOG_LEVEL, LOG_FILE)
+    keywords = SEARCH_KEYWORDS
+    if os.path.exists(KEYWORDS_FILE):
+        keywords = load_keywords(KEYWORDS_FILE)
+        logger.info("검색어 파일 %s에서 검색어 %d개를 읽었습니다.", KEYWORDS_FILE, len(keywords))
+    scraped_docs_results = crawl_with_playwright(keywords=keywords)
+    logger.info("총 %d개의 문서가 크롤링되었습니다.", len(scraped_docs_results))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,239 @@
+DETAIL_BOX = '//*[@id="dcmDetailBox"]/div/div'
+
+# 필드 스펙: paths는 앞에서부터 시도, attr이 있으면 속성값, visible이면 보이는 요소만 사용
+PRECEDENT_METADATA_SPEC = {
+    "fields": {
+        "doc_num": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[1]/strong']},
+        "produce_date": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[4]/span']},
+        "related_date": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[2]/span']},
+        "court_sim": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[3]/span']},
+        "progress": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[5]/span']},
+        "tax_type": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/div/ul/li'], "attr": "title"},
+        "doc_title": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/div/strong']},
+        "doc_type": {"paths": ['//*[@id="scrnNm"]']},
+        "doc_result": {"paths": [f'{DETAIL_BOX}/div[2]/div/div/div[1]/div/em']},
+        "summary": {
+            "paths": [
+                f'{DETAIL_BOX}/div[2]/div/div/div[3]/div/div[2]/div[1]/p',
+                f'{DETAIL_BOX}/div[2]/div/div/div[2]/div/div[2]/div[1]/p'
+            ],
+            "visible": True
+        },
+    },
+    "related_base_paths": [
+        f'{DETAIL_BOX}/div[2]/div/div/div[2]',
+        f'{DETAIL_BOX}/div[1]/div/div/div[2]'
+    ],
+    "similar_list_paths": [f'{DETAIL_BOX}/div[3]/div[1]/div/ul'],
+    "tag_cloud_paths": [
+        f'{DETAIL_BOX}/div[2]/div[2]/div[2]/span',
+        f'{DETAIL_BOX}/div[3]/div[2]/div[2]/span'
+    ],
+}
+
+INTERPRETATION_METADATA_SPEC = {
+    "fields": {
+        "doc_num": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[1]/ul/li[1]/strong',
+                f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[1]/strong'
+            ],
+            "visible": True
+        },
+        "produce_date": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[1]/ul/li[3]/span',
+                f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[3]/span'
+            ],
+            "visible": True
+        },
+        "related_date": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[1]/ul/li[2]/span',
+                f'{DETAIL_BOX}/div[2]/div/div/div[1]/ul/li[2]/span'
+            ],
+            "visible": True
+        },
+        "tax_type": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[1]/div/ul/li',
+                f'{DETAIL_BOX}/div[2]/div/div/div[1]/div/ul/li'
+            ],
+            "attr": "title",
+            "visible": True
+        },
+        "doc_title": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[1]/div/strong',
+                f'{DETAIL_BOX}/div[2]/div/div/div[1]/div/strong'
+            ],
+            "visible": True
+        },
+        "doc_type": {"paths": ['//*[@id="scrnNm"]']},
+        "doc_result": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[1]/div/em',
+                f'{DETAIL_BOX}/div[2]/div/div/div[1]/div/em'
+            ],
+            "visible": True
+        },
+        "summary": {
+            "paths": [
+                f'{DETAIL_BOX}/div[1]/div/div/div[3]/div/div[2]/div[1]/p',
+                f'{DETAIL_BOX}/div[2]/div/div/div[3]/div/div[2]/div[1]/p',
+                f'{DETAIL_BOX}/div[2]/div/div/div[2]/div/div[2]/div[1]/p'
+            ],
+            "visible": True
+        },
+    },
+    "related_base_paths": [
+        f'{DETAIL_BOX}/div[1]/div/div/div[2]',
+        f'{DETAIL_BOX}/div[2]/div/div/div[2]'
+    ],
+    "similar_list_paths": [],
+    "tag_cloud_paths": [],
+}
+
+METADATA_EXTRACT_JS = """
+(spec) => {
+    const snapshot = (xpath, context) => {
+        const result = document.evaluate(xpath, context || document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+        return nodes;
+    };
+    const first = (xpath, context) => snapshot(xpath, context)[0] || null;
+    const isVisible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const text = (el) => (el ? el.innerText : '');
+
+    const out = { fields: {}, related_keywords: [], related_laws: [], similar_docs: [], tag_cloud: [] };
+
+    for (const [field, rule] of Object.entries(spec.fields)) {
+        let value = '';
+        for (const path of rule.paths) {
+            const el = first(path);
+            if (!el || (rule.visible && !isVisible(el))) continue;
+            value = rule.attr ? (el.getAttribute(rule.attr) || '') : el.innerText;
+            break;
+        }
+        out.fields[field] = value;
+    }
+
+    for (const basePath of spec.related_base_paths) {
+        const groups = snapshot(`${basePath}/div[contains(@class, "rel_group")]`);
+        if (!groups.length) continue;
+        for (const group of groups) {
+            const groupType = text(group.querySelector('span')).trim();
+            const items = Array.from(group.querySelectorAll('div > a'))
+                .map((a) => a.innerText.trim())
+                .filter((t) => t);
+            if (groupType.includes('관련 주제어')) out.related_keywords = items;
+            else if (groupType.includes('관련 법령')) out.related_laws = items;
+        }
+        break;
+    }
+
+    for (const listPath of spec.similar_list_paths) {
+        const ul = first(listPath);
+        if (!ul) continue;
+        for (const li of ul.querySelectorAll('li')) {
+            const title = first('.//a/div[1]/p[1]', li);
+            const info = first('.//a/div[1]/p[2]', li);
+            if (title && info) out.similar_docs.push({ title: title.innerText, info: info.innerText });
+        }
+        break;
+    }
+
+    for (const tagPath of spec.tag_cloud_paths) {
+        const tags = snapshot(tagPath);
+        if (!tags.length) continue;
+        out.tag_cloud = tags
+            .filter((tag) => tag.innerText.trim())
+            .map((tag) => tag.innerText.replace(/#/g, '').trim());
+        break;
+    }
+
+    return out;
+}
+"""
+
+
+def split_text(text):
+    parts = text.split(',')
+    if len(parts) == 2:
+        return parts[0].replace("(","").strip(), parts[1].replace(")","").strip()
+    
+    return text, ''
+
+def extract_page_metadata(page, spec):
+    """스펙에 정의된 메타데이터를 page.evaluate 한 번으로 수집해 dict로 반환
+
+    필드마다 locator(...).inner_text()를 호출하면 요소 하나당 브라우저 왕복이
+    발생하므로, 대체 경로를 포함한 XPath 스펙을 브라우저에 넘겨 한꺼번에 읽는다.
+    """
+    raw = page.evaluate(METADATA_EXTRACT_JS, spec)
+
+    metadata = {field: value for field, value in raw["fields"].items() if field != "summary"}
+    metadata["summary"] = {"content": raw["fields"].get("summary", "")}
+    metadata["related_keywords"] = raw["related_keywords"]
+    metadata["related_laws"] = raw["related_laws"]
+    metadata["similar_docs"] = [
+        {
+            "title": doc["title"],
+            "doc_num": split_text(doc["info"])[0],
+            "date": split_text(doc["info"])[1]
+        }
+        for doc in raw["similar_docs"]
+    ]
+    metadata["tag_cloud"] = raw["tag_cloud"]
+    return metadata
+
+
+LISTING_ROWS_JS = """
+([listXpath, start]) => {
+    const rows = document.evaluate(listXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const first = (xpath, context) => document.evaluate(xpath, context, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const isVisible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const absolute = (url) => new URL(url, location.href).href;
+
+    // 스크립트 링크의 상세 주소는 href/onclick 문자열에 주소 리터럴이 있을 때만 읽는다.
+    // 목록 페이지에서 사이트 스크립트를 실행하지 않도록 링크는 누르지 않으며,
+    // 주소를 찾지 못한 행은 빈 문자열로 남겨 resolve_doc_url이 처리한다.
+    const LITERAL_URL = /['"]((?:https?:\\/\\/|\\/)[^'"]+|[^'"\\s]+\\.do(?:\\?[^'"]*)?)['"]/;
+    const detailUrl = (link) => {
+        const href = link.getAttribute('href') || '';
+        if (href && !href.startsWith('#') && !href.startsWith('javascript')) return absolute(href);
+
+        const script = `${link.getAttribute('onclick') || ''};${href.startsWith('javascript:') ? href.slice(11) : ''}`;
+        const literal = script.match(LITERAL_URL);
+        return literal ? absolute(literal[1]) : '';
+    };
+
+    const out = [];
+    for (let i = start; i < rows.snapshotLength; i++) {
+        const li = rows.snapshotItem(i);
+        const number = first('./div[1]/div[1]/ul/li[1]/strong', li);
+        const type = first('./div[1]/div[1]/a/ul/li[1]', li);
+        const link = first('./div[1]/div[1]/a', li);
+        out.push({
+            index: i + 1,
+            doc_number: number ? number.innerText.trim() : '',
+            doc_type: type && isVisible(type) ? type.innerText : null,
+            url: link ? detailUrl(link) : ''
+        });
+    }
+    return out;
+}
+"""
+
+
+def extract_listing_rows(page, list_xpath, start=0):
+    """검색 결과 목록에서 start번째 이후 행의 (순번, 문서번호, 문서 유형, 상세 주소)를 한 번에 읽음
+
+    index는 XPath li[index]에 쓰는 1부터 시작하는 순번이고, 문서 유형 요소가
+    보이지 않으면 doc_type은 None이다. 스크립트 링크라 상세 주소를 알아내지
+    못한 행의 url은 빈 문자열이다.
+    """
+    return page.evaluate(LISTING_ROWS_JS, [list_xpath, start])
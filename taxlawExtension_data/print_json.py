@@ -1,81 +1,106 @@
+import argparse
+import hashlib
+import json
+import os
 import re
+import time
 from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
 from pathlib import Path
 
+try:
+    from lxml import etree
+    PARSER_BACKEND = 'lxml'
+except ImportError:
+    PARSER_BACKEND = 'bs4'
+
+class HeadingClassifier:
+    """줄 머리의 목차 기호('1.', '가.', '1)', '(1)' 등)를 한 번의 정규식 매칭으로 분류
+
+    레벨별 정규식을 이름 있는 그룹의 alternation 하나로 합쳐 두었기 때문에
+    앞 레벨부터 차례로 re.match를 시도하던 것과 같은 레벨이 한 번의 스캔으로 나온다.
+    """
+
+    def __init__(self, top_level_items, level_patterns):
+        self.top_level_items = frozenset(top_level_items)
+        self.level_patterns = tuple(level_patterns)
+        self._regex = re.compile('|'.join(
+            f'(?P<level{idx}>{pattern})' for idx, pattern in enumerate(level_patterns)
+        ))
+        self._levels = {f'level{idx}': idx for idx in range(len(level_patterns))}
+
+    def classify(self, line):
+        """(레벨, 매칭된 목차 기호) 반환, 목차 줄이 아니면 (None, None)"""
+        match = self._regex.match(line)
+        if match is None:
+            return None, None
+        return self._levels[match.lastgroup], match.group()
+
+
+# 판례/심판례 구조
+PRECEDENT_HEADINGS = HeadingClassifier(
+    top_level_items=['주 문', '청 구 취 지', '이 유'],
+    level_patterns=[
+        r'\d{1,2}\.(?!\d)',  # 1. , 2. 등은 매칭하되 1999., 2014. 등은 제외
+        r'\w\.',
+        r'\d+\)',
+        r'\w\)',
+        r'\(\d+\)'
+    ]
+)
+
+# 해석례 구조 ('주문'과 '이유' 아래 '1.', '가.', '(1)' 등)
+INTERPRETATION_HEADINGS = HeadingClassifier(
+    top_level_items=['주문', '이유'],
+    level_patterns=[
+        r'\d+\.',          # 1., 2. 등
+        r'[가-힣]\.',      # 가., 나. 등
+        r'\(\d+\)',        # (1), (2) 등
+        r'[a-z]\)',        # a), b) 등
+        r'[가-힣]\)',      # 가), 나) 등
+        r'\d+\)',          # 1), 2) 등
+    ]
+)
+
 def parse_structure(content):
     """
     Parse the structured content using predefined markers (e.g., '1.', '가.', '1)', etc.)
     to create hierarchical Markdown.
     """
-    # 최상위 레벨 항목들
-    top_level_items = ['주 문', '청 구 취 지', '이 유']
-    
-    # 날짜 형식을 제외하고 실제 헤더만 매칭하도록 정규표현식 수정
-    levels = [
-        r'^\d{1,2}\.(?!\d)',  # 1. , 2. 등은 매칭하되 1999., 2014. 등은 제외
-        r'^\w\.', 
-        r'^\d+\)', 
-        r'^\w\)', 
-        r'^\(\d+\)'
-    ]
-    regexes = [re.compile(level) for level in levels]
+    return build_heading_markdown(content, PRECEDENT_HEADINGS)
 
-    hierarchy = []
+def build_heading_markdown(content, classifier):
+    """분류기로 줄마다 목차 레벨을 판단해 계층형 마크다운 생성"""
     markdown_lines = []
     current_paragraph = []
-    current_header = None
 
-    lines = content.splitlines()
-    i = 0
-    while i < len(lines):
-        stripped_line = lines[i].strip()
+    for line in content.splitlines():
+        stripped_line = line.strip()
         if not stripped_line:
             if current_paragraph:
-                if current_header:
-                    markdown_lines.append(current_header)
                 markdown_lines.append('    ' + ' '.join(current_paragraph))
                 current_paragraph = []
-                current_header = None
-            i += 1
             continue
 
         # 최상위 레벨 항목 체크
-        if stripped_line in top_level_items:
+        if stripped_line in classifier.top_level_items:
             if current_paragraph:
-                if current_header:
-                    markdown_lines.append(current_header)
                 markdown_lines.append('    ' + ' '.join(current_paragraph))
                 current_paragraph = []
-                current_header = None
             markdown_lines.append('# ' + stripped_line)
-            i += 1
             continue
 
-        match_level = None
-        matched_part = None
-        
-        for idx, regex in enumerate(regexes):
-            match = regex.match(stripped_line)
-            if match:
-                match_level = idx
-                matched_part = match.group()
-                break
+        match_level, matched_part = classifier.classify(stripped_line)
 
         if match_level is not None:
             # 이전 문단 처리
             if current_paragraph:
-                if current_header:
-                    markdown_lines.append(current_header)
                 markdown_lines.append('    ' + ' '.join(current_paragraph))
                 current_paragraph = []
 
-            while len(hierarchy) > match_level:
-                hierarchy.pop()
-
-            if len(hierarchy) <= match_level:
-                hierarchy.append(matched_part)
-
-            # 헤더 추가
+            # 헤더 추가 (최상위가 #이므로 그 다음은 ##부터 시작)
             markdown_lines.append('#' * (match_level + 2) + ' ' + matched_part)
             
             # 남은 텍스트 처리
@@ -87,17 +112,13 @@ def parse_structure(content):
                 else:
                     # 마침표로 끝나지 않으면 current_paragraph에 추가
                     current_paragraph.append(remaining_text)
+        elif stripped_line.endswith('.'):
+            # 마침표로 끝나면 현재 문단 완성
+            current_paragraph.append(stripped_line)
+            markdown_lines.append('    ' + ' '.join(current_paragraph))
+            current_paragraph = []
         else:
-            # 일반 텍스트 처리
-            if stripped_line.endswith('.'):
-                # 마침표로 끝나면 현재 문단 완성
-                current_paragraph.append(stripped_line)
-                markdown_lines.append('    ' + ' '.join(current_paragraph))
-                current_paragraph = []
-            else:
-                current_paragraph.append(stripped_line)
-
-        i += 1
+            current_paragraph.append(stripped_line)
 
     # 마지막 문단 처리
     if current_paragraph:
@@ -105,59 +126,241 @@ def parse_structure(content):
 
     return '\n\n'.join(markdown_lines)
 
-def html_to_markdown(html_content, doc_type=None):
+def html_to_markdown(html_content, doc_type=None, parser=None):
     """HTML을 마크다운으로 변환
     
     Args:
         html_content (str): 변환할 HTML 문자열
         doc_type (str): 문서 유형 ('판례', '심판례' 또는 기타)
+        parser (str): 파서 백엔드 ('lxml' 또는 'bs4', 기본값은 PARSER_BACKEND)
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    if doc_type in ['판례', '심판']:
-        # 판례/심판례는 기존 방식대로 처리
-        markdown = []
-        for element in soup.find_all(['p', 'table']):
-            if element.name == 'table':
-                # 테이블 제목 찾기 (이전 p 태그에서 찾기)
-                table_title = ""
-                prev_element = element.find_previous_sibling('p')
-                if prev_element:
-                    title_text = prev_element.get_text().strip()
-                    if '(표' in title_text and ')' in title_text:
-                        table_title = title_text
-                
-                # 테이블을 마크다운으로 변환
-                table_md = convert_table_to_markdown(element, table_title)
-                markdown.extend(table_md)
-            elif element.name == 'p':
-                text = element.get_text(strip=True)
-                if text and not ('표' in text and ')' in text):  # 테이블 제목은 제외
-                    markdown.append(text)
-        
-        return parse_structure('\n'.join(markdown))
+    is_precedent = doc_type in ['판례', '심판']
+    # 판례/심판례는 '(표', 해석례는 '표'가 들어간 직전 문단을 테이블 제목으로 사용
+    title_marker = '(표' if is_precedent else '표'
+
+    if (parser or PARSER_BACKEND) == 'lxml':
+        markdown = _collect_markdown_lxml(html_content, title_marker)
     else:
-        # 해석례는 새로운 방식으로 처리
-        markdown = []
-        for element in soup.find_all(['p', 'table']):
-            if element.name == 'table':
-                # 테이블 제목 찾기 (이전 p 태그에서 찾기)
-                table_title = ""
-                prev_element = element.find_previous_sibling('p')
-                if prev_element:
-                    title_text = prev_element.get_text().strip()
-                    if '표' in title_text and ')' in title_text:
-                        table_title = title_text
-                
-                # 테이블을 마크다운으로 변환
-                table_md = convert_table_to_markdown(element, table_title)
-                markdown.extend(table_md)
-            elif element.name == 'p':
-                text = element.get_text(strip=True)
-                if text and not ('표' in text and ')' in text):  # 테이블 제목은 제외
-                    markdown.append(text)
-        
-        return parse_interpretation_structure('\n'.join(markdown))
+        markdown = _collect_markdown_bs4(html_content, title_marker)
+
+    if is_precedent:
+        return parse_structure('\n'.join(markdown))
+    return parse_interpretation_structure('\n'.join(markdown))
+
+def _collect_markdown_bs4(html_content, title_marker):
+    """BeautifulSoup(html.parser)로 p/table 요소를 문서 순서대로 마크다운 줄로 변환"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    markdown = []
+    for element in soup.find_all(['p', 'table']):
+        if element.name == 'table':
+            # 테이블 제목 찾기 (이전 p 태그에서 찾기)
+            table_title = ""
+            prev_element = element.find_previous_sibling('p')
+            if prev_element:
+                title_text = prev_element.get_text().strip()
+                if title_marker in title_text and ')' in title_text:
+                    table_title = title_text
+            
+            # 테이블을 마크다운으로 변환
+            table_md = convert_table_to_markdown(element, table_title)
+            markdown.extend(table_md)
+        elif element.name == 'p':
+            text = element.get_text(strip=True)
+            if text and not ('표' in text and ')' in text):  # 테이블 제목은 제외
+                markdown.append(text)
+    return markdown
+
+# BeautifulSoup(html.parser)가 닫는 태그 없이 바로 닫는 빈 요소
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer'
+])
+
+# BeautifulSoup get_text()가 건너뛰는 문자열을 담는 요소 (스크립트, 스타일 등)
+HIDDEN_TEXT_ELEMENTS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# BeautifulSoup이 공백만 있는 문자열을 ' ' 또는 '\n' 하나로 줄이지 않는 요소
+PRESERVE_WHITESPACE_ELEMENTS = frozenset(['pre', 'textarea'])
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+_INVALID_TAG_CHARS = re.compile(r'[^\w.-]')
+
+class _SoupCompatibleTreeBuilder(HTMLParser):
+    """html.parser 토큰을 BeautifulSoup(html.parser)와 같은 중첩 규칙으로 lxml 트리로 조립
+
+    libxml2 파서는 닫히지 않은 p나 p 안의 table을 스스로 고쳐 BeautifulSoup과
+    다른 트리를 만들기 때문에, 토큰화는 BeautifulSoup과 같은 html.parser로 하고
+    트리만 lxml 요소로 만든다. 닫는 태그는 가장 가까운 같은 이름의 열린 요소까지
+    닫고, 열린 적 없는 닫는 태그는 무시한다. 주석/선언은 텍스트 경계만 남기고,
+    HIDDEN_TEXT_ELEMENTS 안의 텍스트는 get_text() 결과에 들어가지 않으므로 버린다.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.root = etree.Element('root')
+        self._stack = [self.root]
+        self._names = ['root']
+        self._hidden = 0
+        self._closed_void = []
+
+    def handle_starttag(self, tag, attrs):
+        element = self._append(tag)
+        if tag in VOID_ELEMENTS:
+            # 나중에 나올 수 있는 </br> 같은 닫는 태그는 BeautifulSoup처럼 한 번 무시한다
+            self._closed_void.append(tag)
+        else:
+            self._push(tag, element)
+
+    def handle_startendtag(self, tag, attrs):
+        self._append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+        for idx in range(len(self._names) - 1, 0, -1):
+            if self._names[idx] == tag:
+                if self._hidden:
+                    self._hidden -= sum(1 for name in self._names[idx:] if name in HIDDEN_TEXT_ELEMENTS)
+                del self._stack[idx:]
+                del self._names[idx:]
+                return
+        # 짝이 없는 닫는 태그도 BeautifulSoup에서는 텍스트를 나눈다
+        self._split_text()
+
+    def handle_data(self, data):
+        if self._hidden or not data:
+            return
+        parent = self._stack[-1]
+        if len(parent):
+            last = parent[-1]
+            last.tail = (last.tail or '') + data
+        else:
+            parent.text = (parent.text or '') + data
+
+    def handle_charref(self, name):
+        try:
+            code = int(name[1:], 16) if name[:1] in ('x', 'X') else int(name)
+        except ValueError:
+            self.handle_data(name)
+            return
+        if 128 <= code <= 159:
+            # BeautifulSoup과 같이 windows-1252로 잘못 인코딩된 참조를 고친다
+            self.handle_data(bytes([code]).decode('cp1252', errors='replace'))
+        else:
+            try:
+                self.handle_data(chr(code))
+            except (ValueError, OverflowError):
+                self.handle_data('\ufffd')
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f'&{name}')
+
+    def handle_comment(self, data):
+        self._split_text()
+
+    def handle_decl(self, decl):
+        self._split_text()
+
+    def handle_pi(self, data):
+        self._split_text()
+
+    def unknown_decl(self, data):
+        # CDATA 블록의 텍스트는 별도 문자열로 BeautifulSoup get_text()에 포함된다
+        self._split_text()
+        if data.upper().startswith('CDATA['):
+            self.handle_data(data[len('CDATA['):])
+            self._split_text()
+
+    def _split_text(self):
+        """주석 등이 있던 자리에서 텍스트를 나눈다 (get_text(strip=True)는 조각별로 strip한다)
+
+        itertext()는 빈 주석 노드의 내용은 건너뛰고 앞뒤 텍스트를 따로 돌려준다.
+        """
+        self._stack[-1].append(etree.Comment())
+
+    def close(self):
+        super().close()
+        self._collapse_whitespace()
+
+    def _collapse_whitespace(self):
+        """공백만 있는 문자열을 BeautifulSoup처럼 줄바꿈이 있으면 '\n', 없으면 ' '로 줄인다"""
+        for element in self.root.iter():
+            if element.tag is not etree.Comment and self._is_blank(element.text):
+                if not self._preserves_whitespace(element):
+                    element.text = '\n' if '\n' in element.text else ' '
+            if self._is_blank(element.tail):
+                if not self._preserves_whitespace(element.getparent()):
+                    element.tail = '\n' if '\n' in element.tail else ' '
+
+    @staticmethod
+    def _is_blank(text):
+        return bool(text) and not text.strip(ASCII_SPACES)
+
+    @staticmethod
+    def _preserves_whitespace(element):
+        if element.tag in PRESERVE_WHITESPACE_ELEMENTS:
+            return True
+        return any(True for _ in element.iterancestors(*PRESERVE_WHITESPACE_ELEMENTS))
+
+    def _append(self, tag):
+        # lxml은 'o:p' 같은 이름을 받지 않으므로 저장용 태그 이름만 바꾼다
+        parent = self._stack[-1]
+        try:
+            return etree.SubElement(parent, tag)
+        except ValueError:
+            return etree.SubElement(parent, '_' + _INVALID_TAG_CHARS.sub('_', tag))
+
+    def _push(self, tag, element):
+        self._stack.append(element)
+        self._names.append(tag)
+        if tag in HIDDEN_TEXT_ELEMENTS:
+            self._hidden += 1
+
+def parse_soup_compatible(html_content):
+    """BeautifulSoup(html.parser)와 같은 구조의 lxml 트리 반환 (최상위는 'root' 요소)"""
+    builder = _SoupCompatibleTreeBuilder()
+    builder.feed(html_content)
+    builder.close()
+    return builder.root
+
+def _collect_markdown_lxml(html_content, title_marker):
+    """lxml 트리로 p/table 요소를 한 번의 순회로 마크다운 줄로 변환
+
+    트리는 parse_soup_compatible로 BeautifulSoup 경로와 같은 모양으로 만들고,
+    테이블 직전 p 형제는 순회하면서 부모별 마지막 p를 기억해 두는 방식으로 찾는다.
+    """
+    if not html_content:
+        return []
+    root = parse_soup_compatible(html_content)
+
+    markdown = []
+    last_p_by_parent = {}
+    for element in root.iter('p', 'table'):
+        if element.tag == 'table':
+            table_title = ""
+            prev_element = last_p_by_parent.get(element.getparent())
+            if prev_element is not None:
+                title_text = _lxml_text(prev_element).strip()
+                if title_marker in title_text and ')' in title_text:
+                    table_title = title_text
+
+            markdown.extend(convert_lxml_table_to_markdown(element, table_title))
+        else:
+            last_p_by_parent[element.getparent()] = element
+            text = _lxml_text(element, strip=True)
+            if text and not ('표' in text and ')' in text):  # 테이블 제목은 제외
+                markdown.append(text)
+    return markdown
+
+def _lxml_text(element, strip=False):
+    """BeautifulSoup get_text()와 같은 규칙으로 lxml 요소의 텍스트 추출"""
+    if strip:
+        return ''.join(text.strip() for text in element.itertext() if text.strip())
+    return ''.join(element.itertext())
 
 def convert_table_to_markdown(table, title=""):
     """HTML 표를 마크다운 표로 변환"""
@@ -189,117 +392,172 @@ def convert_table_to_markdown(table, title=""):
     markdown.append('\n')  # 표 다음에 빈 줄 추가
     return markdown
 
+def convert_lxml_table_to_markdown(table, title=""):
+    """lxml 표 요소를 마크다운 표로 변환 (convert_table_to_markdown과 같은 출력)"""
+    markdown = []
+    
+    if title:
+        markdown.append(f"\n**{title}**\n")
+    
+    rows = list(table.iter('tr'))
+    if rows:
+        headers = [_lxml_text(cell).strip() for cell in rows[0].iter('th', 'td')]
+        if headers:
+            markdown.append('| ' + ' | '.join(headers) + ' |')
+            markdown.append('|' + '|'.join(['---' for _ in headers]) + '|')
+    
+    for row in rows[1:]:
+        cols = [_lxml_text(td).strip() for td in row.iter('td')]
+        if cols:
+            markdown.append('| ' + ' | '.join(cols) + ' |')
+    
+    markdown.append('\n')  # 표 다음에 빈 줄 추가
+    return markdown
+
 def parse_interpretation_structure(content):
     """
     해석례용 구조 파싱 함수
     해석례는 '주문'과 '이유'를 최상위 레벨로 하고
     그 아래 '1.', 'ㄱ.', '(1)' 등의 형식을 사용
     """
-    # 최상위 레벨 항목들
-    top_level_items = ['주문', '이유']
-    
-    # 해석례 구조의 레벨 정의
-    levels = [
-        r'^\d+\.',          # 1., 2. 등
-        r'^[가-힣]\.',      # 가., 나. 등
-        r'^\(\d+\)',        # (1), (2) 등
-        r'^[a-z]\)',        # a), b) 등
-        r'^[가-힣]\)',      # 가), 나) 등
-        r'^\d+\)',          # 1), 2) 등
-    ]
-    regexes = [re.compile(level) for level in levels]
+    return build_heading_markdown(content, INTERPRETATION_HEADINGS)
 
-    hierarchy = []
-    markdown_lines = []
-    current_paragraph = []
-    current_header = None
+def compare_parser_backends(html_paths, doc_type=None):
+    """파서 백엔드별 변환 결과 일치 여부와 문서당 변환 시간 비교
 
-    lines = content.splitlines()
-    i = 0
-    while i < len(lines):
-        stripped_line = lines[i].strip()
-        if not stripped_line:
-            if current_paragraph:
-                if current_header:
-                    markdown_lines.append(current_header)
-                markdown_lines.append('    ' + ' '.join(current_paragraph))
-                current_paragraph = []
-                current_header = None
-            i += 1
-            continue
-
-        # 최상위 레벨 항목 체크
-        if stripped_line in top_level_items:
-            if current_paragraph:
-                if current_header:
-                    markdown_lines.append(current_header)
-                markdown_lines.append('    ' + ' '.join(current_paragraph))
-                current_paragraph = []
-                current_header = None
-            markdown_lines.append('# ' + stripped_line)
-            i += 1
-            continue
-
-        match_level = None
-        matched_part = None
-        
-        for idx, regex in enumerate(regexes):
-            match = regex.match(stripped_line)
-            if match:
-                match_level = idx
-                matched_part = match.group()
-                break
-
-        if match_level is not None:
-            # 이전 문단 처리
-            if current_paragraph:
-                if current_header:
-                    markdown_lines.append(current_header)
-                markdown_lines.append('    ' + ' '.join(current_paragraph))
-                current_paragraph = []
-
-            while len(hierarchy) > match_level:
-                hierarchy.pop()
-
-            if len(hierarchy) <= match_level:
-                hierarchy.append(matched_part)
-
-            # 헤더 레벨 조정 (각 레벨마다 '#' 하나씩만 추가)
-            header_level = match_level + 2  # 최상위가 #이므로 그 다음은 ##부터 시작
-            markdown_lines.append('#' * header_level + ' ' + matched_part)
-            
-            # 남은 텍스트 처리
-            remaining_text = stripped_line[len(matched_part):].strip()
-            if remaining_text:
-                if remaining_text.endswith('.'):
-                    markdown_lines.append('    ' + remaining_text)
-                else:
-                    current_paragraph.append(remaining_text)
+    Returns:
+        dict: 백엔드별 평균 변환 시간(초), 결과가 다른 파일 목록
+    """
+    timings = {'bs4': 0.0, 'lxml': 0.0}
+    mismatches = []
+
+    for path in html_paths:
+        html_content = Path(path).read_text(encoding='utf-8')
+        outputs = {}
+        for backend in timings:
+            started = time.perf_counter()
+            outputs[backend] = html_to_markdown(html_content, doc_type=doc_type, parser=backend)
+            timings[backend] += time.perf_counter() - started
+        if outputs['bs4'] != outputs['lxml']:
+            mismatches.append(str(path))
+
+    count = max(1, len(html_paths))
+    report = {
+        'documents': len(html_paths),
+        'bs4_sec_per_doc': timings['bs4'] / count,
+        'lxml_sec_per_doc': timings['lxml'] / count,
+        'mismatches': mismatches
+    }
+    if timings['lxml']:
+        report['speedup'] = timings['bs4'] / timings['lxml']
+    return report
+
+MANIFEST_NAME = '.markdown_manifest.json'
+CONTENT_HEADINGS = ('# content', '# Content')
+
+def converter_version():
+    """변환 규칙 버전 (이 파일 내용이 바뀌면 달라진다)"""
+    source = Path(__file__).read_bytes()
+    return f"{PARSER_BACKEND}-{hashlib.sha256(source).hexdigest()[:12]}"
+
+def guess_doc_type(md_path):
+    """크롤러가 만든 마크다운의 기본정보로 문서 유형 추정 (판례용 양식에만 법원유형이 있다)"""
+    if md_path.exists() and '- 법원유형:' in md_path.read_text(encoding='utf-8'):
+        return '판례'
+    return None
+
+def splice_content(existing_md, content_md):
+    """크롤러 마크다운의 메타데이터는 두고 content 섹션만 교체"""
+    lines = existing_md.split('\n')
+    for idx, line in enumerate(lines):
+        if line.strip() in CONTENT_HEADINGS:
+            return '\n'.join(lines[:idx + 1]) + '\n' + content_md + '\n'
+    return content_md
+
+def write_atomic(path, text):
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def _convert_file(task):
+    """프로세스 풀 작업: HTML 하나를 마크다운으로 변환 (변경이 없으면 건너뜀)"""
+    html_path, previous, version, doc_type, force = task
+    html_path = Path(html_path)
+    try:
+        html_bytes = html_path.read_bytes()
+        html_hash = hashlib.sha256(html_bytes).hexdigest()
+        entry = {'hash': html_hash, 'version': version}
+        if not force and previous == entry:
+            return html_path.name, 'skipped', entry
+
+        md_path = html_path.with_suffix('.md')
+        content_md = html_to_markdown(html_bytes.decode('utf-8'), doc_type=doc_type or guess_doc_type(md_path))
+
+        if md_path.exists():
+            output = splice_content(md_path.read_text(encoding='utf-8'), content_md)
         else:
-            # 일반 텍스트 처리
-            if stripped_line.endswith('.'):
-                current_paragraph.append(stripped_line)
-                markdown_lines.append('    ' + ' '.join(current_paragraph))
-                current_paragraph = []
+            output = content_md
+        write_atomic(md_path, output)
+        return html_path.name, 'converted', entry
+    except Exception as e:
+        print(f"변환 실패 ({html_path.name}): {str(e)}")
+        return html_path.name, 'failed', None
+
+def convert_directory(data_dir, doc_type=None, workers=None, chunk_size=16, force=False):
+    """디렉터리의 HTML 파일을 프로세스 풀로 일괄 마크다운 변환"""
+    data_dir = Path(data_dir)
+    manifest_path = data_dir / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8')) if manifest_path.exists() else {}
+    version = converter_version()
+
+    html_paths = sorted(data_dir.glob('*.html'))
+    tasks = [(str(path), manifest.get(path.name), version, doc_type, force) for path in html_paths]
+
+    counts = {'converted': 0, 'skipped': 0, 'failed': 0}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for name, status, entry in executor.map(_convert_file, tasks, chunksize=chunk_size):
+            counts[status] += 1
+            if entry:
+                manifest[name] = entry
             else:
-                current_paragraph.append(stripped_line)
+                manifest.pop(name, None)
+    elapsed = time.perf_counter() - started
 
-        i += 1
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
 
-    # 마지막 문단 처리
-    if current_paragraph:
-        markdown_lines.append('    ' + ' '.join(current_paragraph))
-
-    return '\n\n'.join(markdown_lines)
+    rate = counts['converted'] / elapsed if elapsed else 0.0
+    print(f"변환 {counts['converted']}건, 건너뜀 {counts['skipped']}건, 실패 {counts['failed']}건 "
+          f"({elapsed:.1f}초, {rate:.1f} docs/sec)")
+    return counts
 
 def main():
-    input_path = Path('D:\\PythonProject\\llm\\crawling\\data_test\\조심-2023-중-7590.html')
+    parser = argparse.ArgumentParser(description='HTML 판례/해석례를 마크다운으로 변환')
+    parser.add_argument('path', nargs='?', default='data', help='HTML 파일 또는 HTML 파일이 있는 디렉터리')
+    parser.add_argument('--doc-type', default=None, help="문서 유형 ('판례', '해석례'). 생략하면 기존 마크다운으로 추정")
+    parser.add_argument('--workers', type=int, default=None, help='변환 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--chunk-size', type=int, default=16, help='프로세스에 한 번에 넘길 파일 수')
+    parser.add_argument('--force', action='store_true', help='변경 여부와 관계없이 모두 다시 변환')
+    parser.add_argument('--compare', action='store_true', help='lxml/bs4 파서 결과 일치 여부와 속도 비교')
+    args = parser.parse_args()
+
+    input_path = Path(args.path)
+
+    if args.compare:
+        html_paths = sorted(input_path.glob('*.html')) if input_path.is_dir() else [input_path]
+        print(json.dumps(compare_parser_backends(html_paths, args.doc_type), ensure_ascii=False, indent=2))
+        return
+
+    if input_path.is_dir():
+        convert_directory(input_path, args.doc_type, args.workers, args.chunk_size, args.force)
+        return
+
     output_path = input_path.with_suffix('.md')
 
     with open(input_path, 'r', encoding='utf-8') as file:
         html_content = file.read()
 
-    markdown_content = html_to_markdown(html_content)
+    markdown_content = html_to_markdown(html_content, doc_type=args.doc_type)
 
     with open(output_path, 'w', encoding='utf-8') as file:
         file.write(markdown_content)
@@ -0,0 +1,207 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+class HttpStatusError(Exception):
+    """상세 페이지가 오류 상태 코드로 응답한 경우"""
+
+    def __init__(self, status, url=None):
+        super().__init__(f"HTTP {status} 응답: {url}" if url else f"HTTP {status} 응답")
+        self.status = status
+        self.url = url
+
+
+@dataclass(frozen=True)
+class RetryRule:
+    """오류 종류별 재시도 규칙"""
+    max_retries: int         # 한 실행 안에서의 최대 재시도 횟수
+    base_delay: float = 0.0  # 첫 재시도 대기(초), 이후 2배씩 증가
+    max_delay: float = 0.0
+    trips_breaker: bool = False  # 서버 상태 문제로 보고 서킷 브레이커에 반영할지
+
+
+# 오류 종류별 규칙: 서버/네트워크 문제는 길게 기다려 여러 번, 파싱 실패는 한 번만,
+# 없는 문서(404)나 요청 오류는 재시도하지 않는다
+ERROR_RULES = {
+    "throttled": RetryRule(max_retries=4, base_delay=30.0, max_delay=300.0, trips_breaker=True),
+    "server": RetryRule(max_retries=3, base_delay=10.0, max_delay=120.0, trips_breaker=True),
+    "timeout": RetryRule(max_retries=3, base_delay=5.0, max_delay=60.0, trips_breaker=True),
+    "network": RetryRule(max_retries=3, base_delay=5.0, max_delay=60.0, trips_breaker=True),
+    "parse": RetryRule(max_retries=1, base_delay=2.0, max_delay=2.0),
+    "not_found": RetryRule(max_retries=0),
+    "client": RetryRule(max_retries=0),
+}
+
+NETWORK_ERROR_MARKERS = ("net::ERR_", "Target closed", "Target page, context or browser has been closed",
+                         "Connection", "ECONNRESET")
+
+
+def classify_error(error):
+    """예외를 ERROR_RULES의 오류 종류로 분류"""
+    if isinstance(error, HttpStatusError):
+        if error.status in (429, 503):
+            return "throttled"
+        if error.status >= 500:
+            return "server"
+        if error.status in (404, 410):
+            return "not_found"
+        return "client"
+    # Playwright TimeoutError는 내장 TimeoutError를 상속하지 않으므로 이름으로도 확인
+    if isinstance(error, TimeoutError) or type(error).__name__ == "TimeoutError":
+        return "timeout"
+    message = str(error)
+    if any(marker in message for marker in NETWORK_ERROR_MARKERS):
+        return "network"
+    return "parse"
+
+
+class CircuitBreaker:
+    """사이트 오류가 몰리면 모든 워커의 요청을 잠시 멈추는 서킷 브레이커
+
+    최근 window건 중 failure_threshold 비율 이상이 서버 쪽 오류면 열린다(open).
+    열려 있는 동안 before_request는 cooldown초가 지날 때까지 기다리게 하고,
+    그 뒤에는 요청 하나만 시험으로 보낸다(half-open). 시험 요청이 성공하면
+    닫히고, 실패하면 cooldown을 두 배로 늘려(max_cooldown까지) 다시 열린다.
+    시험 요청에는 before_request가 토큰을 주고, 같은 토큰을 넘긴 record만
+    half-open 상태를 끝낸다. 열리기 전에 보낸 요청의 결과는 무시한다.
+    """
+
+    def __init__(self, window=20, failure_threshold=0.5, min_requests=5,
+                 cooldown=30.0, max_cooldown=600.0):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.state = "closed"
+        self.trips = 0
+        self._results = []
+        self._cooldown = cooldown
+        self._opened_at = 0.0
+        self._probe = None
+        self._cond = threading.Condition()
+
+    def before_request(self):
+        """요청을 보내도 될 때까지 대기 후 토큰 반환 (시험 요청이 아니면 None)"""
+        with self._cond:
+            while True:
+                if self.state == "closed":
+                    return None
+                if self.state == "open":
+                    remaining = self._opened_at + self._cooldown - time.monotonic()
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                        continue
+                    self.state = "half_open"
+                    logger.info("서킷 브레이커: 시험 요청으로 사이트 상태를 확인합니다.")
+                # half-open: 시험 요청은 한 번에 하나만
+                if self._probe is None:
+                    self._probe = object()
+                    return self._probe
+                self._cond.wait()
+
+    def record(self, ok, counts=True, token=None):
+        """요청 결과 반영 (counts=False인 실패는 사이트 상태와 무관한 오류로 보고 무시)
+
+        token은 before_request가 돌려준 값이다. half-open 상태에서는 시험 요청의
+        토큰을 가진 결과만 반영한다.
+        """
+        with self._cond:
+            if self.state == "half_open":
+                if token is None or token is not self._probe:
+                    return
+                self._probe = None
+                if ok or not counts:
+                    self._close()
+                else:
+                    self._open()
+                self._cond.notify_all()
+                return
+
+            self._results.append(ok or not counts)
+            del self._results[:-self.window]
+            failures = self._results.count(False)
+            if (self.state == "closed" and len(self._results) >= self.min_requests
+                    and failures / len(self._results) >= self.failure_threshold):
+                self._open()
+
+    def _open(self):
+        if self.state == "half_open":
+            self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+        self.state = "open"
+        self.trips += 1
+        self._opened_at = time.monotonic()
+        self._results = []
+        logger.warning("서킷 브레이커 열림: 사이트 오류가 많아 %.0f초 동안 요청을 멈춥니다.", self._cooldown)
+
+    def _close(self):
+        self.state = "closed"
+        self._cooldown = self.base_cooldown
+        self._results = []
+        logger.info("서킷 브레이커 닫힘: 수집을 재개합니다.")
+
+
+class RetryPolicy:
+    """실패한 상세 문서의 재시도 여부와 대기 시간을 결정
+
+    오류 종류별 규칙(ERROR_RULES)에 따라 지수 백오프(지터 포함)로 재시도하되,
+    실행 전체의 재시도 수를 min_budget + budget_ratio × 요청 수 이하로 묶어
+    사이트가 계속 실패할 때 재시도가 요청을 불리지 않게 한다.
+    """
+
+    def __init__(self, rules=None, budget_ratio=0.2, min_budget=10, breaker=None):
+        self.rules = rules or ERROR_RULES
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+        self.breaker = breaker or CircuitBreaker()
+
+        self.requests = 0
+        self.retries = 0
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """서킷 브레이커가 요청을 허용할 때까지 대기 후 결과 기록에 넘길 토큰 반환"""
+        return self.breaker.before_request()
+
+    def record_success(self, token=None):
+        with self._lock:
+            self.requests += 1
+        self.breaker.record(True, token=token)
+
+    def record_failure(self, error, attempts, token=None):
+        """실패 한 건 반영 후 (오류 종류, 재시도 대기 초 또는 None) 반환
+
+        attempts는 이 실행에서 해당 문서를 이미 재시도한 횟수다.
+        """
+        error_class = classify_error(error)
+        rule = self.rules.get(error_class, self.rules["parse"])
+        self.breaker.record(False, counts=rule.trips_breaker, token=token)
+
+        with self._lock:
+            self.requests += 1
+            self.stats[error_class] = self.stats.get(error_class, 0) + 1
+            if attempts >= rule.max_retries:
+                return error_class, None
+            if self.retries >= self.min_budget + self.budget_ratio * self.requests:
+                logger.warning("재시도 예산을 모두 사용해 더 이상 재시도하지 않습니다.")
+                return error_class, None
+            self.retries += 1
+
+        delay = min(rule.max_delay, rule.base_delay * (2 ** attempts))
+        return error_class, delay * random.uniform(0.5, 1.0)
+
+    def is_retryable(self, error_class):
+        """다음 실행에서 자동으로 다시 시도할 오류 종류인지"""
+        return self.rules.get(error_class, self.rules["parse"]).max_retries > 0
+
+    def summary(self):
+        errors = ', '.join(f"{name} {count}건" for name, count in sorted(self.stats.items())) or "없음"
+        return (f"요청 {self.requests}건, 재시도 {self.retries}건, 오류 종류별: {errors}, "
+                f"서킷 브레이커 작동 {self.breaker.trips}회")
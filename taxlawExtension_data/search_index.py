@@ -0,0 +1,224 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+from doc_store import split_markdown_document
+
+logger = logging.getLogger(__name__)
+
+# 검색 대상 필드와 BM25 가중치 (문서명/요지/주제어가 본문보다 중요)
+SEARCH_FIELDS = ("title", "summary", "keywords", "laws", "tags", "body")
+FIELD_WEIGHTS = (5.0, 3.0, 3.0, 2.0, 2.0, 1.0)
+
+WORD = re.compile(r'\w+')
+SNIPPET_RADIUS = 60
+MARKDOWN_MARKUP = re.compile(r'#+ |\*\*')
+
+
+def to_bigrams(text):
+    """한국어 검색용 문자 2-gram 변환 ('부당행위' -> '부당 당행 행위')
+
+    FTS5 기본 토크나이저는 공백 단위라 '부당행위계산부인' 같은 복합어 안의
+    '행위'를 찾지 못하므로, 단어마다 겹치는 두 글자 조각으로 쪼개 색인한다.
+    """
+    grams = []
+    for word in WORD.findall(text.lower()):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return ' '.join(grams)
+
+
+def build_match_query(query):
+    """검색어 단어마다 2-gram 구(phrase)를 만들어 AND로 연결한 FTS5 MATCH 식"""
+    phrases = []
+    for word in WORD.findall(query.lower()):
+        grams = to_bigrams(word)
+        if grams:
+            phrases.append('"' + grams + '"')
+    return ' AND '.join(phrases)
+
+
+def make_snippet(texts, query, radius=SNIPPET_RADIUS):
+    """검색어가 처음 나오는 위치 주변 문장을 **강조**해 반환"""
+    words = sorted(set(WORD.findall(query.lower())), key=len, reverse=True)
+    if not words:
+        return ''
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+
+    for text in texts:
+        # 마크다운 제목/강조 기호는 스니펫에서 뺀다
+        text = MARKDOWN_MARKUP.sub(' ', text or '')
+        match = pattern.search(text)
+        if not match:
+            continue
+        start = max(0, match.start() - radius)
+        end = min(len(text), match.end() + radius)
+        snippet = pattern.sub(lambda m: f"**{m.group(0)}**", text[start:end])
+        snippet = ' '.join(snippet.split())
+        return ('…' if start > 0 else '') + snippet + ('…' if end < len(text) else '')
+    return ''
+
+
+class SearchIndex:
+    """수집한 문서의 로컬 전문 검색 인덱스 (SQLite FTS5 + 문자 2-gram)
+
+    원문 필드는 documents 테이블에, 2-gram으로 변환한 필드는 documents_fts에
+    같은 rowid로 저장한다. 순위는 FTS5 bm25에 필드 가중치를 주어 계산하고,
+    스니펫은 원문에서 만든다. 크롤러(add_document)와 API 서버
+    (refresh_from_directory)가 같은 파일을 WAL 모드로 함께 쓴다.
+    """
+
+    def __init__(self, path="search_index.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    doc_num TEXT UNIQUE NOT NULL,
+                    title TEXT, summary TEXT, keywords TEXT, laws TEXT, tags TEXT, body TEXT,
+                    md_mtime INTEGER
+                )
+            """)
+            self._conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts
+                USING fts5({', '.join(SEARCH_FIELDS)}, tokenize='unicode61')
+            """)
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _fields(metadata, body):
+        summary = metadata.get("summary") or ""
+        if isinstance(summary, dict):
+            summary = summary.get("content", "")
+        return {
+            "title": metadata.get("doc_title") or "",
+            "summary": summary,
+            "keywords": ' '.join(metadata.get("related_keywords") or []),
+            "laws": ' '.join(metadata.get("related_laws") or []),
+            "tags": ' '.join(metadata.get("tag_cloud") or []),
+            "body": body or "",
+        }
+
+    def add_document(self, doc_num, metadata, body, md_mtime=None):
+        """문서 한 건을 추가하거나 갱신 (metadata는 크롤러 결과 형식)"""
+        with self._lock, self._conn:
+            self._upsert(doc_num, self._fields(metadata, body), md_mtime)
+
+    def _upsert(self, doc_num, fields, md_mtime):
+        row = self._conn.execute("SELECT id FROM documents WHERE doc_num = ?", (doc_num,)).fetchone()
+        values = [fields[name] for name in SEARCH_FIELDS]
+        if row:
+            doc_id = row[0]
+            self._conn.execute(
+                f"UPDATE documents SET {', '.join(f'{name} = ?' for name in SEARCH_FIELDS)}, md_mtime = ? WHERE id = ?",
+                values + [md_mtime, doc_id]
+            )
+            self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+        else:
+            doc_id = self._conn.execute(
+                f"INSERT INTO documents (doc_num, {', '.join(SEARCH_FIELDS)}, md_mtime) VALUES (?, {', '.join('?' * len(SEARCH_FIELDS))}, ?)",
+                [doc_num] + values + [md_mtime]
+            ).lastrowid
+        self._conn.execute(
+            f"INSERT INTO documents_fts (rowid, {', '.join(SEARCH_FIELDS)}) VALUES (?, {', '.join('?' * len(SEARCH_FIELDS))})",
+            [doc_id] + [to_bigrams(value) for value in values]
+        )
+
+    def remove_document(self, doc_num):
+        with self._lock, self._conn:
+            self._remove(doc_num)
+
+    def _remove(self, doc_num):
+        row = self._conn.execute("SELECT id FROM documents WHERE doc_num = ?", (doc_num,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row[0],))
+            self._conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+
+    def refresh_from_directory(self, data_dir):
+        """data_dir의 .md 중 새로 생기거나 mtime이 바뀐 파일만 다시 색인, 반영 건수 반환"""
+        if not os.path.isdir(data_dir):
+            return 0
+
+        with self._lock:
+            indexed = dict(self._conn.execute(
+                "SELECT doc_num, md_mtime FROM documents WHERE md_mtime IS NOT NULL"
+            ).fetchall())
+
+        changed = []
+        seen = set()
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+                doc_num = entry.name[:-3]
+                seen.add(doc_num)
+                mtime = entry.stat().st_mtime_ns
+                if indexed.get(doc_num) != mtime:
+                    changed.append((doc_num, entry.path, mtime))
+
+        count = 0
+        with self._lock, self._conn:
+            for doc_num, path, mtime in changed:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        metadata, body = split_markdown_document(f.read())
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.warning("검색 색인 실패 (%s): %s", path, str(e))
+                    continue
+                self._upsert(doc_num, self._fields(metadata, body), mtime)
+                count += 1
+            # 파일이 지워진 문서는 색인에서도 제거
+            for doc_num in set(indexed) - seen:
+                self._remove(doc_num)
+                count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def search(self, query, limit=20, offset=0):
+        """검색어와 일치하는 문서를 bm25 순으로 반환 (문서번호, 문서명, 점수, 스니펫)"""
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT d.doc_num, d.title, d.summary, d.body, bm25(documents_fts, {', '.join(map(str, FIELD_WEIGHTS))}) AS score
+                FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+                WHERE documents_fts MATCH ?
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            """, (match, limit, offset)).fetchall()
+
+        return [
+            {
+                "doc_num": doc_num,
+                "title": title,
+                # bm25는 작을수록 관련도가 높으므로 부호를 바꿔 반환
+                "score": round(-score, 6),
+                "snippet": make_snippet([summary, body, title], query),
+            }
+            for doc_num, title, summary, body, score in rows
+        ]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
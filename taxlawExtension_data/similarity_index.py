@@ -0,0 +1,382 @@
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from doc_store import split_markdown_document
+from search_index import to_bigrams
+
+logger = logging.getLogger(__name__)
+
+# parse_structure가 만든 '# 주 문', '## 1.' 등 상위 제목 단위로 청크를 나눈다
+CHUNK_HEADING = re.compile(r'^#{1,2} ', re.MULTILINE)
+CHUNK_MAX_CHARS = 1500
+CHUNK_MIN_CHARS = 200
+MAX_QUERY_CHUNKS = 16
+
+# 기본 임베딩 모델 (한국어 문장 임베딩, SIMILARITY_EMBEDDER로 바꿀 수 있다)
+DEFAULT_EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+
+
+def chunk_markdown(body, max_chars=CHUNK_MAX_CHARS, min_chars=CHUNK_MIN_CHARS):
+    """본문 마크다운을 제목 구간 단위 청크로 분할 (짧은 구간은 합치고 긴 구간은 자름)"""
+    starts = [m.start() for m in CHUNK_HEADING.finditer(body)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections = [body[a:b].strip() for a, b in zip(starts, starts[1:] + [len(body)])]
+
+    chunks = []
+    current = ''
+    for section in sections:
+        if not section:
+            continue
+        while len(section) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(section[:max_chars])
+            section = section[max_chars:]
+        if current and len(current) + len(section) > max_chars:
+            chunks.append(current)
+            current = ''
+        current = f"{current}\n\n{section}" if current else section
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ''
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class HashingEmbedder:
+    """문자 2-gram 특성 해싱 임베더 (모델 없이 동작, 같은 입력이면 항상 같은 벡터)
+
+    의미 유사도를 잡지 못하므로 운영 인덱스에는 쓰지 않고, 테스트에서
+    SimilarityIndex(embedder=HashingEmbedder())로 넘겨 쓰는 결정적 대역이다.
+    다른 임베더는 dim, name 속성과 embed(texts) -> (n, dim) float32 배열만 맞추면 된다.
+    """
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.name = f"hashing-bigram-{dim}"
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram in to_bigrams(text).split():
+                h = zlib.crc32(gram.encode('utf-8'))
+                vectors[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        return normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers 로컬 모델 임베더 (유사도 인덱스 기본 임베더)"""
+
+    def __init__(self, model_name=DEFAULT_EMBEDDING_MODEL, batch_size=64):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("유사도 인덱스에는 sentence-transformers 패키지가 필요합니다: "
+                              "pip install sentence-transformers") from e
+
+        self.model = SentenceTransformer(model_name)
+        self.batch_size = batch_size
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = model_name
+
+    def embed(self, texts):
+        vectors = self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+        return normalize(vectors.astype(np.float32))
+
+
+def create_embedder():
+    """SIMILARITY_EMBEDDER 환경 변수의 sentence-transformers 모델로 임베더 생성"""
+    return SentenceTransformerEmbedder(os.getenv("SIMILARITY_EMBEDDER", DEFAULT_EMBEDDING_MODEL))
+
+
+def normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def kmeans(vectors, k, iterations=10, seed=0):
+    """코사인(내적) 기준 k-means 중심 계산"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(k):
+            members = vectors[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = normalize(centroids)
+    return centroids
+
+
+class SimilarityIndex:
+    """문서 청크 임베딩의 디스크 기반 IVF 인덱스
+
+    청크 벡터는 vectors.f32에 이어 쓰고 numpy memmap으로 읽는다. 전체 벡터를
+    k-means 중심(nlist개)으로 나눈 IVF를 만들어 두고, 질의 시에는 질의 청크들과
+    가장 가까운 nprobe개 목록의 벡터만 내적으로 비교한다. IVF를 만든 뒤 추가된 청크는
+    따로 전수 비교하다가 일정 비율을 넘으면 IVF를 다시 만든다.
+    """
+
+    def __init__(self, path="similarity_index", embedder=None, nprobe=8,
+                 rebuild_ratio=0.1, batch_size=256):
+        self.path = path
+        self.embedder = embedder or create_embedder()
+        self.dim = self.embedder.dim
+        self.nprobe = nprobe
+        self.rebuild_ratio = rebuild_ratio
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._ivf_path = os.path.join(path, "ivf.npz")
+
+        self._docs = {}         # 문서번호 -> 청크 id 목록
+        self._md_mtimes = {}    # 문서번호 -> 색인한 .md의 mtime_ns
+        self._chunk_docs = []   # 청크 id -> 문서번호 (삭제된 청크는 None)
+        self._vectors = None
+        self._centroids = None
+        self._ivf_offsets = None
+        self._ivf_size = 0      # IVF에 포함된 청크 수 (이후 청크는 전수 비교)
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 저장/로드
+    # ------------------------------------------------------------------
+    def _load(self):
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta["embedder"] != self.embedder.name or meta["dim"] != self.dim:
+                logger.info("임베더가 바뀌어 유사도 인덱스를 다시 만듭니다: %s -> %s", meta['embedder'], self.embedder.name)
+                self._reset_files()
+            else:
+                self._docs = meta["docs"]
+                self._md_mtimes = meta["md_mtimes"]
+                self._chunk_docs = meta["chunk_docs"]
+                self._ivf_size = meta["ivf_size"]
+        if os.path.exists(self._ivf_path) and self._ivf_size:
+            ivf = np.load(self._ivf_path)
+            self._centroids = ivf["centroids"]
+            self._ivf_offsets = ivf["offsets"]
+        self._open_vectors()
+
+    def _reset_files(self):
+        for path in (self._vectors_path, self._meta_path, self._ivf_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _open_vectors(self):
+        # 메타 저장 전에 중단되어 벡터만 더 써진 경우 잘라낸다
+        expected = len(self._chunk_docs) * self.dim * 4
+        if os.path.exists(self._vectors_path) and os.path.getsize(self._vectors_path) > expected:
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(expected)
+        count = len(self._chunk_docs)
+        if count == 0:
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        else:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(count, self.dim))
+
+    def _save_meta(self):
+        tmp_path = f"{self._meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "embedder": self.embedder.name,
+                "dim": self.dim,
+                "docs": self._docs,
+                "md_mtimes": self._md_mtimes,
+                "chunk_docs": self._chunk_docs,
+                "ivf_size": self._ivf_size,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self._meta_path)
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+    def add_documents(self, documents, md_mtimes=None):
+        """[(문서번호, 본문 마크다운)]을 청크로 나눠 일괄 임베딩 후 추가 (기존 문서는 교체)"""
+        chunk_texts, chunk_owners = [], []
+        for doc_num, body in documents:
+            for chunk in chunk_markdown(body):
+                chunk_texts.append(chunk)
+                chunk_owners.append(doc_num)
+
+        # 임베딩은 잠금 밖에서 배치 단위로 계산
+        batches = [
+            self.embedder.embed(chunk_texts[i:i + self.batch_size])
+            for i in range(0, len(chunk_texts), self.batch_size)
+        ]
+        vectors = np.vstack(batches).astype(np.float32) if batches else np.zeros((0, self.dim), np.float32)
+
+        with self._lock:
+            for doc_num, _ in documents:
+                self._drop_document(doc_num)
+            if len(vectors):
+                with open(self._vectors_path, 'ab') as f:
+                    f.write(vectors.tobytes())
+            first_id = len(self._chunk_docs)
+            for offset, doc_num in enumerate(chunk_owners):
+                self._docs.setdefault(doc_num, []).append(first_id + offset)
+                self._chunk_docs.append(doc_num)
+            for doc_num, _ in documents:
+                self._docs.setdefault(doc_num, [])
+                if md_mtimes and doc_num in md_mtimes:
+                    self._md_mtimes[doc_num] = md_mtimes[doc_num]
+            self._open_vectors()
+
+            pending = len(self._chunk_docs) - self._ivf_size
+            if pending > max(1000, self.rebuild_ratio * self._ivf_size):
+                self.rebuild()
+            else:
+                self._save_meta()
+
+    def _drop_document(self, doc_num):
+        # 청크 벡터는 남겨 두고 소유 문서만 지운다 (다음 rebuild 때 정리)
+        for chunk_id in self._docs.pop(doc_num, []):
+            self._chunk_docs[chunk_id] = None
+        self._md_mtimes.pop(doc_num, None)
+
+    def rebuild(self):
+        """삭제된 청크를 정리하고 IVF를 다시 만듦
+
+        청크 벡터를 IVF 목록 순서로 다시 써서 목록 하나가 파일에서 연속된
+        구간이 되도록 한다 (질의 시 흩어진 행을 모으지 않고 구간을 그대로 읽음).
+        """
+        with self._lock:
+            live = np.array([i for i, doc_num in enumerate(self._chunk_docs) if doc_num is not None], dtype=np.int64)
+            vectors = np.array(self._vectors[live], dtype=np.float32) if len(live) else np.zeros((0, self.dim), np.float32)
+            chunk_docs = [self._chunk_docs[i] for i in live]
+
+            count = len(chunk_docs)
+            if count:
+                nlist = max(1, min(1024, int(np.sqrt(count))))
+                sample = vectors[np.random.default_rng(0).choice(count, size=min(count, 50 * nlist), replace=False)]
+                centroids = kmeans(sample, nlist)
+                assign = np.empty(count, dtype=np.int32)
+                for start in range(0, count, 8192):
+                    assign[start:start + 8192] = np.argmax(vectors[start:start + 8192] @ centroids.T, axis=1)
+                order = np.argsort(assign, kind='stable')
+                vectors = vectors[order]
+                chunk_docs = [chunk_docs[i] for i in order]
+                offsets = np.searchsorted(assign[order], np.arange(nlist + 1)).astype(np.int64)
+                np.savez(self._ivf_path, centroids=centroids, offsets=offsets)
+                self._centroids, self._ivf_offsets = centroids, offsets
+            else:
+                self._centroids = self._ivf_offsets = None
+                if os.path.exists(self._ivf_path):
+                    os.remove(self._ivf_path)
+
+            tmp_path = f"{self._vectors_path}.tmp"
+            vectors.tofile(tmp_path)
+            self._vectors = None
+            os.replace(tmp_path, self._vectors_path)
+
+            self._chunk_docs = chunk_docs
+            self._docs = {doc_num: [] for doc_num in self._docs}
+            for chunk_id, doc_num in enumerate(chunk_docs):
+                self._docs[doc_num].append(chunk_id)
+            self._ivf_size = count
+            self._open_vectors()
+            self._save_meta()
+
+    def refresh_from_directory(self, data_dir):
+        """data_dir의 .md 중 새로 생기거나 mtime이 바뀐 문서만 다시 임베딩, 반영 건수 반환"""
+        if not os.path.isdir(data_dir):
+            return 0
+
+        with self._lock:
+            indexed = dict(self._md_mtimes)
+
+        changed, mtimes, seen = [], {}, set()
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+                doc_num = entry.name[:-3]
+                seen.add(doc_num)
+                mtime = entry.stat().st_mtime_ns
+                if indexed.get(doc_num) == mtime:
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        _, body = split_markdown_document(f.read())
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.warning("유사도 색인 실패 (%s): %s", entry.path, str(e))
+                    continue
+                changed.append((doc_num, body))
+                mtimes[doc_num] = mtime
+
+        removed = set(indexed) - seen
+        if removed:
+            with self._lock:
+                for doc_num in removed:
+                    self._drop_document(doc_num)
+                self._save_meta()
+        for start in range(0, len(changed), 500):
+            self.add_documents(changed[start:start + 500], mtimes)
+        return len(changed) + len(removed)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def similar(self, doc_num, k=10):
+        """doc_num과 비슷한 문서 top-k [(문서번호, 점수)] (청크 간 최대 코사인 유사도 기준)"""
+        with self._lock:
+            chunk_ids = self._docs.get(doc_num)
+            if not chunk_ids:
+                return None
+            queries = np.asarray(self._vectors[chunk_ids[:MAX_QUERY_CHUNKS]])
+
+            ids, scores = [], []
+            for start, end in self._candidate_ranges(queries):
+                block = np.asarray(self._vectors[start:end])
+                ids.append(np.arange(start, end))
+                scores.append((queries @ block.T).max(axis=0))
+            if not ids:
+                return []
+            ids = np.concatenate(ids)
+            scores = np.concatenate(scores)
+
+            # 점수 높은 청크부터 보면서 서로 다른 문서 k개를 모은다
+            results = []
+            seen = {doc_num}
+            for idx in np.argsort(-scores):
+                owner = self._chunk_docs[ids[idx]]
+                if owner is None or owner in seen:
+                    continue
+                seen.add(owner)
+                results.append((owner, round(float(scores[idx]), 4)))
+                if len(results) >= k:
+                    break
+        return results
+
+    def _candidate_ranges(self, queries):
+        """질의 청크들과 가까운 nprobe개 IVF 목록 구간 + IVF 이후 추가된 청크 구간"""
+        ranges = []
+        if self._ivf_size and self._centroids is not None:
+            nprobe = min(self.nprobe, len(self._centroids))
+            closeness = (queries @ self._centroids.T).max(axis=0)
+            for list_id in np.argpartition(-closeness, nprobe - 1)[:nprobe]:
+                start, end = int(self._ivf_offsets[list_id]), int(self._ivf_offsets[list_id + 1])
+                if end > start:
+                    ranges.append((start, end))
+        if len(self._chunk_docs) > self._ivf_size:
+            ranges.append((self._ivf_size, len(self._chunk_docs)))
+        return ranges
+
+    def __len__(self):
+        with self._lock:
+            return len(self._chunk_docs)
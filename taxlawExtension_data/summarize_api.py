@@ -1,16 +1,88 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from openai import OpenAI
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+import json
+import logging
 import os
+from typing import List, Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from templates.prompt_template import CASE_SUMMARY_TEMPLATE
 
-# .env 파일 로드
+# .env 파일 로드 (summarizer가 import 시점에 환경 변수를 읽으므로 먼저 로드)
 load_dotenv()
 
-app = FastAPI()
+from file_cache import FileCache
+from doc_store import DocStore
+from search_index import SearchIndex
+from similarity_index import SimilarityIndex
+from summarizer import CaseSummarizer, SummaryCache, create_openai_client
+from telemetry import configure_logging
+
+configure_logging(os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+# OpenAI 클라이언트 초기화 (비동기 + 커넥션 풀)
+if not os.getenv("OPENAI_API_KEY"):
+    raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+client = create_openai_client()
+
+summarizer = CaseSummarizer(client, SummaryCache())
+
+# 크롤러가 함께 쓰는 SQLite 문서 저장소 (문서번호 기본키로 메타데이터 조회)
+DATA_DIR = os.getenv("DATA_DIR", "data")
+doc_store = DocStore(os.getenv("DOC_STORE_PATH", "documents.db"))
+if os.getenv("IMPORT_LEGACY_RESULTS") == "1":
+    # 저장소 도입 전의 크롤링 결과(JSONL/JSON, data/*.md) 중 저장소에 없는 문서를 한 번 가져온다.
+    # 필요할 때 한 번만 켜서 실행하거나 'python doc_store.py'로 가져오며, 이미 있는 문서는
+    # 덮어쓰지 않고 JSONL은 읽기만 하므로 크롤러가 실행 중이어도 된다.
+    stored_before_import = len(doc_store)
+    scraped_docs_path = os.getenv("SCRAPED_DOCS_PATH", "scraped_documents.jsonl")
+    if os.path.exists(scraped_docs_path):
+        doc_store.import_documents(scraped_docs_path, replace=False)
+    if os.path.isdir(DATA_DIR):
+        doc_store.import_markdown_dir(DATA_DIR)
+    logger.info("문서 저장소: %d개 문서 (기존 결과에서 %d개 가져옴)", len(doc_store), len(doc_store) - stored_before_import)
+INDEX_REFRESH_INTERVAL = float(os.getenv("INDEX_REFRESH_INTERVAL", "5"))
+
+# data/*.md 전문 검색 인덱스 (크롤러도 같은 파일에 바로 추가한다)
+search_index = SearchIndex(os.getenv("SEARCH_INDEX_PATH", "search_index.db"))
+
+# 문서 청크 임베딩 유사도 인덱스 (SIMILARITY_EMBEDDER로 sentence-transformers 모델 선택)
+similarity_index = SimilarityIndex(os.getenv("SIMILARITY_INDEX_PATH", "similarity_index"))
+
+def refresh_indexes():
+    # 고치거나 새로 생긴 마크다운을 메타데이터(/data/{case}/metadata, /metadata:batch)에도 반영
+    refreshed = doc_store.refresh_from_directory(DATA_DIR)
+    if refreshed:
+        logger.info("메타데이터 갱신: %d개 문서", refreshed)
+    indexed = search_index.refresh_from_directory(DATA_DIR)
+    if indexed:
+        logger.info("검색 인덱스 갱신: %d개 문서", indexed)
+    embedded = similarity_index.refresh_from_directory(DATA_DIR)
+    if embedded:
+        logger.info("유사도 인덱스 갱신: %d개 문서", embedded)
+
+async def refresh_indexes_periodically():
+    """크롤러가 추가/수정한 문서를 주기적으로 메타데이터와 검색/유사도 인덱스에 반영 (mtime 기반)"""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_indexes)
+        except Exception as e:
+            logger.exception("인덱스 갱신 중 오류 발생: %s", str(e))
+        await asyncio.sleep(INDEX_REFRESH_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app):
+    refresher = asyncio.create_task(refresh_indexes_periodically())
+    yield
+    refresher.cancel()
+    await summarizer.close()
+    search_index.close()
+    doc_store.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -21,88 +93,161 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-if not client.api_key:
-    raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+# HTML 파일을 제공하는 엔드포인트 (LRU 캐시 + 압축 + 조건부 GET)
+file_cache = FileCache(max_bytes=int(os.getenv("FILE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
 
-# HTML 파일을 제공하는 엔드포인트
 @app.get("/data/{case_number}.html", response_class=HTMLResponse)
-async def get_case_file(case_number: str):
+async def get_case_file(case_number: str, request: Request):
     try:
-        file_path = f"data/{case_number}.html"
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-        return content
+        cached = await file_cache.get(os.path.join(DATA_DIR, f"{case_number}.html"))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
 
+    headers = {
+        "ETag": cached.etag,
+        "Last-Modified": cached.last_modified,
+        # 크롤러가 파일을 갱신할 수 있으므로 매번 ETag로 재검증
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if cached.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+
+    encoding = cached.choose_encoding(request.headers.get("accept-encoding"))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=cached.variants[encoding],
+        media_type="text/html; charset=utf-8",
+        headers=headers
+    )
+
+def metadata_response(case_number, metadata):
+    return {
+        # 기존 팝업 호환 필드
+        "문서명": metadata["doc_title"],
+        "url": metadata["url"],
+        "문서번호": metadata["doc_num"] or case_number,
+        "세목": metadata["tax_type"],
+        "판결결과": metadata["doc_result"],
+        # 수집된 전체 필드
+        **metadata
+    }
+
 @app.get("/data/{case_number}/metadata")
 async def get_case_metadata(case_number: str):
+    metadata = await asyncio.to_thread(doc_store.get_metadata, case_number)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="메타데이터 파일을 찾을 수 없습니다")
+    return metadata_response(case_number, metadata)
+
+# 검색 결과 한 페이지(10~50건)를 한 번에 조회하는 일괄 엔드포인트
+MAX_BATCH_SIZE = 100
+
+class BatchRequest(BaseModel):
+    case_numbers: List[str]
+    generate: bool = False  # summaries:batch에서 캐시에 없는 요약을 새로 생성할지 여부
+
+def unique_case_numbers(request: BatchRequest):
+    case_numbers = list(dict.fromkeys(request.case_numbers))
+    if len(case_numbers) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_SIZE}건까지 조회할 수 있습니다")
+    return case_numbers
+
+@app.post("/metadata:batch")
+async def get_metadata_batch(request: BatchRequest):
+    case_numbers = unique_case_numbers(request)
+    found = await asyncio.to_thread(doc_store.get_metadata_many, case_numbers)
+
+    results = {}
+    for case_number in case_numbers:
+        metadata = found.get(case_number)
+        results[case_number] = metadata_response(case_number, metadata) if metadata else None
+    return {"results": results}
+
+async def lookup_summary(case_number, generate):
+    """문서 HTML로 요약 캐시 조회 (generate면 없을 때 생성), 문서가 없으면 None"""
     try:
-        file_path = f"data/{case_number}.md"
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-            
-        # metadata 섹션 파싱
-        metadata = {}
-        in_metadata = False
-        in_basic_info = False
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            if line == '# Metadata':  # 대소문자 구분
-                in_metadata = True
-                continue
-            elif in_metadata and line == '## 기본정보':
-                in_basic_info = True
-                continue
-            elif in_basic_info and line.startswith('##'):
-                break
-            elif in_basic_info and line.startswith('- '):  # "- " 로 시작하는 라인 처리
-                if ':' in line:
-                    # "- key: value" 형식 파싱
-                    key_value = line[2:].split(':', 1)  # "- " 제거 후 분리
-                    if len(key_value) == 2:
-                        key = key_value[0].strip()
-                        value = key_value[1].strip()
-                        metadata[key] = value
-        
-        return {
-            "문서명": metadata.get("문서명", ""),
-            "url": metadata.get("URL", ""),  # 대문자 URL로 수정
-            "문서번호": metadata.get("문서번호", ""),
-            "세목": metadata.get("세목", ""),
-            "판결결과": metadata.get("판결결과", "")
-        }
+        cached_file = await file_cache.get(os.path.join(DATA_DIR, f"{case_number}.html"))
     except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="메타데이터 파일을 찾을 수 없습니다")
+        return None
+
+    # 팝업이 /summarize에 보내는 내용과 같은 문자열이어야 캐시 키가 일치한다
+    content = cached_file.data.decode("utf-8")
+    if generate:
+        try:
+            summary, cached = await summarizer.summarize(content)
+        except Exception as e:
+            return {"summary": None, "cached": False, "error": str(e)}
+        return {"summary": summary, "cached": cached}
+
+    summary = await summarizer.cached_summary(content)
+    return {"summary": summary, "cached": summary is not None}
+
+@app.post("/summaries:batch")
+async def get_summaries_batch(request: BatchRequest):
+    case_numbers = unique_case_numbers(request)
+    summaries = await asyncio.gather(*(lookup_summary(case_number, request.generate) for case_number in case_numbers))
+    return {"results": dict(zip(case_numbers, summaries))}
+
+@app.get("/search")
+async def search_documents(q: str, limit: int = 20, offset: int = 0):
+    """로컬 전문 검색 (bm25 순 문서번호, 문서명, 스니펫)"""
+    limit = max(1, min(limit, 100))
+    results = await asyncio.to_thread(search_index.search, q, limit, max(0, offset))
+    return {"query": q, "results": results}
+
+@app.get("/similar/{case_number}")
+async def get_similar_cases(case_number: str, k: int = 10):
+    """임베딩 유사도 기준 비슷한 문서 top-k"""
+    results = await asyncio.to_thread(similarity_index.similar, case_number, max(1, min(k, 50)))
+    if results is None:
+        raise HTTPException(status_code=404, detail="유사도 인덱스에 없는 문서입니다")
+
+    found = await asyncio.to_thread(doc_store.get_metadata_many, [doc_num for doc_num, _ in results])
+    similar = []
+    for doc_num, score in results:
+        metadata = found.get(doc_num) or {}
+        similar.append({"doc_num": doc_num, "title": metadata.get("doc_title", ""), "score": score})
+    return {"case_number": case_number, "results": similar}
 
 class SummarizeRequest(BaseModel):
     content: str
+    doc_type: Optional[str] = None  # '판례' 또는 '해석례' (생략하면 내용으로 추정)
 
 @app.post("/summarize")
 async def summarize_text(request: SummarizeRequest):
     try:
-        # 템플릿에 내용 삽입
-        prompt = CASE_SUMMARY_TEMPLATE.format(content=request.content)
-        
-        # response = client.chat.completions.create(
-        #     model="gpt-4o-mini",
-        #     messages=[
-        #         {"role": "system", "content": "당신은 법률 전문가입니다. 판례를 분석하고 요약하는 것이 전문입니다."},
-        #         {"role": "user", "content": prompt}
-        #     ],
-        #     temperature=0.7,
-        #     max_tokens=1000
-        # )
-        
-        # summary = response.choices[0].message.content
-        #return {"summary": summary}
-        return {"summary": "임시주석처리"}
+        # 같은 내용/템플릿/모델의 요약이 캐시에 있으면 LLM 호출 없이 반환
+        summary, cached = await summarizer.summarize(request.content, request.doc_type)
+        return {"summary": summary, "cached": cached}
     except Exception as e:
         return {"error": str(e)}
 
+def sse_event(data, event=None):
+    """Server-Sent Events 형식의 이벤트 한 건"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/summarize/stream")
+async def summarize_text_stream(request: SummarizeRequest):
+    """요약을 생성되는 대로 SSE로 전송 (delta 이벤트들 뒤에 done 이벤트)"""
+    async def event_stream():
+        try:
+            async for kind, value in summarizer.summarize_stream(request.content, request.doc_type):
+                if kind == "delta":
+                    yield sse_event({"delta": value})
+                else:
+                    yield sse_event({"cached": value}, event="done")
+        except Exception as e:
+            yield sse_event({"error": str(e)}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="localhost", port=3000)
@@ -0,0 +1,373 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from jsonl_store import JsonlStore
+from print_json import html_to_markdown
+from templates.prompt_template import CASE_SUMMARY_TEMPLATE, SECTION_SUMMARY_TEMPLATE
+
+SYSTEM_PROMPT = "당신은 법률 전문가입니다. 판례를 분석하고 요약하는 것이 전문입니다."
+
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", "summary_cache.jsonl")
+
+# LLM 동시 호출 수와 호출 대기열 길이 제한
+MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+MAX_QUEUE = int(os.getenv("SUMMARY_MAX_QUEUE", "100"))
+
+# 템플릿 문구가 바뀌면 캐시 키도 바뀌도록 템플릿 내용으로 버전을 정한다
+TEMPLATE_VERSION = hashlib.sha256(
+    (CASE_SUMMARY_TEMPLATE + SECTION_SUMMARY_TEMPLATE).encode('utf-8')
+).hexdigest()[:12]
+
+# 긴 문서 분할 요약 설정 (토큰 수는 글자 수로 어림한다)
+CHARS_PER_TOKEN = 1.5            # 한국어 본문 기준 토큰당 평균 글자 수
+SINGLE_PASS_TOKENS = 6000        # 이 이하면 한 번에 요약
+CHUNK_TOKENS = 3000              # 구간 요약 한 번에 넣을 최대 토큰 수
+
+HEADING_LINE = re.compile(r'^#{1,2} ')
+HTML_TAG = re.compile(r'<(?:p|table|div|html|body)\b', re.IGNORECASE)
+PRECEDENT_TOP_LEVEL = re.compile(r'>\s*(?:주 문|이 유|청 구 취 지)\s*<')
+
+
+def summary_cache_key(content, model=DEFAULT_MODEL, template_version=TEMPLATE_VERSION, doc_type=None):
+    """(내용, 템플릿 버전, 모델, 문서 유형) 조합의 캐시 키
+
+    doc_type은 prompt_doc_type으로 정한 값을 넘긴다. None이면 키에 넣지 않는다.
+    """
+    digest = hashlib.sha256()
+    parts = (template_version, model, content) + ((doc_type,) if doc_type is not None else ())
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def create_openai_client(max_connections=20, max_keepalive_connections=10):
+    """커넥션 풀을 쓰는 비동기 OpenAI 클라이언트 생성
+
+    OPENAI_BASE_URL 환경 변수를 지정하면 로컬 가짜 서버 등 다른 엔드포인트를 쓴다.
+    """
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+    )
+
+
+class SummaryCache:
+    """요약 결과 영구 캐시 (키: 내용 + 템플릿 버전 + 모델 해시)
+
+    크롤러의 요약 사전 생성 단계와 API 서버가 같은 파일을 함께 쓰므로
+    공유 모드로 열고, 없는 키는 다른 프로세스가 추가한 줄을 읽은 뒤 다시 찾는다.
+    """
+
+    def __init__(self, path=SUMMARY_CACHE_PATH):
+        self.store = JsonlStore(path, fsync_every=1, shared=True)
+
+    def get(self, key):
+        entry = self.store.get(key)
+        if entry is None:
+            self.store.refresh()
+            entry = self.store.get(key)
+        return entry["summary"] if entry else None
+
+    def put(self, key, summary, model):
+        self.store.put(key, {
+            "summary": summary,
+            "model": model,
+            "template_version": TEMPLATE_VERSION,
+            "created_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    def close(self):
+        self.store.close()
+
+
+def estimate_tokens(text):
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def prompt_doc_type(content, doc_type=None):
+    """프롬프트를 만들 때 실제로 쓰는 문서 유형 (HTML이 아니면 유형이 영향을 주지 않으므로 None)"""
+    if not HTML_TAG.search(content):
+        return None
+    if doc_type is None:
+        # 판례/심판은 '주 문', '이 유'처럼 띄어 쓴 최상위 항목을 쓴다
+        doc_type = '판례' if PRECEDENT_TOP_LEVEL.search(content) else '해석례'
+    return doc_type
+
+
+def to_structured_markdown(content, doc_type=None):
+    """팝업이 보낸 HTML을 html_to_markdown 구조로 변환 (이미 텍스트면 그대로)"""
+    doc_type = prompt_doc_type(content, doc_type)
+    if doc_type is None:
+        return content
+    return html_to_markdown(content, doc_type=doc_type)
+
+
+def split_sections(markdown):
+    """'# 주 문' / '# 이 유' / '## 1.' 제목 단위로 마크다운을 (제목, 본문) 구간으로 분할"""
+    sections = []
+    title, lines = "", []
+    for line in markdown.split('\n'):
+        if HEADING_LINE.match(line):
+            if any(l.strip() for l in lines):
+                sections.append((title, '\n'.join(lines).strip()))
+            title, lines = line.lstrip('#').strip(), [line]
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((title, '\n'.join(lines).strip()))
+    return sections
+
+
+def pack_chunks(sections, max_tokens=CHUNK_TOKENS):
+    """구간들을 순서대로 max_tokens 이하 묶음으로 합치기 (너무 긴 구간은 문단 단위로 자름)"""
+    pieces = []
+    for title, text in sections:
+        if estimate_tokens(text) <= max_tokens:
+            pieces.append((title, text))
+            continue
+        part = []
+        for paragraph in text.split('\n\n'):
+            if part and estimate_tokens('\n\n'.join(part + [paragraph])) > max_tokens:
+                pieces.append((title, '\n\n'.join(part)))
+                part = []
+            part.append(paragraph)
+        if part:
+            pieces.append((title, '\n\n'.join(part)))
+
+    def chunk_title(titles):
+        titles = [t for t in titles if t]
+        if not titles:
+            return ''
+        return titles[0] if len(titles) == 1 else f"{titles[0]} ~ {titles[-1]}"
+
+    chunks = []
+    titles, texts = [], []
+    for title, text in pieces:
+        if texts and estimate_tokens('\n\n'.join(texts + [text])) > max_tokens:
+            chunks.append((chunk_title(titles), '\n\n'.join(texts)))
+            titles, texts = [], []
+        titles.append(title)
+        texts.append(text)
+    if texts:
+        chunks.append((chunk_title(titles), '\n\n'.join(texts)))
+    return chunks
+
+
+class SummarizerBusyError(Exception):
+    """LLM 호출 대기열이 가득 찼을 때 발생"""
+
+
+class CaseSummarizer:
+    """판례 요약 생성기 (캐시 우선, 없으면 LLM 호출 후 캐시에 저장)
+
+    같은 내용에 대한 동시 요청은 진행 중인 LLM 호출 하나를 함께 기다리고
+    (single-flight), LLM 동시 호출 수는 max_concurrency로, 대기 요청 수는
+    max_queue로 제한한다.
+    """
+
+    def __init__(self, client, cache, model=DEFAULT_MODEL, temperature=0.7, max_tokens=1000,
+                 max_concurrency=MAX_CONCURRENCY, max_queue=MAX_QUEUE):
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_queue = max_queue
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._inflight = {}
+
+    def cache_key(self, content, doc_type=None):
+        return summary_cache_key(content, self.model, doc_type=prompt_doc_type(content, doc_type))
+
+    @asynccontextmanager
+    async def _llm_slot(self):
+        """LLM 동시 호출 슬롯 확보 (대기열이 가득 차면 SummarizerBusyError)"""
+        if self._waiting >= self.max_queue:
+            raise SummarizerBusyError("요약 요청이 많아 잠시 후 다시 시도해주세요.")
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def _start_flight(self, key, coro):
+        """coro를 key의 진행 중인 LLM 호출로 등록하고 결과를 받을 future 반환
+
+        coro는 별도 태스크로 실행되므로, 처음 요청한 쪽의 연결이 끊겨도 호출은
+        끝까지 진행되어 캐시에 저장되고 함께 기다리는 요청에 결과가 전달된다.
+        """
+        future = asyncio.get_running_loop().create_future()
+        # 기다리는 요청이 없어도 예외가 기록되지 않은 채 남지 않도록 소비
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        task = asyncio.ensure_future(coro)
+
+        def _resolve(done_task):
+            self._inflight.pop(key, None)
+            if future.done():
+                return
+            if done_task.cancelled():
+                future.cancel()
+            elif done_task.exception() is not None:
+                future.set_exception(done_task.exception())
+            else:
+                future.set_result(done_task.result())
+
+        task.add_done_callback(_resolve)
+        return future
+
+    async def cached_summary(self, content, doc_type=None):
+        """캐시에 있는 요약만 반환 (없으면 None, LLM 호출 없음)"""
+        return await asyncio.to_thread(self.cache.get, self.cache_key(content, doc_type))
+
+    async def summarize(self, content, doc_type=None):
+        """요약 결과와 캐시 적중 여부 반환"""
+        key = self.cache_key(content, doc_type)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return cached, True
+
+        # 같은 내용을 이미 요약 중이면 그 결과를 함께 기다린다
+        shared = self._inflight.get(key)
+        if shared is not None:
+            return await asyncio.shield(shared), False
+
+        future = self._start_flight(key, self._generate(key, content, doc_type))
+        # 요청 하나가 끊겨도 함께 기다리는 요청을 위해 LLM 호출은 계속 진행
+        return await asyncio.shield(future), False
+
+    async def build_prompt(self, content, doc_type=None):
+        """최종 요약 프롬프트 생성
+
+        HTML 대신 구조화된 마크다운을 쓰고, 길면 제목 구간별로 나눠 동시에
+        요약(map)한 뒤 그 결과들을 템플릿의 사건 개요/주문/쟁점/판결 결과
+        구조로 합친다(reduce).
+        """
+        markdown = to_structured_markdown(content, doc_type)
+        if estimate_tokens(markdown) <= SINGLE_PASS_TOKENS:
+            return CASE_SUMMARY_TEMPLATE.format(content=markdown)
+
+        chunks = pack_chunks(split_sections(markdown))
+
+        async def summarize_chunk(section, text):
+            async with self._llm_slot():
+                return await self._complete(SECTION_SUMMARY_TEMPLATE.format(section=section or '본문', content=text))
+
+        partials = await asyncio.gather(*(summarize_chunk(section, text) for section, text in chunks))
+        merged = '\n\n'.join(
+            f"### 구간 {idx}: {section or '본문'}\n{partial}"
+            for idx, ((section, _), partial) in enumerate(zip(chunks, partials), 1)
+        )
+        return CASE_SUMMARY_TEMPLATE.format(content=merged)
+
+    async def _generate(self, key, content, doc_type=None):
+        prompt = await self.build_prompt(content, doc_type)
+        async with self._llm_slot():
+            summary = await self._complete(prompt) or ""
+        await self._store(key, summary)
+        return summary
+
+    async def _store(self, key, summary):
+        """요약을 캐시에 저장 (빈 응답은 다음 요청에서 다시 생성하도록 저장하지 않음)"""
+        if summary.strip():
+            await asyncio.to_thread(self.cache.put, key, summary, self.model)
+
+    async def summarize_stream(self, content, doc_type=None):
+        """요약 텍스트 조각을 생성되는 대로 내보내는 비동기 제너레이터
+
+        ("delta", 텍스트) 조각들 뒤에 ("done", 캐시 적중 여부)를 내보낸다.
+        캐시에 있거나 같은 내용을 다른 요청이 요약 중이면 전체 요약을 한 조각으로 보낸다.
+        """
+        key = self.cache_key(content, doc_type)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            yield "delta", cached
+            yield "done", True
+            return
+
+        shared = self._inflight.get(key)
+        if shared is not None:
+            yield "delta", await asyncio.shield(shared)
+            yield "done", False
+            return
+
+        # 스트리밍도 LLM 호출은 별도 태스크에서 진행하고 여기서는 조각만 받아 내보낸다.
+        # 클라이언트 연결이 끊겨 이 제너레이터가 닫혀도 호출은 끝까지 진행된다.
+        deltas = asyncio.Queue()
+        future = self._start_flight(key, self._generate_stream(key, content, doc_type, deltas))
+        while True:
+            delta = await deltas.get()
+            if delta is None:
+                break
+            yield "delta", delta
+
+        await asyncio.shield(future)  # 생성 중 오류가 났으면 여기서 발생
+        yield "done", False
+
+    async def _generate_stream(self, key, content, doc_type, deltas):
+        """최종 요약 조각을 deltas 큐에 넣으며 생성 (끝나면 None을 넣는다)"""
+        parts = []
+        try:
+            # 분할 요약(map)은 먼저 끝내고 최종 합치기 단계만 스트리밍
+            prompt = await self.build_prompt(content, doc_type)
+            async with self._llm_slot():
+                async for delta in self._complete_stream(prompt):
+                    parts.append(delta)
+                    deltas.put_nowait(delta)
+        finally:
+            deltas.put_nowait(None)
+
+        summary = ''.join(parts)
+        await self._store(key, summary)
+        return summary
+
+    async def _complete_stream(self, prompt):
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _complete(self, prompt):
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        return response.choices[0].message.content
+
+    async def close(self):
+        await self.client.close()
+        self.cache.close()
@@ -0,0 +1,146 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# .env 파일 로드 (summarizer가 import 시점에 환경 변수를 읽으므로 먼저 로드)
+load_dotenv()
+
+from summarizer import CaseSummarizer, SummaryCache, create_openai_client
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryStage:
+    """크롤링 후처리 단계: 수집한 문서의 요약을 백그라운드에서 미리 생성
+
+    크롤러 스레드는 submit으로 문서만 넘기고 바로 다음 문서로 진행한다.
+    요약은 별도 스레드의 이벤트 루프에서 동시 처리 수, 분당 요청 수 제한과
+    지수 백오프 재시도를 적용해 만들고, API 서버의 /summarize와 같은
+    요약 캐시(summary_cache.jsonl)에 저장한다. 캐시 키가 팝업 요청과 같도록
+    API 서버가 제공하는 저장된 HTML 파일 내용 그대로를 요약한다. 파일을
+    writer(BatchFileWriter)로 저장하면 예약된 쓰기가 반영된 뒤에 읽으므로,
+    다시 수집한 문서의 이전 파일을 요약하지 않는다.
+    """
+
+    def __init__(self, max_concurrency=2, requests_per_minute=30, max_retries=3,
+                 retry_base_delay=2.0, file_wait_timeout=60.0, writer=None):
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+
+        self.max_concurrency = max_concurrency
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.file_wait_timeout = file_wait_timeout
+        self.writer = writer
+
+        self.stats = {"generated": 0, "cached": 0, "failed": 0}
+        self._futures = set()
+        self._futures_lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="summary-stage", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+
+    async def _setup(self):
+        self._summarizer = CaseSummarizer(
+            create_openai_client(),
+            SummaryCache(),
+            max_concurrency=self.max_concurrency
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._rate_lock = asyncio.Lock()
+        self._next_request_at = 0.0
+
+    def submit(self, doc_number, html_path, doc_type=None):
+        """문서 요약 예약 (html_path는 크롤러가 저장한(또는 저장 예약한) HTML 파일)"""
+        if not html_path:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._process(doc_number, html_path, doc_type), self._loop)
+        with self._futures_lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future):
+        with self._futures_lock:
+            self._futures.discard(future)
+
+    def close(self):
+        """예약된 요약을 모두 마친 뒤 종료"""
+        with self._futures_lock:
+            pending = list(self._futures)
+        if pending:
+            logger.info("남은 요약 %d건 처리 대기 중...", len(pending))
+            concurrent.futures.wait(pending)
+        asyncio.run_coroutine_threadsafe(self._summarizer.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        logger.info("요약 사전 생성 완료: 생성 %d건, 기존 캐시 %d건, 실패 %d건",
+                    self.stats['generated'], self.stats['cached'], self.stats['failed'])
+
+    async def _process(self, doc_number, html_path, doc_type):
+        async with self._slots:
+            try:
+                content = await self._read_document(html_path)
+            except (OSError, TimeoutError) as e:
+                self.stats["failed"] += 1
+                logger.warning("요약할 문서를 읽지 못했습니다 (%s): %s", doc_number, str(e))
+                return
+
+            if await self._summarizer.cached_summary(content, doc_type) is not None:
+                self.stats["cached"] += 1
+                return
+
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await self._throttle()
+                    await self._summarizer.summarize(content, doc_type)
+                    self.stats["generated"] += 1
+                    logger.debug("요약 생성 완료: %s", doc_number)
+                    return
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        self.stats["failed"] += 1
+                        logger.warning("요약 생성 실패 (%s): %s", doc_number, str(e))
+                        return
+                    delay = self.retry_base_delay * (2 ** attempt)
+                    logger.warning("요약 생성 재시도 %d/%d (%s), %.1f초 후: %s",
+                                   attempt + 1, self.max_retries, doc_number, delay, str(e))
+                    await asyncio.sleep(delay)
+
+    async def _read_document(self, html_path):
+        """파일 쓰기가 끝날 때까지 기다렸다가 HTML을 API 서버와 같은 방식(바이트 -> UTF-8)으로 읽음
+
+        이전 실행의 파일이 이미 있어도 writer에 예약된 쓰기가 남아 있으면 교체될 때까지 기다린다.
+        """
+        deadline = time.monotonic() + self.file_wait_timeout
+        while True:
+            try:
+                if self.writer is not None and self.writer.is_pending(html_path):
+                    raise FileNotFoundError(html_path)
+                data = await asyncio.to_thread(self._read_bytes, html_path)
+                return data.decode('utf-8')
+            except FileNotFoundError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"파일이 저장되지 않았습니다: {html_path}")
+                await asyncio.sleep(0.5)
+
+    @staticmethod
+    def _read_bytes(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    async def _throttle(self):
+        """분당 요청 수 제한 (요청 시작 간격을 min_interval 이상으로 유지)"""
+        async with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
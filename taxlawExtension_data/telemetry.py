@@ -0,0 +1,222 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 상세 문서 한 건의 처리 단계 (보고서 출력 순서)
+STAGES = ("page_open", "metadata", "content", "markdown", "persist")
+
+# 히스토그램 버킷 상한(초), Prometheus histogram과 같은 누적 방식
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"
+
+
+def configure_logging(level="INFO", log_file=None):
+    """크롤러 로그 설정 (콘솔 + 선택적으로 파일)
+
+    문서마다 찍던 진행 메시지는 DEBUG로 내려갔으므로 평소에는 INFO로 두고,
+    특정 문서를 추적할 때만 DEBUG로 올린다.
+    """
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers, force=True)
+
+
+class Histogram:
+    """구간별 누적 개수와 합계, 분위수 계산용 표본을 가진 소요 시간 히스토그램"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, max_samples=10000):
+        self.buckets = tuple(buckets)
+        self.max_samples = max_samples
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._samples = []
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        # 표본이 가득 차면 일정 간격으로 교체해 실행 전체를 고르게 대표하도록 한다
+        if len(self._samples) < self.max_samples:
+            self._samples.append(value)
+        else:
+            self._samples[self.count % self.max_samples] = value
+
+    def percentile(self, q):
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.sum, 3),
+            "mean_ms": round(self.sum / self.count * 1000, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5) * 1000, 1),
+            "p95_ms": round(self.percentile(0.95) * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class Telemetry:
+    """크롤링 파이프라인의 단계별 소요 시간 수집기
+
+    span(stage)으로 감싼 구간의 시간을 단계별 히스토그램에 기록한다.
+    document(doc_number)로 감싼 스레드에서는 한 문서 안에서 같은 단계가 여러 번
+    (중첩 포함) 나와도 합산해 문서가 끝날 때 단계별로 한 번만 기록하므로, 단계별
+    건수가 문서 수와 같고 문서별 합계로 가장 느린 문서를 찾을 수 있다. 여러 워커
+    스레드가 하나의 인스턴스를 공유하며, 실행이 끝나면 report/Prometheus 텍스트로 내보낸다.
+    """
+
+    def __init__(self, slowest=10):
+        self.slowest = slowest
+        self.started_at = time.time()
+        self.histograms = {}
+        self.counters = {}
+        self._documents = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def document(self, doc_number):
+        """이 스레드에서 기록하는 구간을 doc_number 문서에 귀속"""
+        previous = (getattr(self._local, "doc_number", None), getattr(self._local, "stages", None),
+                    getattr(self._local, "active", None))
+        self._local.doc_number = doc_number
+        self._local.stages = stages = {}
+        self._local.active = set()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.doc_number, self._local.stages, self._local.active = previous
+            for stage, seconds in stages.items():
+                self.observe(stage, seconds, doc_number=doc_number)
+            self.observe("document", time.perf_counter() - started, doc_number=None)
+
+    @contextmanager
+    def span(self, stage):
+        """with 블록의 소요 시간을 stage 단계로 기록 (예외가 나도 기록)
+
+        문서 안에서는 바로 기록하지 않고 문서별 단계 합계에 더하며, 같은 단계
+        안에 중첩된 구간은 바깥 구간에 이미 포함되므로 따로 더하지 않는다.
+        """
+        stages = getattr(self._local, "stages", None)
+        if stages is not None and stage in self._local.active:
+            yield
+            return
+        if stages is not None:
+            self._local.active.add(stage)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if stages is None:
+                self.observe(stage, elapsed)
+            else:
+                self._local.active.discard(stage)
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+
+    def observe(self, stage, seconds, doc_number=...):
+        """소요 시간 한 건 기록 (doc_number를 생략하면 현재 스레드의 문서에 귀속)"""
+        if doc_number is ...:
+            doc_number = getattr(self._local, "doc_number", None)
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+            if doc_number is not None:
+                stages = self._documents.setdefault(doc_number, {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    # ------------------------------------------------------------------
+    # 내보내기
+    # ------------------------------------------------------------------
+    def report(self):
+        """실행 보고서 (단계별 통계, 카운터, 가장 느린 문서)"""
+        with self._lock:
+            ordered = [stage for stage in STAGES if stage in self.histograms]
+            ordered += sorted(stage for stage in self.histograms if stage not in STAGES)
+            stages = {stage: self.histograms[stage].summary() for stage in ordered}
+            slowest = sorted(
+                self._documents.items(), key=lambda entry: sum(entry[1].values()), reverse=True
+            )[:self.slowest]
+            counters = dict(self.counters)
+
+        measured = sum(stages[stage]["total_s"] for stage in STAGES if stage in stages)
+        for stage in STAGES:
+            if stage in stages:
+                stages[stage]["share"] = round(stages[stage]["total_s"] / measured, 3) if measured else 0.0
+
+        return {
+            "started_at": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at)),
+            "elapsed_s": round(time.time() - self.started_at, 1),
+            "counters": counters,
+            "stages": stages,
+            "slowest_documents": [
+                {"doc_number": doc_number, "total_ms": round(sum(times.values()) * 1000, 1),
+                 **{f"{stage}_ms": round(seconds * 1000, 1) for stage, seconds in times.items()}}
+                for doc_number, times in slowest
+            ],
+        }
+
+    def write_report(self, path):
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def log_report(self, report=None):
+        """단계별 소요 시간 표를 INFO 로그로 출력"""
+        report = report or self.report()
+        logger.info("단계별 소요 시간 (경과 %.1f초, %s)", report["elapsed_s"],
+                    ', '.join(f"{name} {value}" for name, value in report["counters"].items()) or "카운터 없음")
+        for stage, stats in report["stages"].items():
+            share = f", 비중 {stats['share'] * 100:.1f}%" if "share" in stats else ""
+            logger.info("  %-10s %6d건  합계 %8.1fs  평균 %7.1fms  p50 %7.1fms  p95 %7.1fms  최대 %7.1fms%s",
+                        stage, stats["count"], stats["total_s"], stats["mean_ms"],
+                        stats["p50_ms"], stats["p95_ms"], stats["max_ms"], share)
+
+    def prometheus_text(self, prefix="taxlaw_crawl"):
+        """Prometheus 텍스트 노출 형식 (node_exporter textfile collector 등에서 수집)"""
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Duration of crawl pipeline stages.",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float('inf'),), histogram.bucket_counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+
+
+# 크롤러 모듈이 함께 쓰는 기본 인스턴스
+telemetry = Telemetry()
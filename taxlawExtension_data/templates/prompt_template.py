@@ -36,4 +36,12 @@ CASE_SUMMARY_TEMPLATE = """
 
 판례 내용:
 {content}
-""" 
\ No newline at end of file
+""" 
+SECTION_SUMMARY_TEMPLATE = """
+다음은 긴 판례의 일부 구간입니다. 이 구간에 담긴 내용만 마크다운 글머리 기호(*)로 간결하게 요약해주세요.
+사건 번호, 당사자, 주문, 원고/피고의 주장과 법적 근거, 법원의 판단과 그 근거, 판결 결과에 해당하는 내용이 있으면 빠짐없이 남기고,
+구간에 없는 내용은 추측하지 마세요.
+
+판례 구간 ({section}):
+{content}
+"""
@@ -0,0 +1,83 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from action_harvester import ACTION_PAYLOAD_KEY
+
+# 상세 페이지처럼 열리자마자 action.do로 문서를 조회하고 본문을 그리는 페이지
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>상세</title></head>
+<body><div id="content"></div>
+<script>
+fetch('/action.do', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({actionId: '%s'})
+}).then((response) => response.json()).then((data) => {
+    document.getElementById('content').textContent = JSON.stringify(data).length;
+});
+</script>
+</body></html>
+"""
+
+
+class ActionReplayServer:
+    """기록한 action.do 응답을 재생하는 로컬 상세 페이지 서버
+
+    GET /detail은 action.do를 호출하는 상세 페이지를, POST /action.do는
+    픽스처에 기록된 응답(response, 없으면 payload를 사이트 형식으로 감싼 것)을 준다.
+    action.do 호출 수를 action_calls에 기록한다.
+    """
+
+    def __init__(self, fixture):
+        self.response = fixture.get("response") or {"data": {ACTION_PAYLOAD_KEY: fixture["payload"]}}
+        self.action_calls = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def detail_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/detail"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.split('?')[0] != "/detail":
+                    self.send_error(404)
+                    return
+                self._send((DETAIL_PAGE % ACTION_PAYLOAD_KEY).encode("utf-8"), "text/html; charset=utf-8")
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path.split('?')[0] != "/action.do":
+                    self.send_error(404)
+                    return
+                with server._lock:
+                    server.action_calls += 1
+                self._send(json.dumps(server.response, ensure_ascii=False).encode("utf-8"),
+                           "application/json; charset=utf-8")
+
+        return Handler
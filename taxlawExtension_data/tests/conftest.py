@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모듈들이 taxlawExtension_data 폴더 기준으로 서로를 import하므로 테스트에서도 같은 경로를 쓴다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,111 @@
+import json
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from action_harvester import (ACTION_FIELD_KEYS, ACTION_LIST_KEYS, ACTION_PAYLOAD_KEY,
+                              attach_action_capture, derive_action_field_keys, map_action_payload)
+from action_replay_server import ActionReplayServer
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "action"
+FIXTURES = sorted(FIXTURE_DIR.glob("*.json"))
+
+
+def _normalize(value):
+    return ' '.join(str(value).split())
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[path.stem for path in FIXTURES])
+def test_harvested_metadata_matches_dom(path):
+    fixture = _load(path)
+    dom = fixture["dom_metadata"]
+    metadata, body_html = map_action_payload(fixture["payload"], fixture["url"], fixture["use_precedent"])
+
+    assert metadata is not None
+    assert body_html
+    for field in ACTION_FIELD_KEYS:
+        if field not in dom:
+            continue
+        expected = dom[field]["content"] if field == "summary" else dom[field]
+        actual = metadata[field]["content"] if field == "summary" else metadata[field]
+        assert _normalize(actual) == _normalize(expected), field
+    for field in ACTION_LIST_KEYS:
+        assert [_normalize(v) for v in metadata[field]] == [_normalize(v) for v in dom.get(field, [])], field
+    if fixture["use_precedent"]:
+        assert [(doc["doc_num"], doc["title"]) for doc in metadata["similar_docs"]] == \
+            [(doc["doc_num"], doc["title"]) for doc in dom["similar_docs"]]
+
+
+@pytest.mark.parametrize("missing", ["ntstDcmDscmCntn", "ntstDcmTtl"])
+def test_missing_required_field_falls_back(missing):
+    fixture = _load(FIXTURE_DIR / "synthetic_interpretation.json")
+    payload = json.loads(json.dumps(fixture["payload"]))
+    del payload["dcmDVO"][missing]
+
+    assert map_action_payload(payload, fixture["url"], False) == (None, "")
+
+
+def test_generic_keys_are_not_mapped():
+    payload = {"title": "목록 제목", "docNo": "1", "result": "성공", "ntstDcmCntn": "<p>본문</p>"}
+
+    assert map_action_payload(payload, "https://example.com", False) == (None, "")
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[path.stem for path in FIXTURES])
+def test_field_keys_cover_keys_derived_from_recording(path):
+    fixture = _load(path)
+    derived = derive_action_field_keys(fixture["payload"], fixture["dom_metadata"])
+
+    for field, keys in derived.items():
+        assert set(keys) & set(ACTION_FIELD_KEYS[field]), (field, keys)
+
+
+def test_replay_server_serves_recorded_response():
+    fixture = _load(FIXTURE_DIR / "synthetic_interpretation.json")
+    with ActionReplayServer(fixture) as server:
+        action_url = server.detail_url.replace("/detail", "/action.do")
+        with urllib.request.urlopen(urllib.request.Request(action_url, data=b"{}")) as response:
+            data = json.load(response)
+
+    assert data["data"][ACTION_PAYLOAD_KEY] == fixture["payload"]
+    assert server.action_calls == 1
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[path.stem for path in FIXTURES])
+def test_harvest_action_doc_against_replayed_recording(path, tmp_path):
+    sync_api = pytest.importorskip("playwright.sync_api")
+    from crawl_pool import CrawlItem
+    from main import harvest_action_doc
+
+    fixture = _load(path)
+    dom = fixture["dom_metadata"]
+    with ActionReplayServer(fixture) as server, sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as e:
+            pytest.skip(f"Chromium을 실행할 수 없습니다: {str(e).splitlines()[0]}")
+        try:
+            page = browser.new_page()
+            attach_action_capture(page)
+            with page.expect_response(lambda response: "action.do" in response.url):
+                page.goto(server.detail_url)
+            item = CrawlItem(dom["doc_num"], server.detail_url, fixture["use_precedent"])
+            doc_info = harvest_action_doc(page, item, str(tmp_path))
+        finally:
+            browser.close()
+
+    # 문서 한 건을 상세 페이지가 보낸 action.do 응답 하나로 수집한다
+    assert server.action_calls == 1
+    assert doc_info["url"] == server.detail_url
+    for field in ("doc_num", "doc_title", "tax_type", "produce_date"):
+        assert _normalize(doc_info[field]) == _normalize(dom[field]), field
+    assert doc_info["related_keywords"] == dom["related_keywords"]
+    assert doc_info["details"]["content"]
+    assert (tmp_path / f"{dom['doc_num']}.html").exists()
+    assert (tmp_path / f"{dom['doc_num']}.md").read_text(encoding='utf-8').count(dom["doc_title"]) >= 1
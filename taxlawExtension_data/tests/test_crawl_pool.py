@@ -0,0 +1,24 @@
+import pytest
+
+import crawl_pool
+from crawl_pool import CrawlItem, CrawlWorkerPool
+
+
+class FailingPlaywright:
+    """브라우저 실행 단계에서 실패하는 sync_playwright 대역"""
+
+    def __enter__(self):
+        raise RuntimeError("chromium launch failed")
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_join_reraises_worker_startup_error(monkeypatch):
+    monkeypatch.setattr(crawl_pool, "sync_playwright", FailingPlaywright)
+    pool = CrawlWorkerPool(lambda page, item: None, lambda *args: None, lambda *args: None, num_workers=2)
+    pool.start()
+    pool.submit(CrawlItem("2024-0001", "https://example.com/doc"))
+
+    with pytest.raises(RuntimeError, match="chromium launch failed"):
+        pool.join()
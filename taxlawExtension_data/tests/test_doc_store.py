@@ -0,0 +1,102 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from doc_store import DocStore
+
+
+def crawled(doc_num, title):
+    return {"doc_num": doc_num, "doc_title": title, "url": f"https://example.com/{doc_num}",
+            "details": {"content": f"{title} 본문"}}
+
+
+def test_import_without_replace_keeps_existing_and_adds_missing(tmp_path):
+    store = DocStore(str(tmp_path / "documents.db"))
+    try:
+        # 크롤러가 저장소를 먼저 만들고 문서 하나를 넣은 상태
+        store.put_document(crawled("A-1", "크롤러 최신"))
+        store.flush()
+
+        legacy = tmp_path / "scraped_documents.json"
+        legacy.write_text(json.dumps([crawled("A-1", "예전 결과"), crawled("B-2", "예전 문서")],
+                                     ensure_ascii=False), encoding='utf-8')
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        (data_dir / "C-3.md").write_text("# 기본정보\n- 문서명: 마크다운 문서\n\n# content\n본문\n", encoding='utf-8')
+
+        store.import_documents(str(legacy), replace=False)
+        assert store.import_markdown_dir(str(data_dir)) == 1
+        assert store.import_markdown_dir(str(data_dir)) == 0
+
+        assert store.get_metadata("A-1")["doc_title"] == "크롤러 최신"
+        assert store.get_metadata("B-2")["doc_title"] == "예전 문서"
+        assert store.get_metadata("C-3") is not None
+        assert len(store) == 3
+    finally:
+        store.close()
+
+
+def test_jsonl_import_leaves_file_being_written_untouched(tmp_path):
+    jsonl = tmp_path / "scraped_documents.jsonl"
+    lines = [json.dumps({"key": doc_num, "data": crawled(doc_num, title)}, ensure_ascii=False)
+             for doc_num, title in (("A-1", "첫 문서"), ("B-2", "둘째 문서"))]
+    # 크롤러가 아직 쓰고 있는 마지막 줄
+    content = ('\n'.join(lines) + '\n{"key": "C-3", "data": {"doc_').encode('utf-8')
+    jsonl.write_bytes(content)
+
+    store = DocStore(str(tmp_path / "documents.db"))
+    try:
+        store.import_documents(str(jsonl), replace=False)
+        assert len(store) == 2
+    finally:
+        store.close()
+    assert jsonl.read_bytes() == content
+
+
+def test_failed_flush_keeps_pending_writes(tmp_path):
+    path = str(tmp_path / "documents.db")
+    store = DocStore(path, batch_size=100, flush_interval=60)
+    other = sqlite3.connect(path)
+    try:
+        store._conn.execute("PRAGMA busy_timeout = 50")
+        store.put_document(crawled("A-1", "첫 문서"))
+        store.set_crawl_status("A-1", "done", "https://example.com/A-1")
+
+        # API 서버 등 다른 프로세스가 쓰기 잠금을 잡고 있는 동안
+        other.execute("BEGIN IMMEDIATE")
+        with pytest.raises(sqlite3.OperationalError):
+            store.flush()
+        other.rollback()
+
+        store.flush()
+        assert store.get_metadata("A-1")["doc_title"] == "첫 문서"
+        assert store.crawl_status("A-1")["status"] == "done"
+    finally:
+        other.close()
+        store.close()
+
+
+def test_refresh_from_directory_reparses_changed_markdown(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    md = data_dir / "A-1.md"
+    md.write_text("# Metadata\n## 기본정보\n- 문서명: 처음 제목\n\n# content\n본문\n", encoding='utf-8')
+
+    store = DocStore(str(tmp_path / "documents.db"))
+    try:
+        assert store.refresh_from_directory(str(data_dir)) == 1
+        assert store.refresh_from_directory(str(data_dir)) == 0
+        assert store.get_metadata("A-1")["doc_title"] == "처음 제목"
+
+        md.write_text("# Metadata\n## 기본정보\n- 문서명: 고친 제목\n\n# content\n본문\n", encoding='utf-8')
+        stat = md.stat()
+        os.utime(md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        (data_dir / "B-2.md").write_text("# Metadata\n## 기본정보\n- 문서명: 새 문서\n", encoding='utf-8')
+
+        assert store.refresh_from_directory(str(data_dir)) == 2
+        assert store.get_metadata("A-1")["doc_title"] == "고친 제목"
+        assert store.get_metadata("B-2")["doc_title"] == "새 문서"
+    finally:
+        store.close()
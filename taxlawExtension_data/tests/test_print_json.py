@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from print_json import html_to_markdown
+
+HTML_FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+HTML_FIXTURES = sorted(HTML_FIXTURE_DIR.glob("*.html"))
+
+
+@pytest.mark.filterwarnings("ignore")
+@pytest.mark.parametrize("doc_type", ["판례", "해석례"])
+@pytest.mark.parametrize("path", HTML_FIXTURES, ids=[path.stem for path in HTML_FIXTURES])
+def test_lxml_backend_matches_bs4(path, doc_type):
+    html_content = path.read_text(encoding='utf-8')
+
+    expected = html_to_markdown(html_content, doc_type=doc_type, parser='bs4')
+    assert html_to_markdown(html_content, doc_type=doc_type, parser='lxml') == expected
+
+
+@pytest.mark.parametrize("html_content", ["", "   ", "<!-- only -->", '<?xml version="1.0" encoding="utf-8"?>'])
+def test_lxml_backend_handles_documents_without_body(html_content):
+    assert html_to_markdown(html_content, doc_type='해석례', parser='lxml') == ''
+
+
+def test_lxml_backend_drops_script_style_and_comments():
+    html_content = (HTML_FIXTURE_DIR / "script_style_in_p.html").read_text(encoding='utf-8')
+
+    markdown = html_to_markdown(html_content, doc_type='판례', parser='lxml')
+
+    assert '숨김' not in markdown
+    assert 'tracking' not in markdown
+    assert 'margin' not in markdown
+    assert '주석' not in markdown
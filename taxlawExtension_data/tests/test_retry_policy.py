@@ -0,0 +1,38 @@
+import time
+
+from retry_policy import CircuitBreaker
+
+
+def tripped_breaker():
+    breaker = CircuitBreaker(window=4, failure_threshold=0.5, min_requests=2, cooldown=0.05)
+    # 브레이커가 열리기 전에 보낸 요청 (결과는 나중에 도착한다)
+    stale_token = breaker.before_request()
+    for _ in range(2):
+        breaker.record(False, token=breaker.before_request())
+    assert breaker.state == "open"
+    return breaker, stale_token
+
+
+def test_stale_result_does_not_end_half_open():
+    breaker, stale_token = tripped_breaker()
+    time.sleep(0.06)
+    probe = breaker.before_request()
+    assert breaker.state == "half_open" and probe is not None
+
+    breaker.record(True, token=stale_token)
+    assert breaker.state == "half_open"
+
+    breaker.record(True, token=probe)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_with_longer_cooldown():
+    breaker, _ = tripped_breaker()
+    time.sleep(0.06)
+    probe = breaker.before_request()
+
+    breaker.record(False, token=probe)
+
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+    assert breaker._cooldown == 0.1
@@ -0,0 +1,43 @@
+import numpy as np
+
+import similarity_index
+from similarity_index import DEFAULT_EMBEDDING_MODEL, HashingEmbedder, SimilarityIndex, create_embedder
+
+DOCUMENTS = [
+    ("doc-vat", "# 주 문\n\n부가가치세 면세 여부를 판단한다.\n\n## 1.\n\n    부가가치세 면세 대상 용역의 공급"),
+    ("doc-vat2", "# 이 유\n\n부가가치세 면세 대상 용역인지 여부\n\n## 1.\n\n    면세 용역의 공급 범위"),
+    ("doc-corp", "# 주 문\n\n법인세 이월결손금 공제 범위\n\n## 1.\n\n    합병법인의 이월결손금 승계"),
+]
+
+
+def test_hashing_embedder_is_deterministic():
+    texts = ["부가가치세 면세", "법인세 이월결손금"]
+
+    first = HashingEmbedder().embed(texts)
+    second = HashingEmbedder().embed(texts)
+
+    assert first.dtype == np.float32
+    assert first.shape == (2, 256)
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-6)
+
+
+def test_similar_documents_with_stand_in_embedder(tmp_path):
+    index = SimilarityIndex(str(tmp_path / "index"), embedder=HashingEmbedder())
+    index.add_documents(DOCUMENTS)
+    index.rebuild()
+
+    results = index.similar("doc-vat", k=2)
+
+    assert [doc_num for doc_num, _ in results] == ["doc-vat2", "doc-corp"]
+    assert SimilarityIndex(str(tmp_path / "index"), embedder=HashingEmbedder()).similar("doc-vat", k=2) == results
+
+
+def test_create_embedder_defaults_to_sentence_transformer(monkeypatch):
+    created = []
+    monkeypatch.delenv("SIMILARITY_EMBEDDER", raising=False)
+    monkeypatch.setattr(similarity_index, "SentenceTransformerEmbedder", created.append)
+
+    create_embedder()
+
+    assert created == [DEFAULT_EMBEDDING_MODEL]
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from fake_openai import FakeOpenAIServer
+from summarizer import CaseSummarizer, SummaryCache, create_openai_client
+
+CONTENT = "<p>주 문</p><p>1. 원고의 청구를 기각한다.</p><p>이 유</p><p>가. 처분의 경위.</p>"
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    with FakeOpenAIServer(reply="사건 개요와 판결 결과 요약입니다.") as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        yield server
+
+
+def make_summarizer(tmp_path, **kwargs):
+    return CaseSummarizer(create_openai_client(), SummaryCache(str(tmp_path / "summary_cache.jsonl")), **kwargs)
+
+
+def test_concurrent_identical_requests_call_upstream_once(fake_openai, tmp_path):
+    async def run():
+        summarizer = make_summarizer(tmp_path)
+        try:
+            results = await asyncio.gather(*(summarizer.summarize(CONTENT) for _ in range(10)))
+            cached = await summarizer.summarize(CONTENT)
+        finally:
+            await summarizer.close()
+        return results, cached
+
+    results, cached = asyncio.run(run())
+
+    assert fake_openai.calls == 1
+    assert {summary for summary, _ in results} == {fake_openai.reply}
+    assert cached == (fake_openai.reply, True)
+
+
+def test_llm_calls_are_limited_by_semaphore(fake_openai, tmp_path):
+    async def run():
+        summarizer = make_summarizer(tmp_path, max_concurrency=2)
+        try:
+            return await asyncio.gather(*(summarizer.summarize(f"{CONTENT}<p>{idx}</p>") for idx in range(6)))
+        finally:
+            await summarizer.close()
+
+    asyncio.run(run())
+
+    assert fake_openai.calls == 6
+    assert fake_openai.max_active <= 2
+
+
+def test_stream_disconnect_does_not_fail_followers(fake_openai, tmp_path):
+    async def run():
+        summarizer = make_summarizer(tmp_path)
+        try:
+            stream = summarizer.summarize_stream(CONTENT)
+            first = await stream.__anext__()
+            # 첫 조각을 받은 뒤 같은 내용 요청이 함께 기다리는 중에 스트림 연결이 끊긴다
+            follower = asyncio.ensure_future(summarizer.summarize(CONTENT))
+            await asyncio.sleep(0)
+            await stream.aclose()
+            summary, cached = await follower
+            again = await summarizer.summarize(CONTENT)
+        finally:
+            await summarizer.close()
+        return first, summary, cached, again
+
+    first, summary, cached, again = asyncio.run(run())
+
+    assert first[0] == "delta"
+    assert summary == fake_openai.reply
+    assert cached is False
+    assert again == (fake_openai.reply, True)
+    assert fake_openai.calls == 1
+
+
+def test_stream_followers_receive_full_summary(fake_openai, tmp_path):
+    async def collect(stream):
+        return [event async for event in stream]
+
+    async def run():
+        summarizer = make_summarizer(tmp_path)
+        try:
+            return await asyncio.gather(*(collect(summarizer.summarize_stream(CONTENT)) for _ in range(3)))
+        finally:
+            await summarizer.close()
+
+    leader, *followers = asyncio.run(run())
+
+    assert ''.join(value for kind, value in leader if kind == "delta") == fake_openai.reply
+    for events in followers:
+        assert events == [("delta", fake_openai.reply), ("done", False)]
+    assert fake_openai.calls == 1
+
+
+def test_empty_reply_is_not_cached(monkeypatch, tmp_path):
+    with FakeOpenAIServer(reply="  \n", delay=0) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        async def run():
+            summarizer = make_summarizer(tmp_path)
+            try:
+                return [await summarizer.summarize(CONTENT) for _ in range(2)]
+            finally:
+                await summarizer.close()
+
+        results = asyncio.run(run())
+
+    assert server.calls == 2
+    assert [cached for _, cached in results] == [False, False]
+
+
+def test_doc_type_is_part_of_cache_key(fake_openai, tmp_path):
+    async def run():
+        summarizer = make_summarizer(tmp_path)
+        try:
+            precedent = await summarizer.summarize(CONTENT, "판례")
+            interpretation = await summarizer.summarize(CONTENT, "해석례")
+            # 유형을 생략하면 내용으로 추정한 유형(판례)의 캐시를 쓴다
+            inferred = await summarizer.summarize(CONTENT)
+        finally:
+            await summarizer.close()
+        return precedent, interpretation, inferred
+
+    precedent, interpretation, inferred = asyncio.run(run())
+
+    assert fake_openai.calls == 2
+    assert (precedent[1], interpretation[1], inferred[1]) == (False, False, True)
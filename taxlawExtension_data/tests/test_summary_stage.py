@@ -0,0 +1,42 @@
+import time
+
+from fake_openai import FakeOpenAIServer
+from file_writer import BatchFileWriter
+from summarizer import DEFAULT_MODEL, SummaryCache, prompt_doc_type, summary_cache_key
+
+OLD_HTML = "<html><body><p>1. 이전 수집본</p></body></html>"
+NEW_HTML = "<html><body><p>1. 다시 수집한 본문</p></body></html>"
+
+
+def cache_key(content):
+    return summary_cache_key(content, DEFAULT_MODEL, doc_type=prompt_doc_type(content, "해석례"))
+
+
+def test_recrawled_document_is_summarized_after_writer_replaces_file(monkeypatch, tmp_path):
+    html_path = tmp_path / "A-1.html"
+    html_path.write_text(OLD_HTML, encoding='utf-8')
+
+    # 파일 교체가 요약 단계보다 늦게 끝나는 상황
+    write = BatchFileWriter._write
+    monkeypatch.setattr(BatchFileWriter, "_write", staticmethod(lambda path, text: (time.sleep(0.5), write(path, text))))
+
+    with FakeOpenAIServer(reply="새 본문 요약", delay=0) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.chdir(tmp_path)
+        from summary_stage import SummaryStage
+
+        writer = BatchFileWriter(flush_interval=0.05)
+        stage = SummaryStage(writer=writer)
+        writer.submit(str(html_path), NEW_HTML)
+        stage.submit("A-1", str(html_path), "해석례")
+        stage.close()
+        writer.close()
+
+    cache = SummaryCache(str(tmp_path / "summary_cache.jsonl"))
+    try:
+        assert cache.get(cache_key(NEW_HTML)) == "새 본문 요약"
+        assert cache.get(cache_key(OLD_HTML)) is None
+    finally:
+        cache.close()
+    assert stage.stats == {"generated": 1, "cached": 0, "failed": 0}
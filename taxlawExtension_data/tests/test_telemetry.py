@@ -0,0 +1,40 @@
+import time
+
+from telemetry import Telemetry
+
+
+def test_each_stage_recorded_once_per_document():
+    telemetry = Telemetry()
+    for doc_number in ("A-1", "B-2"):
+        with telemetry.document(doc_number):
+            with telemetry.span("markdown"):
+                time.sleep(0.01)
+            with telemetry.span("persist"):
+                with telemetry.span("persist"):
+                    time.sleep(0.01)
+            with telemetry.span("markdown"):
+                time.sleep(0.01)
+            with telemetry.span("persist"):
+                pass
+
+    report = telemetry.report()
+
+    assert report["stages"]["markdown"]["count"] == 2
+    assert report["stages"]["persist"]["count"] == 2
+    assert report["stages"]["markdown"]["total_s"] >= 0.04
+    # 중첩된 persist 구간은 바깥 구간에 포함되므로 두 번 더하지 않는다
+    assert report["stages"]["persist"]["total_s"] < report["stages"]["markdown"]["total_s"]
+    slowest = {doc["doc_number"]: doc for doc in report["slowest_documents"]}
+    assert set(slowest) == {"A-1", "B-2"}
+    assert slowest["A-1"]["markdown_ms"] >= 20
+
+
+def test_spans_outside_documents_are_recorded_immediately():
+    telemetry = Telemetry()
+    with telemetry.span("file_write"):
+        pass
+    with telemetry.span("file_write"):
+        pass
+
+    assert telemetry.report()["stages"]["file_write"]["count"] == 2
+    assert telemetry.report()["slowest_documents"] == []
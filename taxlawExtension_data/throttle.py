@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class AdaptiveDelay:
+    """서버 응답 시간과 오류율에 맞춰 조절되는 요청 간 대기(politeness delay)
+
+    서버가 목표 응답 시간 안에 정상 응답하는 동안에는 min_delay만 쉬고,
+    응답이 느려지거나 오류가 늘어나면 그만큼 대기 시간을 늘린다.
+    여러 워커 스레드가 하나의 인스턴스를 공유한다.
+    """
+
+    def __init__(self, min_delay=0.0, max_delay=10.0, target_latency=2.0, smoothing=0.2):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+        self.smoothing = smoothing
+
+        self._latency = None
+        self._error_rate = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency, ok=True):
+        """요청 한 건의 응답 시간(초)과 성공 여부 반영 (지수 이동 평균)"""
+        with self._lock:
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += self.smoothing * (latency - self._latency)
+            self._error_rate += self.smoothing * ((0.0 if ok else 1.0) - self._error_rate)
+
+    def current_delay(self):
+        with self._lock:
+            delay = self.min_delay
+            if self._latency is not None and self._latency > self.target_latency:
+                delay += self._latency - self.target_latency
+            delay += self._error_rate * self.max_delay
+            return min(self.max_delay, delay)
+
+    def wait(self):
+        delay = self.current_delay()
+        if delay > 0:
+            time.sleep(delay)
+        return delay